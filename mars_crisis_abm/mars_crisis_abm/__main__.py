@@ -3,39 +3,147 @@ Main CLI entry point for the Mars Crisis Emergency Response ABM.
 This file makes the package executable with: python -m mars_crisis_abm
 """
 
+import argparse
+import random
+import sys
+
 from .model import MarsModel
 from .utils import load_config, load_grid_layout_csv
-import sys
 
+CONFIG_PATH = "config/params.json"
+LAYOUT_PATH = "config/grid_layout.csv"
+
+# Step limit of each replicate unless --max-steps is given
+DEFAULT_BATCH_MAX_STEPS = 1000
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m mars_crisis_abm")
+    parser.add_argument(
+        "--replicates",
+        type=int,
+        help="run N seeded replicates and print aggregated outcomes",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="worker processes for replicates (default: CPU count)",
+    )
+    parser.add_argument(
+        "--target-success",
+        type=float,
+        help="search for the minimum fleet reaching this SUCCESS rate",
+    )
+    parser.add_argument(
+        "--stop-rule",
+        choices=("sprt", "ci"),
+        help="stop replicates once the --target-success decision is settled "
+        "(--replicates becomes the cap)",
+    )
+    parser.add_argument(
+        "--candidates",
+        type=int,
+        default=32,
+        help="candidate fleets sampled for the fleet search",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="random seed (default: unseeded single run, 0 for replicates)",
+    )
+    parser.add_argument(
+        "--max-steps",
+        type=int,
+        help="step limit of the run or of each replicate "
+        "(default: unlimited single run, 1000 for replicates)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="time each step phase and agent class of the single run",
+    )
+    args = parser.parse_args(argv)
+    if args.target_success is not None and not 0 < args.target_success < 1:
+        parser.error("--target-success must be between 0 and 1")
+    if args.stop_rule:
+        try:
+            make_stop_rule(args)
+        except ValueError as error:
+            parser.error(f"--target-success {args.target_success}: {error}")
+    if is_batch_mode(args):
+        args.seed = 0 if args.seed is None else args.seed
+        if args.max_steps is None:
+            args.max_steps = DEFAULT_BATCH_MAX_STEPS
+    return args
+
+
+def is_batch_mode(args):
+    """Whether args run replicates rather than a single simulation"""
+    return bool(args.replicates or args.stop_rule) or args.target_success is not None
+
+
+def make_stop_rule(args):
+    """Builds the --stop-rule stopping rule for the --target-success rate"""
+    from .stopping import ConfidenceIntervalRule, SequentialProbabilityRatioTest
 
-def main():
+    target_rate = args.target_success if args.target_success is not None else 0.95
+    if args.stop_rule == "sprt":
+        return SequentialProbabilityRatioTest(target_rate)
+    return ConfidenceIntervalRule(target_rate)
+
+
+def main(argv=None):
+    args = parse_args(argv)
     print("Welcome to the Mars Crisis Emergency Response ABM simulation")
 
+    batch_mode = is_batch_mode(args)
     try:
         print("Loading configuration...")
-        config_params = load_config("config/params.json")
-        grid_data, equipment_positions = load_grid_layout_csv("config/grid_layout.csv")
+        config_params = load_config(CONFIG_PATH)
+        # Replicates load the layout themselves, once per worker
+        if not batch_mode:
+            grid_data, equipment_positions = load_grid_layout_csv(
+                LAYOUT_PATH, rng=random.Random(args.seed)
+            )
         print("Configuration loaded successfully")
-    except:
-        print("Program startup failed due to a configuration error")
+    except ValueError as error:
+        print(f"Program startup failed due to a configuration error: {error}")
         sys.exit(1)
 
-    model = MarsModel(config_params, grid_data, equipment_positions)
+    if args.stop_rule:
+        run_sequential_batch(config_params, args)
+        return
+    if args.target_success is not None:
+        run_fleet_search(config_params, args)
+        return
+    if args.replicates:
+        run_batch(config_params, args)
+        return
+
+    model = MarsModel(
+        config_params,
+        grid_data,
+        equipment_positions,
+        seed=args.seed,
+        profile=args.profile,
+    )
 
     print("Running simulation...")
-    print(f"Robot fleet: {model.robot_counts}")
+    print(f"Robot fleet: {config_params['ROBOT_COUNTS']}")
     print("-" * 50)
 
     step = 1
     while model.running == True:
+        if args.max_steps is not None and step > args.max_steps:
+            break
         model.step()
         if step % 10 == 0:
-            df = model.datacollector.get_model_vars_dataframe()
+            latest = model.datacollector.latest()
             print(
                 f"Step {step}: "
-                f"Critical Humans: {df['Critical Humans'].iloc[-1]}, "
-                f"Atmosphere: {df['Atmospheric Condition'].iloc[-1]:.1f}%, "
-                f"Power: {df['Power Level'].iloc[-1]:.1f}%"
+                f"Critical Humans: {latest['Critical Humans']}, "
+                f"Atmosphere: {latest['Atmospheric Condition']:.1f}%, "
+                f"Power: {latest['Power Level']:.1f}%"
             )
 
         step += 1
@@ -43,6 +151,99 @@ def main():
     print("-" * 50)
     print(f"Simulation complete! -- Status: {model.mission_status} ")
 
+    if model.profiler is not None:
+        print("-" * 50)
+        print(model.profiler.report())
+
+
+def run_batch(config_params, args):
+    from .batch import run_replicates, summarize_replicates
+
+    print(f"Running {args.replicates} replicates...")
+    print(f"Robot fleet: {config_params['ROBOT_COUNTS']}")
+    print("-" * 50)
+
+    results = run_replicates(
+        config_params,
+        LAYOUT_PATH,
+        args.replicates,
+        base_seed=args.seed,
+        workers=args.workers,
+        max_steps=args.max_steps,
+    )
+    summary = summarize_replicates(results)
+
+    for status, count in summary["status_counts"].items():
+        print(f"{status}: {count} ({summary['status_rates'][status]:.1%})")
+    for label, key in (("success", "time_to_success"), ("failure", "time_to_failure")):
+        if summary[key]:
+            print(
+                f"Steps to {label}: median {summary[key]['median']:.0f}, "
+                f"p10 {summary[key]['p10']:.0f}, p90 {summary[key]['p90']:.0f}"
+            )
+    print("-" * 50)
+
+
+def run_sequential_batch(config_params, args):
+    from .batch import run_sequential
+
+    rule = make_stop_rule(args)
+    target_rate = rule.target_rate
+
+    print(f"Testing for {target_rate:.0%} SUCCESS ({args.stop_rule})...")
+    print(f"Robot fleet: {config_params['ROBOT_COUNTS']}")
+    print("-" * 50)
+
+    outcome = run_sequential(
+        config_params,
+        LAYOUT_PATH,
+        rule,
+        base_seed=args.seed,
+        workers=args.workers,
+        max_replicates=args.replicates or 1000,
+        max_steps=args.max_steps,
+    )
+
+    print(f"Decision: {outcome['decision'] or 'undecided'}")
+    print(
+        f"SUCCESS rate {outcome['success_rate']:.1%} over "
+        f"{outcome['replicates']} replicates ({outcome['launched']} launched)"
+    )
+    print("-" * 50)
+
+
+def run_fleet_search(config_params, args):
+    from .fleet_search import sample_fleets, search_minimum_fleet
+
+    print(f"Searching for the minimum fleet with {args.target_success:.0%} SUCCESS...")
+    print(f"Upper bound fleet: {config_params['ROBOT_COUNTS']}")
+    print("-" * 50)
+
+    candidates = sample_fleets(
+        config_params["ROBOT_COUNTS"], args.candidates, seed=args.seed
+    )
+    search = search_minimum_fleet(
+        config_params,
+        LAYOUT_PATH,
+        candidates,
+        target_rate=args.target_success,
+        base_seed=args.seed,
+        workers=args.workers,
+        max_steps=args.max_steps,
+    )
+
+    print(f"Replicates run: {search['total_replicates']}")
+    best = search["best"]
+    if best is None:
+        print("No candidate fleet met the requirement")
+    else:
+        print(
+            f"Minimum fleet ({best['cost']} robots, "
+            f"{best['success_rate']:.1%} over {best['replicates']} runs): "
+            f"{best['robot_counts']}"
+        )
+    print("-" * 50)
+
 
 if __name__ == "__main__":
     main()
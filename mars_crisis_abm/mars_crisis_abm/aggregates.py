@@ -0,0 +1,147 @@
+import math
+
+from .metrics import STRUCTURE_TOTALS, compute_structure_totals, structure_contribution
+
+_MISSING = object()
+
+
+class TrackedAttribute:
+    """
+    Data descriptor that reports every write of a structure attribute to the
+    agent's model through model._structure_changed(agent, name, old, new).
+
+    Values live in the instance __dict__ under the same name, so reads, copies
+    and pickling behave like a plain attribute, unless the model stores them in
+    a StructureStore, in which case the agent only holds its dense id and the
+    attribute is a view over the store's arrays. Reading an attribute that was
+    never set raises AttributeError, which keeps hasattr() checks meaningful.
+    If the class already defines the attribute as a descriptor (e.g. a
+    property), reads and writes are delegated to it.
+    """
+
+    def __init__(self, name, wrapped=None):
+        self.name = name
+        self.wrapped = wrapped
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        if self.wrapped is not None:
+            return self.wrapped.__get__(instance, owner)
+
+        state = instance.__dict__
+        store_id = state.get("_store_id")
+        if store_id is not None:
+            store = state["model"].structure_store
+            if store.has(store_id, self.name):
+                return store.get(store_id, self.name)
+        elif self.name in state:
+            return state[self.name]
+        raise AttributeError(
+            f"'{type(instance).__name__}' object has no attribute '{self.name}'"
+        )
+
+    def __set__(self, instance, value):
+        old = self.__get__(instance) if hasattr(instance, self.name) else _MISSING
+        state = instance.__dict__
+        store_id = state.get("_store_id")
+        if self.wrapped is not None:
+            self.wrapped.__set__(instance, value)
+            value = self.wrapped.__get__(instance, type(instance))
+        elif store_id is not None:
+            store = state["model"].structure_store
+            store.set(store_id, self.name, value)
+            value = store.get(store_id, self.name)
+        else:
+            state[self.name] = value
+
+        model = state.get("model")
+        if model is None:
+            return
+        structure_changed = getattr(model, "_structure_changed", None)
+        if structure_changed is not None:
+            structure_changed(
+                instance, self.name, None if old is _MISSING else old, value
+            )
+
+
+def install_tracking(structure_class, *names):
+    """Routes writes of the given attributes of structure_class through TrackedAttribute"""
+    for name in names:
+        existing = getattr(structure_class, name, None)
+        if isinstance(existing, TrackedAttribute):
+            continue
+        wrapped = existing if hasattr(existing, "__set__") else None
+        setattr(structure_class, name, TrackedAttribute(name, wrapped))
+
+
+class StructureAggregates:
+    """
+    Running sums of the integrity-dependent metrics (power, wall damage,
+    contamination and damage counters), updated with deltas whenever a tracked
+    structure is registered, removed or changes integrity.
+    """
+
+    def __init__(self):
+        self._totals = [0] * len(STRUCTURE_TOTALS)
+        # Last contribution pushed by each structure, subtracted on change
+        self._contributions = {}
+
+    def __contains__(self, structure):
+        return structure in self._contributions
+
+    def __len__(self):
+        return len(self._contributions)
+
+    def add(self, structure):
+        if structure in self._contributions:
+            return
+        self._contributions[structure] = None
+        self.update(structure)
+
+    def remove(self, structure):
+        contribution = self._contributions.pop(structure, _MISSING)
+        if contribution is not _MISSING:
+            self._apply(contribution, -1)
+
+    def update(self, structure):
+        if structure not in self._contributions:
+            return
+        self._apply(self._contributions[structure], -1)
+        contribution = structure_contribution(structure)
+        self._contributions[structure] = contribution
+        self._apply(contribution, 1)
+
+    def totals(self):
+        return dict(zip(STRUCTURE_TOTALS, self._totals))
+
+    def resync(self, model):
+        """Replaces the running sums with a full recompute, dropping float drift"""
+        recomputed = compute_structure_totals(model)
+        self._totals = [recomputed[name] for name in STRUCTURE_TOTALS]
+
+    def verify(self, model):
+        """
+        Checks the running sums against a full recompute.
+
+        Raises:
+            RuntimeError: If any total differs from the recomputed value.
+        """
+        recomputed = compute_structure_totals(model)
+        mismatches = [
+            f"{name}: incremental={value} recomputed={recomputed[name]}"
+            for name, value in zip(STRUCTURE_TOTALS, self._totals)
+            if not math.isclose(value, recomputed[name], rel_tol=1e-9, abs_tol=1e-6)
+        ]
+        if mismatches:
+            raise RuntimeError(
+                "Incremental structure aggregates diverged from full recompute: "
+                + "; ".join(mismatches)
+            )
+
+    def _apply(self, contribution, sign):
+        if contribution is None:
+            return
+        for index, value in enumerate(contribution):
+            if value:
+                self._totals[index] += sign * value
@@ -0,0 +1,301 @@
+"""
+Monte Carlo replicate runner for the Mars Crisis ABM.
+
+Runs many independently seeded MarsModel replicates, optionally across a
+process pool, and aggregates their outcomes. Every replicate derives all of
+its randomness (equipment integrities, wall damage, agent activation) from its
+own seed, and results are returned in replicate order, so a batch is
+bit-identical regardless of the number of workers.
+"""
+
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from statistics import NormalDist
+
+import numpy as np
+
+from .blueprint_cache import load_compiled_blueprint
+from .metrics_store import FinalOnly
+from .model import MarsModel
+
+DEFAULT_MAX_STEPS = 1000
+
+
+def replicate_seeds(base_seed, replicates):
+    """Derives one independent integer seed per replicate from base_seed"""
+    return [
+        int(child.generate_state(1)[0])
+        for child in np.random.SeedSequence(base_seed).spawn(replicates)
+    ]
+
+
+@contextmanager
+def seeded_global_random(seed):
+    """Seeds the global random generator for the block, then restores it"""
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        yield
+    finally:
+        random.setstate(state)
+
+
+def run_replicate(config_params, layout_path, seed, max_steps=DEFAULT_MAX_STEPS):
+    """
+    Runs a single seeded simulation until it terminates or reaches max_steps.
+
+    The global random generator is seeded for the run, since agents may draw
+    from it, and is handed back to the caller in its previous state.
+
+    Returns:
+        dict: seed, mission_status, steps run and the final value of every
+        collected model metric.
+    """
+    blueprint = load_compiled_blueprint(layout_path)
+    with seeded_global_random(seed):
+        model = MarsModel(
+            config_params,
+            blueprint.grid_data,
+            blueprint.equipment_positions(rng=random.Random(seed)),
+            seed=seed,
+            blueprint=blueprint,
+            # Only the final state is reported, skip the per-step history
+            collection=FinalOnly(),
+        )
+
+        steps = 0
+        while model.running and steps < max_steps:
+            model.step()
+            steps += 1
+
+    collector = model.datacollector
+    collector.finalize(model)
+    return {
+        "seed": seed,
+        "mission_status": model.mission_status,
+        "steps": steps,
+        "final_metrics": collector.latest(),
+    }
+
+
+def _run_replicate_task(task):
+    return run_replicate(*task)
+
+
+def run_replicates(
+    config_params,
+    layout_path,
+    replicates,
+    base_seed=0,
+    workers=None,
+    max_steps=DEFAULT_MAX_STEPS,
+):
+    """
+    Runs seeded replicates of MarsModel.
+
+    Args:
+        config_params (dict): Model configuration (CREW_SIZE, ROBOT_COUNTS).
+        layout_path (str): Path to the grid layout CSV.
+        replicates (int): Number of replicates to run.
+        base_seed (int): Seed the per-replicate seeds are derived from.
+        workers (int, optional): Worker processes. Defaults to the CPU count;
+            1 runs every replicate in the current process.
+        max_steps (int): Step limit after which a run is reported as ONGOING.
+
+    Returns:
+        list: One result dict per replicate (see run_replicate), in order.
+    """
+    tasks = [
+        (config_params, layout_path, seed, max_steps)
+        for seed in replicate_seeds(base_seed, replicates)
+    ]
+    return list(map_replicates(tasks, workers=workers))
+
+
+def run_sequential(
+    config_params,
+    layout_path,
+    rule,
+    base_seed=0,
+    workers=None,
+    max_replicates=1000,
+    batch_size=None,
+    max_steps=DEFAULT_MAX_STEPS,
+):
+    """
+    Runs seeded replicates until a stopping rule settles the outcome.
+
+    Replicates are launched in batches (one per worker by default) and their
+    results are fed to rule.decide(successes, trials) in replicate order, so
+    the stopping point and the returned results do not depend on the worker
+    count. Replicates of the last batch past the stopping point are discarded.
+
+    Args:
+        config_params (dict): Model configuration (CREW_SIZE, ROBOT_COUNTS).
+        layout_path (str): Path to the grid layout CSV.
+        rule: Stopping rule, e.g. SequentialProbabilityRatioTest or
+            ConfidenceIntervalRule from mars_crisis_abm.stopping.
+        base_seed (int): Seed the per-replicate seeds are derived from.
+        workers (int, optional): Worker processes, see run_replicates.
+        max_replicates (int): Cap after which the outcome is left undecided.
+        batch_size (int, optional): Replicates launched per batch.
+        max_steps (int): Step limit per replicate.
+
+    Returns:
+        dict: decision (None when the cap was reached first), replicates used,
+        replicates launched, successes, success_rate and the per-replicate
+        results.
+    """
+    workers = workers or os.cpu_count() or 1
+    batch_size = batch_size or workers
+    seeds = replicate_seeds(base_seed, max_replicates)
+
+    results = []
+    successes = 0
+    decision = None
+    launched = 0
+    with replicate_pool(workers) as executor:
+        while decision is None and launched < max_replicates:
+            tasks = [
+                (config_params, layout_path, seed, max_steps)
+                for seed in seeds[launched : launched + batch_size]
+            ]
+            launched += len(tasks)
+            batch = map_replicates(tasks, executor, workers)
+
+            for result in batch:
+                results.append(result)
+                if result["mission_status"] == "SUCCESS":
+                    successes += 1
+                decision = rule.decide(successes, len(results))
+                if decision is not None:
+                    break
+
+    return {
+        "decision": decision,
+        "replicates": len(results),
+        "launched": launched,
+        "successes": successes,
+        "success_rate": successes / len(results) if results else 0.0,
+        "results": results,
+    }
+
+
+def replicate_pool(workers=None):
+    """
+    Opens a process pool for map_replicates to share across calls.
+
+    Returns:
+        A ProcessPoolExecutor of workers processes, or a null context
+        yielding None when a single worker runs replicates in the current
+        process.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return nullcontext()
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def map_replicates(tasks, executor=None, workers=None):
+    """
+    Yields run_replicate(*task) for each task, in task order.
+
+    Args:
+        tasks (list): (config_params, layout_path, seed, max_steps) tuples.
+        executor (concurrent.futures.Executor, optional): Caller-owned pool,
+            e.g. from replicate_pool, which is left open for later calls.
+            Without one, a pool of workers processes is opened for this call.
+        workers (int, optional): Worker processes, see run_replicates. Also
+            sizes the chunks handed to executor.
+    """
+    workers = workers or os.cpu_count() or 1
+    if executor is None:
+        if workers == 1 or len(tasks) <= 1:
+            for task in tasks:
+                yield run_replicate(*task)
+            return
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            yield from map_replicates(tasks, executor, workers)
+        return
+
+    chunksize = max(1, len(tasks) // (workers * 4))
+    yield from executor.map(_run_replicate_task, tasks, chunksize=chunksize)
+
+
+def summarize_replicates(results):
+    """
+    Aggregates replicate results.
+
+    Returns:
+        dict: replicate count, count and rate of each mission_status, the
+        distribution of steps to SUCCESS and to FAILURE, and the mean and
+        standard deviation of every final metric.
+    """
+    total = len(results)
+    summary = {"replicates": total, "status_counts": {}, "status_rates": {}}
+    for status in ("SUCCESS", "FAILURE", "ONGOING"):
+        count = sum(1 for result in results if result["mission_status"] == status)
+        summary["status_counts"][status] = count
+        summary["status_rates"][status] = count / total if total else 0.0
+
+    for status, key in (("SUCCESS", "time_to_success"), ("FAILURE", "time_to_failure")):
+        steps = [
+            result["steps"] for result in results if result["mission_status"] == status
+        ]
+        summary[key] = _describe(steps)
+
+    columns = []
+    for result in results:
+        for column in result["final_metrics"]:
+            if column not in columns:
+                columns.append(column)
+    summary["final_metrics"] = {
+        column: _describe(
+            [
+                result["final_metrics"][column]
+                for result in results
+                if column in result["final_metrics"]
+            ]
+        )
+        for column in columns
+    }
+    return summary
+
+
+def wilson_interval(successes, trials, confidence=0.95):
+    """
+    Wilson score interval for a binomial proportion.
+
+    Returns:
+        tuple: (lower, upper) bounds, (0.0, 1.0) when there are no trials.
+    """
+    if trials == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    rate = successes / trials
+    denominator = 1 + z * z / trials
+    center = (rate + z * z / (2 * trials)) / denominator
+    margin = (
+        z
+        * math.sqrt(rate * (1 - rate) / trials + z * z / (4 * trials * trials))
+        / denominator
+    )
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def _describe(values):
+    if not values:
+        return None
+    array = np.asarray(values, dtype=float)
+    return {
+        "mean": float(array.mean()),
+        "std": float(array.std()),
+        "min": float(array.min()),
+        "p10": float(np.percentile(array, 10)),
+        "median": float(np.median(array)),
+        "p90": float(np.percentile(array, 90)),
+        "max": float(array.max()),
+    }
@@ -0,0 +1,486 @@
+"""
+Scaling benchmarks for the Mars Crisis ABM.
+
+Each scenario tiles the base layout into a larger base and scales the crew
+and robot fleet with it, then measures model construction, warm steady-state
+steps and a full run until the model stops or reaches max_steps. Results
+include steps/sec, the peak resident set size of the process that ran the
+scenario, the per-phase breakdown of StepProfiler and the cold import time
+of the package, and can be compared against a stored baseline to flag
+regressions.
+
+Run with: python -m mars_crisis_abm.benchmarks
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .batch import DEFAULT_MAX_STEPS
+from .model import MarsModel
+from .utils import assign_equipment_integrities, load_config, parse_grid_layout_csv
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+CONFIG_PATH = "config/params.json"
+LAYOUT_PATH = "config/grid_layout.csv"
+BASELINE_PATH = "config/benchmark_baseline.json"
+
+# Module a replicate worker imports, timed in a fresh interpreter
+IMPORT_MODULE = "mars_crisis_abm.batch"
+_IMPORT_PROBE = (
+    "import time; start = time.perf_counter(); import {module}; "
+    "print(time.perf_counter() - start)"
+)
+
+# Scenario name -> (layout tiles per side, fleet multiplier). The crew grows
+# with the area (tiles squared); with the default configuration the fleets
+# are 37, 148, 592 and 1036 robots.
+SCENARIOS = {
+    "1x": (1, 1),
+    "4x": (2, 4),
+    "16x": (4, 16),
+    "16x-1k": (4, 28),
+}
+
+# Steps run before timing the steady state, and steps timed
+DEFAULT_WARMUP_STEPS = 5
+DEFAULT_STEADY_STEPS = 20
+
+# Relative slowdown (or memory growth) tolerated before flagging a regression
+DEFAULT_TOLERANCE = 0.15
+
+# Metrics compared against the baseline, with whether higher is better
+BASELINE_METRICS = (
+    ("construction_seconds", False),
+    ("steady_steps_per_second", True),
+    ("run_steps_per_second", True),
+    ("peak_rss_mb", False),
+    ("import_seconds", False),
+)
+
+
+def tile_layout(grid_data, equipment_cells, tiles):
+    """
+    Repeats a layout tiles times along each axis.
+
+    Returns:
+        tuple: (grid_data, equipment_cells) of the tiled layout, equipment
+        cells being offset into every tile in row-major tile order.
+    """
+    height = len(grid_data)
+    width = len(grid_data[0]) if grid_data else 0
+    tiled_grid = [list(row) * tiles for _ in range(tiles) for row in grid_data]
+    tiled_cells = [
+        dict(cell, x=cell["x"] + tx * width, y=cell["y"] + ty * height)
+        for ty in range(tiles)
+        for tx in range(tiles)
+        for cell in equipment_cells
+    ]
+    return tiled_grid, tiled_cells
+
+
+def scale_config(config_params, fleet_scale, crew_scale):
+    """Returns config_params with every robot count and the crew size scaled"""
+    return dict(
+        config_params,
+        CREW_SIZE=config_params["CREW_SIZE"] * crew_scale,
+        ROBOT_COUNTS={
+            robot_class: count * fleet_scale
+            for robot_class, count in config_params["ROBOT_COUNTS"].items()
+        },
+    )
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MiB, or None if unknown"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and in KiB elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def measure_import_seconds(module=IMPORT_MODULE):
+    """Seconds a fresh interpreter takes to import module"""
+    completed = subprocess.run(
+        [sys.executable, "-c", _IMPORT_PROBE.format(module=module)],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # mesa may print warnings of its own before the timing
+    return float(completed.stdout.strip().splitlines()[-1])
+
+
+def run_scenario(
+    name,
+    config_params,
+    layout_path=LAYOUT_PATH,
+    seed=0,
+    warmup_steps=DEFAULT_WARMUP_STEPS,
+    steady_steps=DEFAULT_STEADY_STEPS,
+    max_steps=DEFAULT_MAX_STEPS,
+):
+    """
+    Benchmarks one scenario of SCENARIOS.
+
+    The steady state is timed without profiling over steady_steps after
+    warmup_steps, and a fork of the warm model runs the same steps with
+    profiling for the per-phase breakdown. The full run uses a fresh model
+    with the same seed. Fewer steps are reported when the model stops early.
+
+    Returns:
+        dict: Scenario size, construction_seconds, steady and full run
+        steps and steps/sec, mission_status, phases (ms per step by
+        StepProfiler label), peak_rss_mb and import_seconds (the cold
+        import of IMPORT_MODULE).
+    """
+    tiles, fleet_scale = SCENARIOS[name]
+    config_params = scale_config(config_params, fleet_scale, tiles * tiles)
+    grid_data, equipment_cells = parse_grid_layout_csv(layout_path)
+    grid_data, equipment_cells = tile_layout(grid_data, equipment_cells, tiles)
+
+    def build():
+        # Agents may draw from the global generator, seed it too
+        random.seed(seed)
+        equipment_positions = assign_equipment_integrities(
+            equipment_cells, random.Random(seed)
+        )
+        start = time.perf_counter()
+        model = MarsModel(config_params, grid_data, equipment_positions, seed=seed)
+        return model, time.perf_counter() - start
+
+    model, construction_seconds = build()
+    _run(model, warmup_steps)
+    profiled = model.fork()
+    steady_run, steady_seconds = _run(model, steady_steps)
+    profiled.enable_profiling()
+    _run(profiled, steady_steps)
+    profiler = profiled.profiler
+    phases = {
+        label: seconds / profiler.steps * 1000
+        for label, seconds in profiler.totals.items()
+        if profiler.steps
+    }
+
+    model, _ = build()
+    run_steps, run_seconds = _run(model, max_steps)
+
+    return {
+        "scenario": name,
+        "width": len(grid_data[0]) if grid_data else 0,
+        "height": len(grid_data),
+        "robots": sum(config_params["ROBOT_COUNTS"].values()),
+        "crew": config_params["CREW_SIZE"],
+        "construction_seconds": construction_seconds,
+        "steady_steps": steady_run,
+        "steady_steps_per_second": _rate(steady_run, steady_seconds),
+        "run_steps": run_steps,
+        "run_seconds": run_seconds,
+        "run_steps_per_second": _rate(run_steps, run_seconds),
+        "mission_status": model.mission_status,
+        "phases": phases,
+        "peak_rss_mb": peak_rss_mb(),
+        "import_seconds": measure_import_seconds(),
+    }
+
+
+def _run(model, steps):
+    """Steps model up to steps times while it runs. Returns (steps, seconds)"""
+    ran = 0
+    start = time.perf_counter()
+    while model.running and ran < steps:
+        model.step()
+        ran += 1
+    return ran, time.perf_counter() - start
+
+
+def _rate(steps, seconds):
+    return steps / seconds if seconds > 0 else None
+
+
+def _run_scenario_task(task):
+    return run_scenario(*task)
+
+
+def run_benchmarks(
+    names,
+    config_params,
+    layout_path=LAYOUT_PATH,
+    seed=0,
+    warmup_steps=DEFAULT_WARMUP_STEPS,
+    steady_steps=DEFAULT_STEADY_STEPS,
+    max_steps=DEFAULT_MAX_STEPS,
+    isolate=True,
+):
+    """
+    Runs the named scenarios one after the other.
+
+    With isolate, each scenario runs in a freshly spawned worker process so
+    its peak RSS is its own; otherwise they run here and peak_rss_mb is the peak of
+    this process so far.
+
+    Returns:
+        list: One result dict per scenario (see run_scenario), in order.
+    """
+    results = []
+    for name in names:
+        task = (
+            name,
+            config_params,
+            layout_path,
+            seed,
+            warmup_steps,
+            steady_steps,
+            max_steps,
+        )
+        if isolate:
+            # A forked worker would start with this process's peak RSS
+            with ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                results.append(executor.submit(_run_scenario_task, task).result())
+        else:
+            results.append(_run_scenario_task(task))
+    return results
+
+
+def environment_info():
+    """Describes the interpreter and machine the benchmarks ran on"""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def make_baseline(results):
+    """Baseline record of results, as stored by save_baseline()"""
+    return {
+        "environment": environment_info(),
+        "scenarios": {
+            result["scenario"]: {
+                metric: result[metric] for metric, _ in BASELINE_METRICS
+            }
+            for result in results
+        },
+    }
+
+
+def load_baseline(path=BASELINE_PATH):
+    """Loads a stored baseline, or returns None if there is none at path"""
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(results, path=BASELINE_PATH, baseline=None):
+    """
+    Stores results as the baseline at path, keeping the stored scenarios of
+    baseline that were not run.
+    """
+    record = make_baseline(results)
+    if baseline is not None:
+        record["scenarios"] = {**baseline.get("scenarios", {}), **record["scenarios"]}
+    with open(path, "w") as f:
+        json.dump(record, f, indent=4, sort_keys=True)
+    return record
+
+
+def compare_to_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compares results with a stored baseline.
+
+    A metric regresses when it is worse than its baseline by more than
+    tolerance, relative to the baseline value. Scenarios or metrics missing
+    from either side are skipped.
+
+    Returns:
+        list: One dict per compared metric with scenario, metric, baseline,
+        current, change (relative, positive when better) and regression.
+    """
+    stored = baseline.get("scenarios", {}) if baseline else {}
+    comparisons = []
+    for result in results:
+        reference = stored.get(result["scenario"])
+        if reference is None:
+            continue
+        for metric, higher_is_better in BASELINE_METRICS:
+            before, after = reference.get(metric), result.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            if not higher_is_better:
+                change = -change
+            comparisons.append(
+                {
+                    "scenario": result["scenario"],
+                    "metric": metric,
+                    "baseline": before,
+                    "current": after,
+                    "change": change,
+                    "regression": change < -tolerance,
+                }
+            )
+    return comparisons
+
+
+def format_results(results):
+    """Formats benchmark results as a table with one block per scenario"""
+    lines = []
+    for result in results:
+        lines.append(
+            f"{result['scenario']}: {result['width']}x{result['height']} grid, "
+            f"{result['robots']} robots, {result['crew']} crew"
+        )
+        lines.append(f"  import        {result['import_seconds']:9.3f} s")
+        lines.append(f"  construction  {result['construction_seconds']:9.3f} s")
+        lines.append(
+            f"  steady        {_format_rate(result['steady_steps_per_second'])}"
+            f"  ({result['steady_steps']} steps)"
+        )
+        lines.append(
+            f"  full run      {_format_rate(result['run_steps_per_second'])}"
+            f"  ({result['run_steps']} steps, {result['mission_status']})"
+        )
+        if result["peak_rss_mb"] is not None:
+            lines.append(f"  peak RSS      {result['peak_rss_mb']:9.1f} MiB")
+        phases = sorted(result["phases"].items(), key=lambda t: -t[1])
+        width = max((len(label) for label, _ in phases), default=0)
+        for label, ms_per_step in phases:
+            lines.append(f"    {label:<{width}}  {ms_per_step:9.3f} ms/step")
+    return "\n".join(lines)
+
+
+def format_comparisons(comparisons):
+    """Formats baseline comparisons, flagging regressions"""
+    lines = []
+    for comparison in comparisons:
+        flag = "REGRESSION" if comparison["regression"] else "ok"
+        lines.append(
+            f"{comparison['scenario']:<8} {comparison['metric']:<24} "
+            f"{comparison['baseline']:12.3f} -> {comparison['current']:12.3f} "
+            f"({comparison['change']:+.1%})  {flag}"
+        )
+    return "\n".join(lines)
+
+
+def _format_rate(rate):
+    return f"{rate:9.1f} steps/s" if rate is not None else "        - steps/s"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m mars_crisis_abm.benchmarks")
+    parser.add_argument(
+        "scenarios",
+        nargs="*",
+        metavar="SCENARIO",
+        help=f"scenarios to run, among {', '.join(SCENARIOS)} (default: all)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument(
+        "--warmup-steps",
+        type=int,
+        default=DEFAULT_WARMUP_STEPS,
+        help="steps run before timing the steady state",
+    )
+    parser.add_argument(
+        "--steady-steps",
+        type=int,
+        default=DEFAULT_STEADY_STEPS,
+        help="steps timed in the steady state",
+    )
+    parser.add_argument(
+        "--max-steps",
+        type=int,
+        default=DEFAULT_MAX_STEPS,
+        help="step limit of the full run",
+    )
+    parser.add_argument(
+        "--baseline",
+        default=BASELINE_PATH,
+        help=f"baseline file to compare against (default: {BASELINE_PATH})",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="store these results as the new baseline",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="relative change tolerated before flagging a regression",
+    )
+    parser.add_argument("--json", help="also write the raw results to this file")
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="run every scenario in this process (peak RSS is then cumulative)",
+    )
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+    args.scenarios = args.scenarios or list(SCENARIOS)
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config_params = load_config(CONFIG_PATH)
+
+    results = run_benchmarks(
+        args.scenarios,
+        config_params,
+        seed=args.seed,
+        warmup_steps=args.warmup_steps,
+        steady_steps=args.steady_steps,
+        max_steps=args.max_steps,
+        isolate=not args.in_process,
+    )
+    print(format_results(results))
+    print("-" * 50)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {"environment": environment_info(), "results": results}, f, indent=4
+            )
+
+    baseline = load_baseline(args.baseline)
+    regressions = []
+    if baseline is None:
+        print(f"No baseline at {args.baseline}")
+    else:
+        if baseline.get("environment") != environment_info():
+            print("Baseline was recorded on a different environment")
+        comparisons = compare_to_baseline(results, baseline, args.tolerance)
+        print(format_comparisons(comparisons))
+        regressions = [c for c in comparisons if c["regression"]]
+        print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline, baseline)
+        print(f"Baseline saved to {args.baseline}")
+    elif regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -18,46 +18,75 @@ from .agents import (
 from .utils import ZONE_ENVIRONMENT_MAP, ZoneCode, ROBOT_OPERATIONAL_ZONES
 
 
-def build_base_from_blueprint(model, grid_data):
+WALL_ZONES = ("habitat_wall", "power_wall")
+
+
+def build_base_from_blueprint(model, grid_data, blueprint=None):
+    """
+    Builds the zone table and wall agents from grid_data, or from a
+    precompiled blueprint of the same layout (see blueprint_cache).
+    """
+    if blueprint is None:
+        zones = build_zone_table(grid_data)
+        wall_cells = find_wall_cells(grid_data)
+    else:
+        zones = blueprint.zone_table()
+        wall_cells = blueprint.wall_cells
+
+    model.zones.update(zones)
+
+    for x, y, zone_code in wall_cells:
+        wall_agents = _create_wall_agents(zone_code, model)
+        for wall_agent in wall_agents:
+            model.grid.place_agent(wall_agent, (x, y))
+
+
+def build_zone_table(grid_data):
+    """Computes bounds, environment type and placement positions of every zone"""
     height = len(grid_data)
     width = len(grid_data[0])
+    zones = {}
 
-    # First pass: create zones - grid_data already contains mapped zone names
+    # grid_data already contains mapped zone names
     for y in range(height):
         for x in range(width):
             zone_code_str = grid_data[y][x]
 
-            if zone_code_str not in model.zones:
+            if zone_code_str not in zones:
                 zone_code_enum = ZoneCode(zone_code_str)
-                model.zones[zone_code_str] = {
+                zones[zone_code_str] = {
                     "code": zone_code_enum.value,
                     "bounds": [x, y, x, y],
                     "type": ZONE_ENVIRONMENT_MAP.get(zone_code_enum).value,
                     "positions": [],  # Track valid positions for agent placement
                 }
             else:
-                current_bounds = model.zones[zone_code_str]["bounds"]
-                model.zones[zone_code_str]["bounds"][0] = min(current_bounds[0], x)
-                model.zones[zone_code_str]["bounds"][1] = min(current_bounds[1], y)
-                model.zones[zone_code_str]["bounds"][2] = max(current_bounds[2], x)
-                model.zones[zone_code_str]["bounds"][3] = max(current_bounds[3], y)
+                current_bounds = zones[zone_code_str]["bounds"]
+                zones[zone_code_str]["bounds"][0] = min(current_bounds[0], x)
+                zones[zone_code_str]["bounds"][1] = min(current_bounds[1], y)
+                zones[zone_code_str]["bounds"][2] = max(current_bounds[2], x)
+                zones[zone_code_str]["bounds"][3] = max(current_bounds[3], y)
 
             # Only add positions to non-wall zones for agent placement
-            if zone_code_str not in ["habitat_wall", "power_wall"]:
-                model.zones[zone_code_str]["positions"].append((x, y))
+            if zone_code_str not in WALL_ZONES:
+                zones[zone_code_str]["positions"].append((x, y))
 
     # After populating all zones, adjust max_x and max_y to be inclusive
-    for zone_data in model.zones.values():
+    for zone_data in zones.values():
         zone_data["bounds"][2] += 1  # max_x becomes exclusive upper bound
         zone_data["bounds"][3] += 1  # max_y becomes exclusive upper bound
 
-    # Second pass: create wall agents
-    for y in range(height):
-        for x in range(width):
-            zone_code = grid_data[y][x]
-            wall_agents = _create_wall_agents(zone_code, model)
-            for wall_agent in wall_agents:
-                model.grid.place_agent(wall_agent, (x, y))
+    return zones
+
+
+def find_wall_cells(grid_data):
+    """Returns (x, y, zone_code) for every wall cell, in row-major order"""
+    return [
+        (x, y, zone_code)
+        for y, row in enumerate(grid_data)
+        for x, zone_code in enumerate(row)
+        if zone_code in WALL_ZONES
+    ]
 
 
 def _create_wall_agents(zone_code, model):
@@ -72,9 +101,11 @@ def _create_wall_agents(zone_code, model):
     return []
 
 
-def setup_mars_base(model, grid_data, equipment_positions, config_params):
+def setup_mars_base(
+    model, grid_data, equipment_positions, config_params, blueprint=None
+):
     """Main function to set up the entire Mars base including zones, walls, equipment, humans, and robots"""
-    build_base_from_blueprint(model, grid_data)
+    build_base_from_blueprint(model, grid_data, blueprint)
     _create_equipment_agents(model, equipment_positions)
     _create_human_agents(model, config_params)
     _create_robot_agents(model, config_params)
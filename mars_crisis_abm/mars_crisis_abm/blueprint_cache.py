@@ -0,0 +1,140 @@
+"""
+Compiled blueprints: everything MarsModel derives from a layout file before
+placing agents, computed once and cached on disk.
+
+A CompiledBlueprint holds the parsed zone names, the zone table (bounds,
+environment type and placement positions), the per-cell zone ids, the wall
+cells and the equipment cells of a layout. It is stored as a pickle named after the SHA-256 of the
+layout file, so editing the layout compiles a new artifact and a cached one
+can never go stale.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+
+from .blueprint import build_zone_table, find_wall_cells
+from .utils import (
+    ZoneIndex,
+    assign_equipment_integrities,
+    compute_cell_zone_ids,
+    parse_grid_layout_csv,
+)
+
+# Bump when the compiled format changes so old artifacts are ignored
+BLUEPRINT_FORMAT_VERSION = 2
+
+
+class CompiledBlueprint:
+    """Precomputed layout data, see build_base_from_blueprint(blueprint=...)"""
+
+    def __init__(
+        self, layout_hash, grid_data, zones, cell_zone_ids, wall_cells, equipment_cells
+    ):
+        self.layout_hash = layout_hash
+        self.grid_data = grid_data
+        self.zones = zones
+        self.cell_zone_ids = cell_zone_ids
+        self.wall_cells = wall_cells
+        self.equipment_cells = equipment_cells
+
+    @property
+    def width(self):
+        return len(self.grid_data[0])
+
+    @property
+    def height(self):
+        return len(self.grid_data)
+
+    def zone_table(self):
+        """Returns a copy of the zone table that a model can own and modify"""
+        return {
+            zone_code: dict(
+                zone_data,
+                bounds=list(zone_data["bounds"]),
+                positions=list(zone_data["positions"]),
+            )
+            for zone_code, zone_data in self.zones.items()
+        }
+
+    def zone_index(self):
+        return ZoneIndex(self.zones, self.cell_zone_ids)
+
+    def equipment_positions(self, rng=None):
+        """
+        Draws the randomized equipment integrities, in the same order and from
+        the same distribution as load_grid_layout_csv.
+        """
+        return assign_equipment_integrities(self.equipment_cells, rng)
+
+
+def layout_hash(layout_path):
+    with open(layout_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def compile_blueprint(layout_path):
+    """Parses layout_path and precomputes its zone table and wall cells"""
+    grid_data, equipment_cells = parse_grid_layout_csv(layout_path)
+    zones = build_zone_table(grid_data)
+    zone_ids = {code: zone_id for zone_id, code in enumerate(zones)}
+    return CompiledBlueprint(
+        layout_hash(layout_path),
+        grid_data,
+        zones,
+        compute_cell_zone_ids(grid_data, zone_ids),
+        find_wall_cells(grid_data),
+        equipment_cells,
+    )
+
+
+def default_cache_dir():
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "mars_crisis_abm", "blueprints")
+
+
+def load_compiled_blueprint(layout_path, cache_dir=None):
+    """
+    Returns the compiled blueprint of layout_path, from the disk cache when an
+    artifact for the file's current contents exists, compiling and caching it
+    otherwise. An unreadable artifact is recompiled; failing to write the
+    cache is not an error.
+
+    Args:
+        layout_path (str): Path to the grid layout CSV.
+        cache_dir (str, optional): Cache directory, defaults to
+            $XDG_CACHE_HOME/mars_crisis_abm/blueprints.
+    """
+    cache_dir = cache_dir or default_cache_dir()
+    digest = layout_hash(layout_path)
+    artifact_path = os.path.join(
+        cache_dir, f"{digest}.v{BLUEPRINT_FORMAT_VERSION}.pickle"
+    )
+
+    try:
+        with open(artifact_path, "rb") as f:
+            blueprint = pickle.load(f)
+        if blueprint.layout_hash == digest:
+            return blueprint
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        pass
+
+    blueprint = compile_blueprint(layout_path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temporary file first so concurrent workers never read a
+        # partial artifact
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(blueprint, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, artifact_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+    except OSError:
+        pass
+    return blueprint
@@ -0,0 +1,286 @@
+import math
+
+import numpy as np
+
+from .utils import DEFAULT_COMMUNICATION_RANGE
+
+
+class CommunicationMesh:
+    """
+    Connected components of the robot communication mesh at one instant.
+
+    Two robots are linked when they are within communication_range of each
+    other. The default chebyshev distance matches the Moore neighborhood
+    range search of Robot._is_connected_to_network(); euclidean gives a
+    disc instead. Robots are bucketed into a spatial hash whose cells are
+    small enough that every robot in a cell reaches every other one, so each
+    cell joins its component as a whole and only pairs of nearby cells need a
+    distance check. Afterwards connectivity, component ids and peer sets are
+    O(1) lookups.
+
+    Robots get dense ids in iteration order, exposed through ids and robots.
+    """
+
+    def __init__(
+        self, robots, communication_range=DEFAULT_COMMUNICATION_RANGE, metric="chebyshev"
+    ):
+        if metric not in ("euclidean", "chebyshev"):
+            raise ValueError(f"Unknown distance metric: {metric}")
+        self.communication_range = communication_range
+        self.metric = metric
+
+        self.robots = [robot for robot in robots if robot.pos is not None]
+        self.ids = {robot: robot_id for robot_id, robot in enumerate(self.robots)}
+        self.positions = np.array(
+            [robot.pos for robot in self.robots], dtype=np.float64
+        ).reshape(-1, 2)
+
+        self.component = self._label_components()
+        self.component_sizes = np.bincount(self.component, minlength=1)
+        self._members = None
+
+    def __len__(self):
+        return len(self.robots)
+
+    def __contains__(self, robot):
+        return robot in self.ids
+
+    @property
+    def components(self):
+        return len(self.component_sizes) if len(self.robots) else 0
+
+    def component_of(self, robot):
+        """Returns the component id of robot, or None if it is not in the mesh"""
+        robot_id = self.ids.get(robot)
+        return None if robot_id is None else int(self.component[robot_id])
+
+    def is_connected(self, robot):
+        """Whether robot has at least one other robot in communication range"""
+        robot_id = self.ids.get(robot)
+        if robot_id is None:
+            return False
+        return bool(self.component_sizes[self.component[robot_id]] > 1)
+
+    def members(self, component_id):
+        """Returns the dense ids of the robots in a component"""
+        if self._members is None:
+            order = np.argsort(self.component, kind="stable")
+            bounds = np.cumsum(self.component_sizes)[:-1]
+            self._members = np.split(order, bounds)
+        return self._members[component_id]
+
+    def peers(self, robot):
+        """Returns the robots reachable from robot through the mesh, excluding it"""
+        component_id = self.component_of(robot)
+        if component_id is None:
+            return []
+        return [
+            self.robots[robot_id]
+            for robot_id in self.members(component_id)
+            if self.robots[robot_id] is not robot
+        ]
+
+    def within_range(self, robot_id, candidate_ids):
+        """Returns the candidate ids within communication range of robot_id"""
+        candidate_ids = np.asarray(candidate_ids, dtype=np.int64)
+        deltas = np.abs(self.positions[candidate_ids] - self.positions[robot_id])
+        return candidate_ids[self._in_range(deltas)]
+
+    def _in_range(self, deltas):
+        if self.metric == "chebyshev":
+            return deltas.max(axis=-1) <= self.communication_range
+        return (deltas**2).sum(axis=-1) <= self.communication_range**2
+
+    def _label_components(self):
+        count = len(self.robots)
+        if count == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        # Cell side such that any two points of a cell are within range
+        if self.metric == "chebyshev":
+            side = self.communication_range
+        else:
+            side = self.communication_range / math.sqrt(2)
+        reach = math.ceil(self.communication_range / side)
+
+        cells = np.floor(self.positions / side).astype(np.int64)
+        buckets = {}
+        for robot_id, (cx, cy) in enumerate(cells.tolist()):
+            buckets.setdefault((cx, cy), []).append(robot_id)
+        keys = list(buckets)
+        members = {key: np.array(ids) for key, ids in buckets.items()}
+
+        # Union-find over cells
+        parent = {key: key for key in keys}
+
+        def find(key):
+            while parent[key] != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+
+        for key in keys:
+            cx, cy = key
+            for dx in range(0, reach + 1):
+                for dy in range(-reach, reach + 1):
+                    if dx == 0 and dy <= 0:
+                        continue
+                    other = (cx + dx, cy + dy)
+                    if other not in members:
+                        continue
+                    root, other_root = find(key), find(other)
+                    if root == other_root:
+                        continue
+                    deltas = np.abs(
+                        self.positions[members[key]][:, None, :]
+                        - self.positions[members[other]][None, :, :]
+                    )
+                    if self._in_range(deltas).any():
+                        parent[other_root] = root
+
+        # Dense component ids in order of first robot
+        labels = {}
+        component = np.empty(count, dtype=np.int64)
+        for key in keys:
+            root = find(key)
+            if root not in labels:
+                labels[root] = len(labels)
+            component[members[key]] = labels[root]
+        return component
+
+
+class BroadcastEngine:
+    """
+    Batched simple flooding over a CommunicationMesh.
+
+    Robots queue messages with broadcast() during a step and the model
+    delivers the whole queue in one pass with deliver(). Flooding, where every
+    robot rebroadcasts a newly seen message once to the robots in range,
+    reaches exactly the sender's mesh component, so a message goes to every
+    member of that component that has not seen it yet.
+
+    Robots get stable dense ids, and the robots that have seen a message are
+    kept as a bitset over those ids (a Python int). Re-broadcasting a message
+    with the same key, for example the same threat detected twice, therefore
+    only reaches the robots it has not reached before. At most max_messages
+    keys are remembered; the least recently broadcast key is forgotten
+    first. A delivery pass costs O(messages x component size).
+    """
+
+    def __init__(self, max_messages=1024):
+        self.max_messages = max_messages
+        self.pending = []
+        # Message key -> bitset of the robots that have seen it, in LRU order
+        self._seen = {}
+        self._robot_ids = {}
+        self._robots = []
+        self._free_ids = []
+        self._inboxes = {}
+        self._sequence = 0
+
+    def __len__(self):
+        return len(self._seen)
+
+    def broadcast(self, sender, message, key=None):
+        """
+        Queues message from sender for the next delivery pass. Messages with
+        the same key are duplicates; without a key every broadcast is new.
+        """
+        if key is None:
+            self._sequence += 1
+            key = (sender.unique_id, self._sequence)
+        self.pending.append((sender, key, message))
+
+    def received(self, robot):
+        """Returns the messages delivered to robot by the latest pass"""
+        return self._inboxes.get(robot, [])
+
+    def has_seen(self, robot, key):
+        robot_id = self._robot_ids.get(robot)
+        if robot_id is None:
+            return False
+        return bool(self._seen.get(key, 0) >> robot_id & 1)
+
+    def clear(self):
+        """Empties the inboxes of the previous pass"""
+        self._inboxes = {}
+
+    def forget(self, robot):
+        """Releases the dense id of a robot that left the model"""
+        robot_id = self._robot_ids.pop(robot, None)
+        if robot_id is not None:
+            self._robots[robot_id] = None
+            self._free_ids.append(robot_id)
+        self._inboxes.pop(robot, None)
+
+    def deliver(self, mesh):
+        """
+        Floods every queued message through mesh and fills the inboxes.
+
+        Returns:
+            int: Number of (message, recipient) deliveries.
+        """
+        self._inboxes = {}
+        pending, self.pending = self.pending, []
+        if not pending:
+            return 0
+
+        mesh_ids = np.array(
+            [self._robot_id(robot) for robot in mesh.robots], dtype=np.int64
+        )
+        component_masks = {}
+        deliveries = 0
+
+        for sender, key, message in pending:
+            sender_id = self._robot_id(sender)
+            seen = self._seen.pop(key, 0) | (1 << sender_id)
+
+            component_id = mesh.component_of(sender)
+            if component_id is not None:
+                mask = component_masks.get(component_id)
+                if mask is None:
+                    mask = _bitset(mesh_ids[mesh.members(component_id)])
+                    component_masks[component_id] = mask
+                for robot_id in _bit_indices(mask & ~seen):
+                    self._inboxes.setdefault(self._robots[robot_id], []).append(
+                        message
+                    )
+                    deliveries += 1
+                seen |= mask
+
+            self._seen[key] = seen
+            if len(self._seen) > self.max_messages:
+                del self._seen[next(iter(self._seen))]
+
+        return deliveries
+
+    def _robot_id(self, robot):
+        robot_id = self._robot_ids.get(robot)
+        if robot_id is not None:
+            return robot_id
+        if self._free_ids:
+            robot_id = self._free_ids.pop()
+            # The id's previous owner may still be marked in old bitsets
+            cleared = ~(1 << robot_id)
+            for key in self._seen:
+                self._seen[key] &= cleared
+            self._robots[robot_id] = robot
+        else:
+            robot_id = len(self._robots)
+            self._robots.append(robot)
+        self._robot_ids[robot] = robot_id
+        return robot_id
+
+
+def _bitset(ids):
+    bits = np.zeros(int(ids.max()) + 1 if len(ids) else 0, dtype=bool)
+    bits[ids] = True
+    return int.from_bytes(np.packbits(bits, bitorder="little").tobytes(), "little")
+
+
+def _bit_indices(bitset):
+    if not bitset:
+        return []
+    size = (bitset.bit_length() + 7) // 8
+    raw = np.frombuffer(bitset.to_bytes(size, "little"), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(raw, bitorder="little")).tolist()
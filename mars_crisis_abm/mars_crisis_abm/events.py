@@ -0,0 +1,99 @@
+from .utils import INTEGRITY_THRESHOLDS
+
+DOWN = "down"
+UP = "up"
+
+
+class IntegrityCrossing:
+    """A structure's integrity passing one of the integrity thresholds"""
+
+    __slots__ = ("structure", "threshold", "direction", "old", "new")
+
+    def __init__(self, structure, threshold, direction, old, new):
+        self.structure = structure
+        self.threshold = threshold
+        self.direction = direction
+        self.old = old
+        self.new = new
+
+    def __repr__(self):
+        return (
+            f"IntegrityCrossing({type(self.structure).__name__}, "
+            f"{self.threshold}, {self.direction}, {self.old} -> {self.new})"
+        )
+
+
+class EventBus:
+    """
+    Model event bus for structure integrity threshold crossings.
+
+    The model forwards every integrity write to integrity_changed(), which
+    turns writes that cross one of the thresholds into IntegrityCrossing
+    events: DOWN when integrity drops below the threshold, UP when it gets
+    back to it or above. Several thresholds crossed by one write produce one
+    event each, in the direction of travel. Subscribers are called
+    synchronously, so reacting to crossings costs O(events) rather than a
+    sweep over every structure. Writes that cross nothing, and all writes
+    while nobody is subscribed, return after a comparison or two. The first
+    integrity assignment of a structure is not a crossing.
+
+    Subscribers are stored on the model, so snapshots need them to be
+    picklable (functions or bound methods, not lambdas).
+    """
+
+    def __init__(self, thresholds=INTEGRITY_THRESHOLDS):
+        self.thresholds = tuple(sorted(thresholds, reverse=True))
+        self._subscribers = []
+
+    def __len__(self):
+        return len(self._subscribers)
+
+    def subscribe(
+        self, callback, thresholds=None, direction=None, structure_class=None
+    ):
+        """
+        Calls callback(event) for crossings, optionally only of the given
+        thresholds, direction (DOWN or UP) or structure class.
+
+        Returns:
+            The subscription, to pass to unsubscribe().
+        """
+        if direction not in (None, DOWN, UP):
+            raise ValueError(f"Unknown crossing direction: {direction}")
+        subscription = (
+            callback,
+            None if thresholds is None else frozenset(thresholds),
+            direction,
+            structure_class,
+        )
+        self._subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self._subscribers.remove(subscription)
+
+    def integrity_changed(self, structure, old, new):
+        if not self._subscribers or old is None or old == new:
+            return
+        if new < old:
+            crossed = [t for t in self.thresholds if new < t <= old]
+            direction = DOWN
+        else:
+            crossed = [t for t in reversed(self.thresholds) if old < t <= new]
+            direction = UP
+        for threshold in crossed:
+            self.publish(IntegrityCrossing(structure, threshold, direction, old, new))
+
+    def publish(self, event):
+        for callback, thresholds, direction, structure_class in list(
+            self._subscribers
+        ):
+            if thresholds is not None and event.threshold not in thresholds:
+                continue
+            if direction is not None and event.direction != direction:
+                continue
+            if structure_class is not None and not isinstance(
+                event.structure, structure_class
+            ):
+                continue
+            callback(event)
@@ -0,0 +1,85 @@
+import numpy as np
+
+from .utils import FIRE_SPREAD_INTENSITY, FIRE_SPREAD_RADIUS, ignite
+
+
+class FireGrid:
+    """
+    Grid-level fire propagation. Fire intensity is kept as a 2D array aligned
+    to the model grid (indexed [x, y], highest intensity in each cell), and
+    each step every fire front spreads at once: the cells holding structures
+    at or above FIRE_SPREAD_INTENSITY are counted over the radius-3 Moore
+    window with a box sum, and the flammable structures at rest in reached
+    cells are ignited with the same rule as spread_fire.
+
+    As with grid.get_neighbors, a fire does not spread to structures sharing
+    its own cell.
+    """
+
+    def __init__(self, grid, structures, radius=FIRE_SPREAD_RADIUS):
+        self.width = grid.width
+        self.height = grid.height
+        self.radius = radius
+        self.intensity = np.zeros((self.width, self.height), dtype=np.float32)
+
+        # Flammable structures per cell, in grid order
+        self.flammable = np.zeros((self.width, self.height), dtype=bool)
+        self._cell_structures = {}
+        for structure in structures:
+            if structure.pos is None or not hasattr(structure, "fire_intensity"):
+                continue
+            self._cell_structures.setdefault(structure.pos, []).append(structure)
+            self.flammable[structure.pos] = True
+
+    def refresh(self, burning):
+        """Rebuilds the intensity array from the burning structures"""
+        self.intensity.fill(0)
+        for structure in burning:
+            if structure.pos is None:
+                continue
+            x, y = structure.pos
+            self.intensity[x, y] = max(self.intensity[x, y], structure.fire_intensity)
+
+    def step(self, burning, spread_intensity=FIRE_SPREAD_INTENSITY):
+        """
+        Spreads every fire at or above spread_intensity to the flammable
+        structures within radius. Returns the newly ignited structures.
+        """
+        self.refresh(burning)
+
+        sources = np.zeros((self.width, self.height), dtype=np.int32)
+        for structure in burning:
+            if structure.pos is not None and structure.fire_intensity >= spread_intensity:
+                sources[structure.pos] += 1
+        if not sources.any():
+            return []
+
+        # Sources reaching each cell, minus the ones in the cell itself
+        reach = self._window_sum(sources) - sources
+        candidates = np.argwhere((reach > 0) & self.flammable)
+
+        ignited = []
+        for x, y in candidates:
+            for structure in self._cell_structures[(int(x), int(y))]:
+                if structure.fire_intensity == 0:
+                    ignite(structure)
+                    ignited.append(structure)
+                    self.intensity[x, y] = max(
+                        self.intensity[x, y], structure.fire_intensity
+                    )
+        return ignited
+
+    def _window_sum(self, counts):
+        """Sum of counts over the (2 * radius + 1)^2 window around every cell"""
+        size = 2 * self.radius + 1
+        padded = np.pad(counts, self.radius)
+        summed = np.zeros(
+            (padded.shape[0] + 1, padded.shape[1] + 1), dtype=np.int64
+        )
+        summed[1:, 1:] = padded.cumsum(axis=0).cumsum(axis=1)
+        return (
+            summed[size:, size:]
+            - summed[:-size, size:]
+            - summed[size:, :-size]
+            + summed[:-size, :-size]
+        )
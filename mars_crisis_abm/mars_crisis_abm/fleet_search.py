@@ -0,0 +1,231 @@
+"""
+Requirement-based fleet search for the Mars Crisis ABM.
+
+Finds the smallest ROBOT_COUNTS fleet whose SUCCESS rate meets a target. The
+candidate fleets are raced with a successive-halving schedule: every round the
+undecided candidates get their replicate count multiplied by eta, and after
+each round a candidate is settled as soon as its Wilson interval allows it.
+
+- Failing: the upper bound is below the target.
+- Passing: the lower bound reaches the target.
+- Over-provisioned: it needs more robots than a fleet that already passes.
+
+Settled candidates stop receiving replicates, so most of the budget goes to
+the few fleets near the requirement boundary. All candidates share the same
+replicate seeds (common random numbers), which makes their outcomes directly
+comparable.
+"""
+
+import random
+from contextlib import nullcontext
+
+from .batch import (
+    DEFAULT_MAX_STEPS,
+    map_replicates,
+    replicate_pool,
+    replicate_seeds,
+    wilson_interval,
+)
+from .utils import ROBOT_OPERATIONAL_ZONES
+
+ROBOT_TYPES = tuple(ROBOT_OPERATIONAL_ZONES)
+
+UNDECIDED = "undecided"
+PASSING = "passing"
+FAILING = "failing"
+OVER_PROVISIONED = "over-provisioned"
+
+
+class FleetCandidate:
+    """Replicate outcomes collected so far for one candidate fleet"""
+
+    def __init__(self, robot_counts):
+        self.robot_counts = {
+            robot_type: int(robot_counts.get(robot_type, 0))
+            for robot_type in ROBOT_TYPES
+        }
+        self.cost = sum(self.robot_counts.values())
+        self.replicates = 0
+        self.successes = 0
+        self.status = UNDECIDED
+
+    @property
+    def success_rate(self):
+        return self.successes / self.replicates if self.replicates else 0.0
+
+    def interval(self, confidence):
+        return wilson_interval(self.successes, self.replicates, confidence)
+
+    def dominates(self, other):
+        """Whether this fleet has at least as many robots of every type as other"""
+        return all(
+            self.robot_counts[robot_type] >= other.robot_counts[robot_type]
+            for robot_type in ROBOT_TYPES
+        )
+
+    def as_dict(self):
+        return {
+            "robot_counts": dict(self.robot_counts),
+            "cost": self.cost,
+            "replicates": self.replicates,
+            "success_rate": self.success_rate,
+            "status": self.status,
+        }
+
+
+def sample_fleets(max_counts, samples, seed=0):
+    """
+    Draws distinct candidate fleets uniformly from the box
+    0 <= count[type] <= max_counts[type], always including the full fleet.
+
+    Args:
+        max_counts (dict): Maximum count per robot type; missing types are 0.
+        samples (int): Number of candidates to draw.
+        seed (int): Seed for the sampler.
+
+    Returns:
+        list: Distinct robot count dicts.
+    """
+    rng = random.Random(seed)
+    limits = [int(max_counts.get(robot_type, 0)) for robot_type in ROBOT_TYPES]
+    space = 1
+    for limit in limits:
+        space *= limit + 1
+
+    seen = {tuple(limits)}
+    fleets = [tuple(limits)]
+    while len(fleets) < min(samples, space):
+        fleet = tuple(rng.randint(0, limit) for limit in limits)
+        if fleet not in seen:
+            seen.add(fleet)
+            fleets.append(fleet)
+    return [dict(zip(ROBOT_TYPES, fleet)) for fleet in fleets]
+
+
+def search_minimum_fleet(
+    config_params,
+    layout_path,
+    candidates,
+    target_rate=0.95,
+    confidence=0.95,
+    min_replicates=4,
+    max_replicates=64,
+    eta=2,
+    monotone=True,
+    base_seed=0,
+    workers=None,
+    max_steps=DEFAULT_MAX_STEPS,
+    executor=None,
+):
+    """
+    Searches candidates for the cheapest fleet meeting target_rate.
+
+    Args:
+        config_params (dict): Base model configuration, ROBOT_COUNTS is
+            replaced by each candidate.
+        layout_path (str): Path to the grid layout CSV.
+        candidates (list): Robot count dicts to consider.
+        target_rate (float): Required SUCCESS rate.
+        confidence (float): Confidence level of the pruning intervals.
+        min_replicates (int): Replicates per candidate in the first round.
+        max_replicates (int): Replicate cap per candidate; candidates still
+            undecided at the cap are judged on their point estimate.
+        eta (int): Replicate growth factor between rounds.
+        monotone (bool): Assume adding robots never lowers the success rate,
+            so a failing fleet also fails every fleet it dominates.
+        base_seed (int): Seed the shared replicate seeds are derived from.
+        workers (int, optional): Worker processes, see run_replicates.
+        max_steps (int): Step limit per replicate.
+        executor (concurrent.futures.Executor, optional): Caller-owned pool
+            to run the replicates on. Without one, a single pool of workers
+            processes is opened for the whole search.
+
+    Returns:
+        dict: best (the chosen candidate or None), total_replicates run and
+        the final state of every candidate.
+    """
+    pool = []
+    seen = set()
+    for robot_counts in candidates:
+        candidate = FleetCandidate(robot_counts)
+        key = tuple(candidate.robot_counts.values())
+        if key not in seen:
+            seen.add(key)
+            pool.append(candidate)
+
+    seeds = replicate_seeds(base_seed, max_replicates)
+    total_replicates = 0
+    budget = min_replicates
+
+    # One process pool serves every halving round
+    if executor is None:
+        context = replicate_pool(workers)
+    else:
+        context = nullcontext(executor)
+    with context as executor:
+        while True:
+            active = [
+                candidate for candidate in pool if candidate.status == UNDECIDED
+            ]
+            if not active:
+                break
+
+            budget = min(budget, max_replicates)
+            tasks = []
+            owners = []
+            for candidate in active:
+                config = dict(config_params, ROBOT_COUNTS=candidate.robot_counts)
+                for seed in seeds[candidate.replicates : budget]:
+                    tasks.append((config, layout_path, seed, max_steps))
+                    owners.append(candidate)
+
+            results = map_replicates(tasks, executor, workers)
+            for candidate, result in zip(owners, results):
+                candidate.replicates += 1
+                if result["mission_status"] == "SUCCESS":
+                    candidate.successes += 1
+            total_replicates += len(tasks)
+
+            final = budget >= max_replicates
+            for candidate in active:
+                lower, upper = candidate.interval(confidence)
+                if upper < target_rate:
+                    candidate.status = FAILING
+                elif lower >= target_rate:
+                    candidate.status = PASSING
+                elif final:
+                    candidate.status = (
+                        PASSING if candidate.success_rate >= target_rate else FAILING
+                    )
+
+            _prune(pool, monotone)
+            if final:
+                break
+            budget *= eta
+
+    passing = [candidate for candidate in pool if candidate.status == PASSING]
+    best = min(passing, key=lambda c: (c.cost, -c.success_rate), default=None)
+    return {
+        "best": best.as_dict() if best else None,
+        "total_replicates": total_replicates,
+        "candidates": [candidate.as_dict() for candidate in pool],
+    }
+
+
+def _prune(pool, monotone):
+    """Settles undecided candidates that can no longer be the minimum fleet"""
+    passing = [candidate for candidate in pool if candidate.status == PASSING]
+    failing = [candidate for candidate in pool if candidate.status == FAILING]
+    best_cost = min((candidate.cost for candidate in passing), default=None)
+
+    for candidate in pool:
+        if candidate.status not in (UNDECIDED, PASSING):
+            continue
+        if best_cost is not None and candidate.cost > best_cost:
+            candidate.status = OVER_PROVISIONED
+        elif (
+            monotone
+            and candidate.status == UNDECIDED
+            and any(failed.dominates(candidate) for failed in failing)
+        ):
+            candidate.status = FAILING
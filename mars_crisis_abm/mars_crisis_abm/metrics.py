@@ -0,0 +1,182 @@
+from .agents import (
+    Robot,
+    ComplexStructure,
+    Human,
+    CentralCommunicationsSystem,
+    PowerDistributionHub,
+    BatteryPack,
+    HazardousMaterialsStorage,
+    HabitatWall,
+    ExternalWall,
+    PowerWall,
+)
+
+# Threshold under which walls and equipment are reported as damaged
+DAMAGED_INTEGRITY = 80
+
+# DataCollector column name -> key in the dict returned by compute_step_metrics
+METRIC_COLUMNS = {
+    "Dead Humans": "alive_humans",
+    "Critical Humans": "critical_humans",
+    "Damaged Walls": "damaged_walls",
+    "Damaged Power Walls": "damaged_power_walls",
+    "Damaged Equipment": "damaged_equipment",
+    "Active Fires": "active_fires",
+    "Recharging Robots": "recharging_robots",
+    "Working Robots": "working_robots",
+    "Idle Robots": "idle_robots",
+    "Searching Robots": "searching_robots",
+}
+
+# Totals that only depend on structure integrity, in the order used by
+# structure_contribution
+STRUCTURE_TOTALS = (
+    "power_integrity_total",
+    "power_components",
+    "wall_damage_total",
+    "damaged_habitat_walls",
+    "contamination_total",
+    "damaged_walls",
+    "damaged_power_walls",
+    "damaged_equipment",
+)
+
+_EQUIPMENT_CLASSES = (
+    CentralCommunicationsSystem,
+    PowerDistributionHub,
+    BatteryPack,
+    HazardousMaterialsStorage,
+)
+
+# Per concrete structure class role flags, resolved once per class
+_structure_roles = {}
+
+
+def get_structure_roles(structure_class):
+    roles = _structure_roles.get(structure_class)
+    if roles is None:
+        roles = {
+            "power": issubclass(structure_class, (PowerWall, BatteryPack)),
+            "habitat_wall": issubclass(structure_class, HabitatWall),
+            "wall": issubclass(structure_class, (HabitatWall, ExternalWall)),
+            "power_wall": issubclass(structure_class, PowerWall),
+            "equipment": issubclass(structure_class, _EQUIPMENT_CLASSES),
+            "hazmat": issubclass(structure_class, HazardousMaterialsStorage),
+        }
+        _structure_roles[structure_class] = roles
+    return roles
+
+
+def structure_contribution(structure):
+    """
+    Returns what a single structure adds to each of the STRUCTURE_TOTALS, or
+    None while the structure has no integrity value yet.
+    """
+    if not hasattr(structure, "integrity"):
+        return None
+
+    roles = get_structure_roles(type(structure))
+    integrity = structure.integrity
+    damaged = integrity < DAMAGED_INTEGRITY
+    habitat_wall_damaged = roles["habitat_wall"] and integrity < 100
+
+    return (
+        integrity if roles["power"] else 0,
+        1 if roles["power"] else 0,
+        100 - integrity if habitat_wall_damaged else 0,
+        1 if habitat_wall_damaged else 0,
+        100 - integrity if roles["hazmat"] else 0,
+        1 if damaged and roles["wall"] else 0,
+        1 if damaged and roles["power_wall"] else 0,
+        1 if damaged and roles["equipment"] else 0,
+    )
+
+
+def compute_structure_totals(model):
+    """
+    Recomputes the STRUCTURE_TOTALS from scratch with a full sweep over the
+    registered structures.
+    """
+    totals = [0] * len(STRUCTURE_TOTALS)
+    for structure in model.agents_of(ComplexStructure):
+        contribution = structure_contribution(structure)
+        if contribution is not None:
+            for index, value in enumerate(contribution):
+                totals[index] += value
+    return dict(zip(STRUCTURE_TOTALS, totals))
+
+
+def is_burning(structure):
+    return hasattr(structure, "fire_intensity") and structure.fire_intensity > 0
+
+
+def find_burning_structures(model):
+    """Returns every registered structure on fire, found with a full sweep"""
+    return [
+        structure
+        for structure in model.agents_of(ComplexStructure)
+        if is_burning(structure)
+    ]
+
+
+def compute_step_metrics(model):
+    """
+    Computes every model-level metric for the current step. Structure totals
+    come from the model's running aggregates and fire totals from its set of
+    burning structures, so only humans and robots are swept.
+
+    Args:
+        model (MarsModel): The model to measure.
+
+    Returns:
+        dict: Counters reported by the DataCollector (see METRIC_COLUMNS) plus
+        the integrity and fire totals consumed by MarsModel._update_system_status.
+    """
+    metrics = model.aggregates.totals()
+    metrics["fire_strength_total"] = sum(
+        structure.fire_intensity for structure in model.burning
+    )
+    metrics["active_fires"] = len(model.burning)
+
+    comm_system = next(iter(model.agents_of(CentralCommunicationsSystem)), None)
+    metrics["communications_integrity"] = (
+        comm_system.integrity if comm_system is not None else None
+    )
+
+    metrics.update(
+        {
+            "alive_humans": 0,
+            "critical_humans": 0,
+            "recharging_robots": 0,
+            "working_robots": 0,
+            "idle_robots": 0,
+            "searching_robots": 0,
+        }
+    )
+
+    for human in model.agents_of(Human):
+        if human.health > 0:
+            metrics["alive_humans"] += 1
+            if human.health < 30:
+                metrics["critical_humans"] += 1
+
+    # Idle robots count as searching while out of range of every other robot;
+    # connectivity comes from the model's per-step mesh instead of a range
+    # search per robot
+    mesh = None
+    for robot in model.agents_of(Robot):
+        if hasattr(robot, "is_recharging") and robot.is_recharging:
+            metrics["recharging_robots"] += 1
+        elif hasattr(robot, "current_task") and robot.current_task:
+            metrics["working_robots"] += 1
+        elif not hasattr(robot, "_is_connected_to_network"):
+            metrics["idle_robots"] += 1
+        else:
+            if mesh is None:
+                mesh = model.communication_mesh()
+            if mesh.is_connected(robot):
+                metrics["idle_robots"] += 1
+            else:
+                metrics["searching_robots"] += 1
+
+    return metrics
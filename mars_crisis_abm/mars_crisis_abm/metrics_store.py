@@ -0,0 +1,367 @@
+import types
+from functools import partial
+
+import numpy as np
+
+_INITIAL_CAPACITY = 64
+
+
+class ColumnStore:
+    """
+    Columnar history of numeric rows.
+
+    Each column is a contiguous NumPy array grown geometrically, so appending
+    a row is amortized O(1) and the latest row is an O(1) read. With max_rows
+    the arrays become a ring buffer that keeps only the most recent rows.
+    Integer columns stay integers until a non-integer value is stored. Every
+    row carries an integer index (its row number unless given), used as the
+    DataFrame index.
+    """
+
+    def __init__(self, columns, max_rows=None):
+        self.columns = list(columns)
+        self.max_rows = max_rows
+        capacity = max_rows if max_rows is not None else _INITIAL_CAPACITY
+        self._data = {column: None for column in self.columns}
+        self._index = np.zeros(capacity, dtype=np.int64)
+        self._capacity = capacity
+        # Rows ever appended; the stored window is the last len(self) of them
+        self.total_rows = 0
+        self._latest = None
+        self.latest_index = None
+
+    def __len__(self):
+        if self.max_rows is None:
+            return self.total_rows
+        return min(self.total_rows, self.max_rows)
+
+    def append(self, row, index=None):
+        """
+        Appends a row given as a dict of column -> value.
+
+        Returns:
+            tuple: (row, index) of the row the ring buffer dropped to make
+            room, or None.
+        """
+        if self.max_rows is None and self.total_rows == self._capacity:
+            self._grow()
+        slot = self._slot(self.total_rows)
+        index = self.total_rows if index is None else index
+
+        evicted = None
+        if self.max_rows is not None and self.total_rows >= self.max_rows:
+            evicted = (
+                {column: self._data[column][slot].item() for column in self.columns},
+                int(self._index[slot]),
+            )
+
+        for column in self.columns:
+            value = row[column]
+            dtype = _dtype_for(value)
+            array = self._data[column]
+            if array is None:
+                array = self._data[column] = np.zeros(self._capacity, dtype=dtype)
+            elif dtype != array.dtype:
+                promoted = np.promote_types(array.dtype, dtype)
+                if promoted != array.dtype:
+                    array = self._data[column] = array.astype(promoted)
+            array[slot] = np.nan if value is None else value
+
+        self._index[slot] = index
+        self.total_rows += 1
+        self._latest = dict(row)
+        self.latest_index = index
+        return evicted
+
+    def latest(self, column=None):
+        """Returns the most recent row as a dict, or one of its values"""
+        if self._latest is None:
+            raise IndexError("No rows have been stored")
+        if column is None:
+            return dict(self._latest)
+        return self._latest[column]
+
+    def column(self, column):
+        """Returns the stored values of column in chronological order"""
+        array = self._data[column]
+        if array is None:
+            return np.zeros(0)
+        return self._chronological(array)
+
+    def index(self):
+        """Returns the index of the stored rows in chronological order"""
+        return self._chronological(self._index)
+
+    def to_dataframe(self):
+        """Builds a DataFrame of the stored rows, indexed by their row index"""
+        import pandas as pd
+
+        return pd.DataFrame(
+            {column: self.column(column) for column in self.columns},
+            index=_dataframe_index(self.index()),
+            columns=self.columns,
+        )
+
+    def _slot(self, row_number):
+        if self.max_rows is None:
+            return row_number
+        return row_number % self.max_rows
+
+    def _chronological(self, array):
+        size = len(self)
+        if self.max_rows is None or self.total_rows <= self.max_rows:
+            return array[:size].copy()
+        start = self.total_rows % self.max_rows
+        return np.concatenate((array[start:], array[:start]))
+
+    def _grow(self):
+        self._capacity *= 2
+        for column, array in self._data.items():
+            if array is not None:
+                self._data[column] = _resize(array, self._capacity)
+        self._index = _resize(self._index, self._capacity)
+
+
+class TieredStore:
+    """
+    Multi-resolution history: recent rows at full resolution, older rows
+    progressively decimated.
+
+    tiers is a sequence of (max_rows, stride) from newest to oldest. Every
+    row enters the first tier; a row pushed out of a full tier moves to the
+    next one if its index is a multiple of that tier's stride and is dropped
+    otherwise. The last tier may be unbounded (max_rows None). For example
+    [(500, 1), (1000, 10), (None, 100)] keeps the last 500 rows, every 10th
+    row of the 10000 before them and every 100th row of the rest.
+    """
+
+    def __init__(self, columns, tiers):
+        tiers = list(tiers)
+        if not tiers:
+            raise ValueError("TieredStore needs at least one tier")
+        for max_rows, _ in tiers[:-1]:
+            if max_rows is None:
+                raise ValueError("Only the last tier can be unbounded")
+        self.columns = list(columns)
+        self.strides = [stride for _, stride in tiers]
+        self.tiers = [ColumnStore(columns, max_rows=max_rows) for max_rows, _ in tiers]
+
+    def __len__(self):
+        return sum(len(tier) for tier in self.tiers)
+
+    @property
+    def total_rows(self):
+        return self.tiers[0].total_rows
+
+    @property
+    def latest_index(self):
+        return self.tiers[0].latest_index
+
+    def append(self, row, index=None):
+        index = self.total_rows if index is None else index
+        entry = (row, index)
+        for tier, stride in zip(self.tiers, self.strides):
+            if entry is None:
+                return None
+            row, index = entry
+            if index % stride != 0:
+                return None
+            entry = tier.append(row, index)
+        return entry
+
+    def latest(self, column=None):
+        return self.tiers[0].latest(column)
+
+    def column(self, column):
+        return np.concatenate([tier.column(column) for tier in reversed(self.tiers)])
+
+    def index(self):
+        return np.concatenate([tier.index() for tier in reversed(self.tiers)])
+
+    def to_dataframe(self):
+        import pandas as pd
+
+        return pd.DataFrame(
+            {column: self.column(column) for column in self.columns},
+            index=_dataframe_index(self.index()),
+            columns=self.columns,
+        )
+
+
+class EveryStep:
+    """Collects a row on every step"""
+
+    needs_row = False
+
+    def should_collect(self, model, row=None, previous=None):
+        return True
+
+
+class EveryKSteps:
+    """Collects a row on every k-th step"""
+
+    needs_row = False
+
+    def __init__(self, k):
+        if k < 1:
+            raise ValueError("EveryKSteps needs k >= 1")
+        self.k = k
+
+    def should_collect(self, model, row=None, previous=None):
+        return model.steps % self.k == 0
+
+
+class OnChange:
+    """
+    Collects a row only when some reported metric differs from the last row.
+    Columns named in ignore, step counters by default, are left out of the
+    comparison since they change on every step.
+    """
+
+    needs_row = True
+
+    def __init__(self, ignore=("Step",)):
+        self.ignore = frozenset(ignore)
+
+    def should_collect(self, model, row=None, previous=None):
+        if previous is None:
+            return True
+        return any(
+            value != previous.get(name)
+            for name, value in row.items()
+            if name not in self.ignore
+        )
+
+
+class FinalOnly:
+    """Collects nothing while the model runs, only the final state"""
+
+    needs_row = False
+
+    def should_collect(self, model, row=None, previous=None):
+        return False
+
+
+class MetricsCollector:
+    """
+    Drop-in replacement for mesa.DataCollector model reporters backed by a
+    ColumnStore.
+
+    Reporters follow mesa's conventions: an attribute name, a function or
+    partial called with the model, a [function, args] list, or any other
+    callable called without arguments. latest() is O(1) and the DataFrame is
+    only built when get_model_vars_dataframe() is called, then reused until
+    the next collection.
+
+    collect() always records a row. The model calls step() every step instead,
+    which defers to the collection policy (EveryStep, EveryKSteps, OnChange,
+    FinalOnly), and finalize() when it stops, which records the final state if
+    the policy skipped it. Rows are indexed by model.steps - 1, the row number
+    they would have if every step were collected, so decimated histories keep
+    their timing. history selects the storage: an int keeps a ring buffer of
+    that many rows, a sequence of (max_rows, stride) tiers a TieredStore.
+    """
+
+    def __init__(self, model_reporters, history=None, policy=None):
+        self.model_reporters = dict(model_reporters)
+        if history is None or isinstance(history, int):
+            self.store = ColumnStore(self.model_reporters, max_rows=history)
+        else:
+            self.store = TieredStore(self.model_reporters, history)
+        self.policy = policy or EveryStep()
+        self._dataframe = None
+
+    def __len__(self):
+        return len(self.store)
+
+    def report(self, model):
+        """Evaluates every reporter without storing the row"""
+        return {
+            name: _report(reporter, model)
+            for name, reporter in self.model_reporters.items()
+        }
+
+    def collect(self, model):
+        self._append(self.report(model), model)
+
+    def step(self, model):
+        """Collects a row if the collection policy asks for one"""
+        if self.policy.needs_row:
+            row = self.report(model)
+            previous = self.store.latest() if len(self.store) else None
+            if self.policy.should_collect(model, row, previous):
+                self._append(row, model)
+        elif self.policy.should_collect(model):
+            self.collect(model)
+
+    def finalize(self, model):
+        """Records the current state unless it was already collected"""
+        if self.store.latest_index != _row_index(model, self.store):
+            self.collect(model)
+
+    def latest(self, column=None):
+        return self.store.latest(column)
+
+    def get_model_vars_dataframe(self):
+        if self._dataframe is None:
+            self._dataframe = self.store.to_dataframe()
+        return self._dataframe.copy()
+
+    @property
+    def model_vars(self):
+        """Stored history as mesa-style lists of values per reporter"""
+        return {
+            column: self.store.column(column).tolist() for column in self.store.columns
+        }
+
+    def _append(self, row, model):
+        self.store.append(row, _row_index(model, self.store))
+        self._dataframe = None
+
+
+def _row_index(model, store):
+    steps = getattr(model, "steps", None)
+    if steps is None:
+        return store.total_rows
+    return steps - 1
+
+
+def _dataframe_index(index):
+    import pandas as pd
+
+    # Contiguous indexes become a RangeIndex, like mesa's implicit step index
+    if len(index) == 0:
+        return pd.RangeIndex(0)
+    if index[-1] - index[0] == len(index) - 1:
+        return pd.RangeIndex(int(index[0]), int(index[-1]) + 1)
+    return pd.Index(index)
+
+
+def _report(reporter, model):
+    if isinstance(reporter, str):
+        return getattr(model, reporter, None)
+    if isinstance(reporter, (types.FunctionType, partial)):
+        return reporter(model)
+    if isinstance(reporter, list):
+        return reporter[0](*reporter[1])
+    return reporter()
+
+
+def _is_integer(value):
+    return isinstance(value, (int, np.integer)) and not isinstance(value, bool)
+
+
+def _dtype_for(value):
+    if value is None:
+        return np.dtype(np.float64)
+    if isinstance(value, (bool, np.bool_)):
+        return np.dtype(np.bool_)
+    if _is_integer(value):
+        return np.dtype(np.int64)
+    return np.dtype(np.float64)
+
+
+def _resize(array, capacity):
+    resized = np.zeros(capacity, dtype=array.dtype)
+    resized[: len(array)] = array
+    return resized
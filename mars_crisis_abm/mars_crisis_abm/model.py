@@ -1,28 +1,114 @@
-import mesa
+import functools
 
-from .blueprint import setup_mars_base
+import mesa.agent
+import mesa.model
+import mesa.space
+import mesa.time
 
-from .agents import (
-    Robot,
-    ComplexStructure,
-    Human,
-    CentralCommunicationsSystem,
-    PowerDistributionHub,
-    BatteryPack,
-    HazardousMaterialsStorage,
-    HabitatWall,
-    ExternalWall,
-    PowerWall,
+from .blueprint import setup_mars_base
+from .events import EventBus
+from .communication import BroadcastEngine, CommunicationMesh
+
+from .agents import ComplexStructure, Human, Robot
+from .aggregates import StructureAggregates, install_tracking
+from .fire_engine import FireGrid
+from .metrics_store import MetricsCollector
+from .passability import PassabilityTracker
+from .profiling import StepProfiler
+from .snapshot import restore_snapshot, take_snapshot
+from .structure_store import StructureStore
+from .threats import ThreatRegistry
+from .metrics import (
+    METRIC_COLUMNS,
+    compute_step_metrics,
+    find_burning_structures,
+    is_burning,
+)
+from .utils import (
+    STABILITY_THRESHOLDS,
+    NavigationFields,
+    NeighborhoodIndex,
+    ZoneGraph,
+    ZoneIndex,
 )
-from .utils import STABILITY_THRESHOLDS
-
-
-class MarsModel(mesa.Model):
 
-    def __init__(self, config_params, grid_data, equipment_positions):
-        super().__init__()
+# Structure attributes whose writes are reported to the owning model
+TRACKED_FIELDS = ("integrity", "fire_intensity")
+
+# Steps between full recomputes of the running structure aggregates, which
+# drop the float drift accumulated by their incremental updates
+AGGREGATE_RESYNC_INTERVAL = 100
+
+
+def install_structure_tracking():
+    """
+    Routes writes of the TRACKED_FIELDS of every ComplexStructure through
+    TrackedAttribute, so the owning model keeps its aggregates, burning set,
+    passability and event bus up to date. The descriptors are installed on
+    the shared ComplexStructure class by the first MarsModel built or
+    restored in the process; code that uses the agents without a model does
+    not pay for them until then. Installing again does nothing.
+    """
+    install_tracking(ComplexStructure, *TRACKED_FIELDS)
+
+
+class MarsModel(mesa.model.Model):
+
+    def __init__(
+        self,
+        config_params,
+        grid_data,
+        equipment_positions,
+        debug_aggregates=False,
+        structure_storage="objects",
+        fire_engine="agents",
+        seed=None,
+        blueprint=None,
+        metrics_history=None,
+        collection=None,
+        profile=False,
+    ):
+        install_structure_tracking()
+        super().__init__(seed=seed)
         self.schedule = mesa.time.RandomActivation(self)
 
+        self.structure_store = None
+        # Static structure neighborhoods and fire grid, dropped whenever
+        # structures change
+        self.neighborhoods = None
+        self.fire_grid = None
+        # Robot communication mesh, rebuilt on first use after robots move
+        self._mesh = None
+        # Set once the base is built and navigation fields exist
+        self.passability = None
+        # Messages robots flood through the mesh, delivered once per step
+        self.broadcasts = BroadcastEngine()
+        # Outstanding threats by the Capability that can handle them
+        self.threats = ThreatRegistry()
+        # Integrity threshold crossings, published as structures are written
+        self.events = EventBus()
+
+        # StepProfiler while profiling is enabled (see enable_profiling)
+        self.profiler = StepProfiler() if profile else None
+
+        # When enabled, every status update checks the incremental structure
+        # aggregates against a full recompute
+        self.debug_aggregates = debug_aggregates
+
+        # "objects" keeps structure state on the agents, "array" moves it into
+        # contiguous arrays that the agents view and totals are reduced from
+        if structure_storage == "array":
+            self.structure_store = StructureStore()
+            self.aggregates = self.structure_store
+        elif structure_storage != "objects":
+            raise ValueError(f"Unknown structure storage: {structure_storage}")
+
+        # "agents" spreads fire from each burning structure through spread_fire,
+        # "grid" spreads every fire front at once with the FireGrid kernel
+        if fire_engine not in ("agents", "grid"):
+            raise ValueError(f"Unknown fire engine: {fire_engine}")
+        self.fire_engine = fire_engine
+
         self.config_params = config_params
         self.grid_data = grid_data
         self.mission_status = "ONGOING"
@@ -40,127 +126,298 @@ class MarsModel(mesa.Model):
         self.contamination_level = 0.0
         self.power_level = STABILITY_THRESHOLDS["power"] - 10
 
-        # Set up the entire Mars base using blueprint
+        # Set up the entire Mars base using blueprint. A CompiledBlueprint of
+        # the same layout skips recomputing the zone table and wall cells
         setup_mars_base(
-            self, self.grid_data, self.equipment_positions, self.config_params
+            self,
+            self.grid_data,
+            self.equipment_positions,
+            self.config_params,
+            blueprint=blueprint,
         )
-
-        self.datacollector = mesa.DataCollector(
+        if blueprint is not None:
+            self.zone_index = blueprint.zone_index()
+        else:
+            self.zone_index = ZoneIndex.from_grid(self.grid_data, self.zones)
+        # Distance and flow fields toward destination zones, built on first
+        # use and shared by every model of this layout until fires or wall
+        # breaches change which cells can be crossed
+        self.navigation = NavigationFields.for_layout(self.zone_index).overlay()
+        self.passability = PassabilityTracker(self.navigation)
+        self.passability.sync(self.agents_of(ComplexStructure))
+        # Module-level graph for long-range routes, shared per layout
+        self.zone_graph = ZoneGraph.for_layout(self.zone_index)
+        self._build_spatial_indexes()
+
+        # Metrics from the latest single-pass sweep, shared by
+        # _update_system_status and the DataCollector reporters
+        self.metrics = compute_step_metrics(self)
+
+        # Columnar history with O(1) access to the latest row. metrics_history
+        # bounds it (an int) or decimates older rows (tiers), and the
+        # collection policy decides which steps are recorded at all
+        self.datacollector = MetricsCollector(
             model_reporters={
-                "Atmospheric Condition": lambda m: m.atmospheric_condition,
-                "Power Level": lambda m: m.power_level,
-                "Dead Humans": lambda m: m._count_alive_humans(),
-                "Critical Humans": lambda m: m._count_critical_humans(),
-                "Contamination Level": lambda m: m.contamination_level,
-                "Damaged Walls": lambda m: m._count_damaged_walls(),
-                "Damaged Power Walls": lambda m: m._count_damaged_power_walls(),
-                "Damaged Equipment": lambda m: m._count_damaged_equipment(),
-                "Active Fires": lambda m: m._count_active_fires(),
-                "Recharging Robots": lambda m: m._count_recharging_robots(),
-                "Working Robots": lambda m: m._count_working_robots(),
-                "Idle Robots": lambda m: m._count_idle_robots(),
-                "Searching Robots": lambda m: m._count_searching_robots(),
-            }
+                "Atmospheric Condition": "atmospheric_condition",
+                "Power Level": "power_level",
+                "Dead Humans": _metric_reporter("Dead Humans"),
+                "Critical Humans": _metric_reporter("Critical Humans"),
+                "Contamination Level": "contamination_level",
+                "Damaged Walls": _metric_reporter("Damaged Walls"),
+                "Damaged Power Walls": _metric_reporter("Damaged Power Walls"),
+                "Damaged Equipment": _metric_reporter("Damaged Equipment"),
+                "Active Fires": _metric_reporter("Active Fires"),
+                "Recharging Robots": _metric_reporter("Recharging Robots"),
+                "Working Robots": _metric_reporter("Working Robots"),
+                "Idle Robots": _metric_reporter("Idle Robots"),
+                "Searching Robots": _metric_reporter("Searching Robots"),
+            },
+            history=metrics_history,
+            policy=collection,
         )
 
+    def __setstate__(self, state):
+        # A model restored in a fresh process needs the tracking too
+        install_structure_tracking()
+        self.__dict__.update(state)
+
+    def _setup_agent_registration(self):
+        super()._setup_agent_registration()
+        # AgentSets keyed by every class in an agent's MRO, so abstract bases
+        # like Robot or ComplexStructure can be queried without a full scan
+        self._agents_by_class = {}
+        self.aggregates = StructureAggregates()
+        # Structures with fire_intensity > 0, in ignition order
+        self.burning = {}
+
+    def register_agent(self, agent):
+        super().register_agent(agent)
+        for agent_class in self._registry_classes(agent):
+            if agent_class not in self._agents_by_class:
+                self._agents_by_class[agent_class] = mesa.agent.AgentSet(
+                    [], random=self.random
+                )
+            self._agents_by_class[agent_class].add(agent)
+
+        if isinstance(agent, Robot):
+            self._mesh = None
+        if isinstance(agent, ComplexStructure):
+            self.aggregates.add(agent)
+            if self.passability is not None:
+                self.passability.add(agent)
+            if is_burning(agent):
+                self.burning[agent] = None
+            self.fire_grid = None
+        # Structures and mobile agents exposed to spreads are both indexed
+        self.neighborhoods = None
+
+    def deregister_agent(self, agent):
+        super().deregister_agent(agent)
+        for agent_class in self._registry_classes(agent):
+            if agent_class in self._agents_by_class:
+                self._agents_by_class[agent_class].discard(agent)
+
+        if isinstance(agent, Robot):
+            self._mesh = None
+            self.broadcasts.forget(agent)
+            self.threats.release_all(agent)
+        if isinstance(agent, ComplexStructure):
+            if self.passability is not None:
+                self.passability.remove(agent)
+            self.aggregates.remove(agent)
+            self.burning.pop(agent, None)
+            self.fire_grid = None
+        self.neighborhoods = None
+
+    def _structure_changed(self, structure, name, old, new):
+        """Called by tracked structure attributes on every write"""
+        if structure not in self.aggregates:
+            return
+        if self.passability is not None:
+            self.passability.structure_changed(structure, name, old, new)
+
+        if name == "fire_intensity":
+            if new > 0:
+                self.burning[structure] = None
+            else:
+                self.burning.pop(structure, None)
+        else:
+            self.aggregates.update(structure)
+            self.events.integrity_changed(structure, old, new)
+
+    def agents_of(self, agent_class):
+        """
+        Returns a live AgentSet with every registered agent that is an instance
+        of agent_class, including subclasses. The set is kept up to date as
+        agents are added and removed, so callers can hold on to it.
+        """
+        if agent_class not in self._agents_by_class:
+            self._agents_by_class[agent_class] = mesa.agent.AgentSet(
+                [], random=self.random
+            )
+        return self._agents_by_class[agent_class]
+
+    def communication_mesh(self):
+        """
+        Returns the CommunicationMesh of the registered robots. It is built on
+        first use and reused until robots move at the next step, so every
+        connectivity query of a step shares one component labelling.
+        """
+        if self._mesh is None:
+            self._mesh = CommunicationMesh(self.agents_of(Robot))
+        return self._mesh
+
+    def snapshot(self):
+        """
+        Captures the complete model state (see ModelSnapshot). Models built
+        from the snapshot with restore() continue exactly as this one would.
+        """
+        return take_snapshot(self)
+
+    @classmethod
+    def restore(cls, snapshot, seed=None):
+        """
+        Builds an independent model from a snapshot. A seed reseeds the
+        restored model's generators so branches of one snapshot diverge.
+        """
+        return restore_snapshot(snapshot, seed=seed)
+
+    def fork(self, seed=None):
+        """Returns an independent copy of the model at its current step"""
+        return restore_snapshot(take_snapshot(self), seed=seed)
+
+    @staticmethod
+    def _registry_classes(agent):
+        return [
+            agent_class
+            for agent_class in type(agent).__mro__
+            if issubclass(agent_class, mesa.agent.Agent)
+            and agent_class is not mesa.agent.Agent
+        ]
+
+    def _build_spatial_indexes(self):
+        structures = self.agents_of(ComplexStructure)
+        # Agents that move but can still take spread damage or catch fire
+        mobile = [
+            agent
+            for agent in self.agents
+            if not isinstance(agent, ComplexStructure)
+            and (hasattr(agent, "integrity") or hasattr(agent, "fire_intensity"))
+        ]
+        self.neighborhoods = NeighborhoodIndex(self.grid, structures, mobile=mobile)
+        if self.fire_engine == "grid":
+            self.fire_grid = FireGrid(self.grid, structures)
+
+    # Step phases in order, as (profiling label, method)
+    STEP_PHASES = (
+        ("indexes", "_refresh_indexes"),
+        ("agents", "_step_agents"),
+        ("broadcasts", "_deliver_broadcasts"),
+        ("fire_grid", "_step_fire_grid"),
+        ("system_status", "_update_system_status"),
+        ("datacollector", "_collect_metrics"),
+        ("mission_status", "_update_mission_status"),
+    )
+
     def step(self):
+        if self.profiler is not None:
+            self.profiler.run_step(self)
+            return
+        for _, method in self.STEP_PHASES:
+            getattr(self, method)()
+
+    def enable_profiling(self):
+        """
+        Starts recording per-phase and per-agent-class step times and hot
+        helper call counts. Returns the StepProfiler holding them.
+        """
+        if self.profiler is None:
+            self.profiler = StepProfiler()
+        return self.profiler
+
+    def disable_profiling(self):
+        """Stops profiling. Returns the StepProfiler with what was recorded"""
+        profiler, self.profiler = self.profiler, None
+        return profiler
+
+    def _refresh_indexes(self):
+        if self.neighborhoods is None:
+            self._build_spatial_indexes()
+        # Structures created during the last step are placed by now
+        self.passability.flush()
+
+    def _step_agents(self):
+        # A running StepProfiler times each agent step through its wrappers
         self.schedule.step()
+        self._mesh = None
+
+    def _deliver_broadcasts(self):
+        # Messages broadcast during the step reach their sender's component
+        # and are read by the robots during the next step
+        if self.broadcasts.pending:
+            self.broadcasts.deliver(self.communication_mesh())
+        else:
+            self.broadcasts.clear()
 
-        self._update_system_status()
+    def _step_fire_grid(self):
+        if self.fire_grid is not None:
+            self.fire_grid.step(list(self.burning))
 
-        self.datacollector.collect(self)
+    def _collect_metrics(self):
+        self.datacollector.step(self)
 
+    def _update_mission_status(self):
         self.mission_status = self._check_mission_status()
         if self.mission_status != "ONGOING":
             self.running = False
+            self.datacollector.finalize(self)
 
     def _update_system_status(self):
-        # Update communications status
-        comm_system = [
-            agent
-            for agent in self.agents
-            if isinstance(agent, CentralCommunicationsSystem)
-        ]
+        if self.debug_aggregates:
+            self.aggregates.verify(self)
+            self._verify_burning()
+        elif self.steps % AGGREGATE_RESYNC_INTERVAL == 0:
+            self.aggregates.resync(self)
 
+        metrics = compute_step_metrics(self)
+        self.metrics = metrics
+
+        # Update communications status
         self.communications_online = (
-            comm_system[0].integrity > STABILITY_THRESHOLDS["communications"]
+            metrics["communications_integrity"] is not None
+            and metrics["communications_integrity"]
+            > STABILITY_THRESHOLDS["communications"]
         )
 
         # Update fire alarm status
         if self.power_level <= 0:
             self.fire_alarm_on = False
         else:
-            has_fire = False
-            for agent in self.agents:
-                if (
-                    isinstance(agent, ComplexStructure)
-                    and hasattr(agent, "fire_intensity")
-                    and agent.fire_intensity > 0
-                ):
-                    has_fire = True
-                    break
-            self.fire_alarm_on = has_fire
+            self.fire_alarm_on = len(self.burning) > 0
 
         # Calculate power level based on power walls and batteries
-        batteries = [agent for agent in self.agents if isinstance(agent, BatteryPack)]
-
-        power_walls = [agent for agent in self.agents if isinstance(agent, PowerWall)]
-
-        total_power_integrity = 0
-        total_power_components = 0
-
-        for wall in power_walls:
-            total_power_integrity += wall.integrity
-            total_power_components += 1
-
-        for battery in batteries:
-            total_power_integrity += battery.integrity
-            total_power_components += 1
-
-        if total_power_components > 0:
-            self.power_level = total_power_integrity / total_power_components
+        if metrics["power_components"] > 0:
+            self.power_level = (
+                metrics["power_integrity_total"] / metrics["power_components"]
+            )
         else:
             self.power_level = 0
 
         atmospheric_decrease = 0
-        wall_damage_total = 0
-        damaged_walls_total = 0
-
-        for agent in self.agents:
-            if isinstance(agent, HabitatWall):
-                if agent.integrity < 100:
-                    damaged_walls_total += 1
-                    wall_damage_total += 100 - agent.integrity
 
-        if damaged_walls_total > 0:
-            atmospheric_decrease = wall_damage_total / (100 * damaged_walls_total * 8)
+        if metrics["damaged_habitat_walls"] > 0:
+            atmospheric_decrease = metrics["wall_damage_total"] / (
+                100 * metrics["damaged_habitat_walls"] * 8
+            )
 
         # Add fire impact on atmosphere
-        fire_strength_total = sum(
-            agent.fire_intensity
-            for agent in self.agents
-            if isinstance(agent, ComplexStructure) and hasattr(agent, "fire_intensity")
-        )
-
-        if fire_strength_total > 0:
-            atmospheric_decrease += fire_strength_total / 800
+        if metrics["fire_strength_total"] > 0:
+            atmospheric_decrease += metrics["fire_strength_total"] / 800
 
         # Calculate contamination level and add impact on atmosphere
-        hazmat_storage = [
-            agent
-            for agent in self.agents
-            if isinstance(agent, HazardousMaterialsStorage)
-        ]
-
         contamination_decrease = 0
-        contamination_total = 0
-        damaged_hazmat_storage_total = 0
-        for storage in hazmat_storage:
-            damaged_hazmat_storage_total += 1
-            contamination_total += 100 - storage.integrity
-
-        if contamination_total > 0:
-            contamination_decrease = contamination_total / (100 * 6)
+        if metrics["contamination_total"] > 0:
+            contamination_decrease = metrics["contamination_total"] / (100 * 6)
 
         self.contamination_level = contamination_decrease * 100
 
@@ -168,6 +425,16 @@ class MarsModel(mesa.Model):
 
         self.atmospheric_condition -= atmospheric_decrease
 
+    def _verify_burning(self):
+        burning = find_burning_structures(self)
+        if len(burning) != len(self.burning) or any(
+            structure not in self.burning for structure in burning
+        ):
+            raise RuntimeError(
+                f"Active fire set diverged from full recompute: tracked "
+                f"{len(self.burning)} burning structures, found {len(burning)}"
+            )
+
     def _check_mission_status(self):
         """
         Check mission status based on termination criteria:
@@ -193,129 +460,18 @@ class MarsModel(mesa.Model):
 
         # Check for mission failure - all humans are dead
         living_humans = [
-            agent
-            for agent in self.agents
-            if isinstance(agent, Human) and agent.health > 0
+            agent for agent in self.agents_of(Human) if agent.health > 0
         ]
         if len(living_humans) == 0:
             return "FAILURE"
 
         return "ONGOING"
 
-    def _count_damaged_walls(self):
-        return len(
-            [
-                agent
-                for agent in self.agents
-                if isinstance(agent, (HabitatWall, ExternalWall))
-                and agent.integrity < 80
-            ]
-        )
-
-    def _count_damaged_power_walls(self):
-        return len(
-            [
-                agent
-                for agent in self.agents
-                if isinstance(agent, PowerWall) and agent.integrity < 80
-            ]
-        )
 
-    def _count_damaged_equipment(self):
-        damaged_count = 0
-        for agent in self.agents:
-            if isinstance(
-                agent,
-                (
-                    CentralCommunicationsSystem,
-                    PowerDistributionHub,
-                    BatteryPack,
-                    HazardousMaterialsStorage,
-                ),
-            ):
-                if agent.integrity < 80:
-                    damaged_count += 1
-        return damaged_count
-
-    def _count_active_fires(self):
-        return len(
-            [
-                agent
-                for agent in self.agents
-                if isinstance(agent, ComplexStructure)
-                and hasattr(agent, "fire_intensity")
-                and agent.fire_intensity > 0
-            ]
-        )
+def _metric_reporter(column):
+    # A partial of a module-level function keeps the datacollector picklable
+    return functools.partial(_read_metric, key=METRIC_COLUMNS[column])
 
-    def _count_critical_humans(self):
-        critical_count = 0
-        for agent in self.agents:
-            if isinstance(agent, Human) and agent.health < 30 and agent.health > 0:
-                critical_count += 1
-        return critical_count
-
-    def _count_alive_humans(self):
-        return len(
-            [
-                agent
-                for agent in self.agents
-                if isinstance(agent, Human) and agent.health > 0
-            ]
-        )
-
-    def _count_recharging_robots(self):
-        return len(
-            [
-                agent
-                for agent in self.agents
-                if isinstance(agent, Robot)
-                and hasattr(agent, "is_recharging")
-                and agent.is_recharging
-            ]
-        )
-
-    def _count_working_robots(self):
-        return len(
-            [
-                agent
-                for agent in self.agents
-                if isinstance(agent, Robot)
-                and hasattr(agent, "current_task")
-                and agent.current_task
-                and not (hasattr(agent, "is_recharging") and agent.is_recharging)
-            ]
-        )
-
-    def _count_idle_robots(self):
-        return len(
-            [
-                agent
-                for agent in self.agents
-                if isinstance(agent, Robot)
-                and not (hasattr(agent, "current_task") and agent.current_task)
-                and not (hasattr(agent, "is_recharging") and agent.is_recharging)
-                and (
-                    not hasattr(agent, "_is_connected_to_network")
-                    or agent._is_connected_to_network()
-                )
-            ]
-        )
 
-    def _count_searching_robots(self):
-        count = 0
-        for agent in self.agents:
-            if isinstance(agent, Robot):
-                try:
-                    if (
-                        not (hasattr(agent, "current_task") and agent.current_task)
-                        and not (
-                            hasattr(agent, "is_recharging") and agent.is_recharging
-                        )
-                        and hasattr(agent, "_is_connected_to_network")
-                        and not agent._is_connected_to_network()
-                    ):
-                        count += 1
-                except:
-                    pass
-        return count
+def _read_metric(model, key):
+    return model.metrics[key]
@@ -0,0 +1,171 @@
+from .metrics import get_structure_roles, is_burning
+from .utils import WALL_BREACH_INTEGRITY
+
+
+class PassabilityTracker:
+    """
+    Keeps a model's NavigationFields in step with structure state.
+
+    A cell holding a burning structure is blocked, and a wall cell is opened
+    once every wall in it is breached (integrity at or below
+    WALL_BREACH_INTEGRITY): habitat wall cells hold both a HabitatWall and an
+    ExternalWall, and robots only get through when both are down. The model
+    forwards every tracked structure write to structure_changed(); only
+    writes that cross one of those thresholds touch the fields, which then
+    repair the cell's surroundings incrementally. Structures added after
+    sync() go through add(), and those not placed yet wait for flush().
+    """
+
+    def __init__(self, fields):
+        self.fields = fields
+        # Burning or breached structure -> (cell, burning, breached) as applied
+        self._states = {}
+        self._burning_cells = {}
+        self._breached_cells = {}
+        # Every placed wall -> its cell, and the number of walls per cell
+        self._walls = {}
+        self._wall_cells = {}
+        # Structures added before being placed on the grid
+        self._pending = {}
+
+    def sync(self, structures):
+        """Records the current state of every placed structure"""
+        structures = list(structures)
+        # Count every wall of a cell before deciding whether it is open
+        refresh = set()
+        for structure in structures:
+            refresh.update(self._track_wall(structure))
+        for structure in structures:
+            refresh.update(self._apply(structure))
+        for cell in refresh:
+            self._refresh(cell)
+
+    def add(self, structure):
+        """Tracks a structure created after sync(), or once it is placed"""
+        if structure.pos is None:
+            self._pending[structure] = None
+            return
+        self._pending.pop(structure, None)
+        self.sync([structure])
+
+    def flush(self):
+        """Tracks the pending structures that have been placed since add()"""
+        if not self._pending:
+            return
+        placed = [structure for structure in self._pending if structure.pos is not None]
+        for structure in placed:
+            del self._pending[structure]
+        self.sync(placed)
+
+    def remove(self, structure):
+        self._pending.pop(structure, None)
+        refresh = set()
+        wall_cell = self._walls.pop(structure, None)
+        if wall_cell is not None:
+            self._count_wall(wall_cell, -1)
+            refresh.add(wall_cell)
+        state = self._states.pop(structure, None)
+        if state is not None:
+            cell, burning, breached = state
+            self._count(cell, burning, breached, -1)
+            refresh.add(cell)
+        for cell in refresh:
+            self._refresh(cell)
+
+    def structure_changed(self, structure, name, old, new):
+        if name == "fire_intensity":
+            if (old is not None and old > 0) == (new > 0):
+                return
+        elif name == "integrity":
+            if not _is_wall(structure):
+                return
+            if (old is not None and old <= WALL_BREACH_INTEGRITY) == (
+                new <= WALL_BREACH_INTEGRITY
+            ):
+                return
+        else:
+            return
+        refresh = self._track_wall(structure) | self._apply(structure)
+        for cell in refresh:
+            self._refresh(cell)
+
+    def is_blocked(self, pos):
+        return self._burning_cells.get(pos, 0) > 0
+
+    def is_breached(self, pos):
+        """Whether every wall in the cell at pos is breached"""
+        breached = self._breached_cells.get(pos, 0)
+        return breached > 0 and breached >= self._wall_cells.get(pos, 0)
+
+    def _track_wall(self, structure):
+        """Records the cell of a wall. Returns the cells whose walls changed"""
+        if structure.pos is None or not _is_wall(structure):
+            return set()
+        cell = tuple(structure.pos)
+        previous = self._walls.get(structure)
+        if previous == cell:
+            return set()
+        changed = {cell}
+        if previous is not None:
+            self._count_wall(previous, -1)
+            changed.add(previous)
+        self._walls[structure] = cell
+        self._count_wall(cell, 1)
+        # Only cells with a breach can change from one more or one less wall
+        return {cell for cell in changed if cell in self._breached_cells}
+
+    def _apply(self, structure):
+        """Applies the state of structure. Returns the cells it changed"""
+        if structure.pos is None:
+            return set()
+        burning = is_burning(structure)
+        breached = (
+            _is_wall(structure)
+            and hasattr(structure, "integrity")
+            and structure.integrity <= WALL_BREACH_INTEGRITY
+        )
+        previous = self._states.get(structure)
+        if previous is None and not burning and not breached:
+            return set()
+
+        cell = tuple(structure.pos)
+        state = (cell, burning, breached)
+        if state == previous:
+            return set()
+        changed = {cell}
+        if previous is not None:
+            self._count(*previous, -1)
+            changed.add(previous[0])
+        if burning or breached:
+            self._count(*state, 1)
+            self._states[structure] = state
+        else:
+            del self._states[structure]
+        return changed
+
+    def _count(self, cell, burning, breached, delta):
+        if burning:
+            _add(self._burning_cells, cell, delta)
+        if breached:
+            _add(self._breached_cells, cell, delta)
+
+    def _count_wall(self, cell, delta):
+        _add(self._wall_cells, cell, delta)
+
+    def _refresh(self, cell):
+        self.fields.set_cell(
+            cell, opened=self.is_breached(cell), blocked=self.is_blocked(cell)
+        )
+
+
+def _add(counts, cell, delta):
+    count = counts.get(cell, 0) + delta
+    if count:
+        counts[cell] = count
+    else:
+        counts.pop(cell, None)
+
+
+def _is_wall(structure):
+    roles = get_structure_roles(type(structure))
+    return roles["wall"] or roles["power_wall"]
@@ -0,0 +1,199 @@
+import functools
+import sys
+import time
+
+import mesa.agent
+
+# Hot helpers whose calls are counted while profiling, as (label, owner,
+# attribute). Owners are resolved against the model: "grid" is its grid,
+# "Robot" the robot base class, and "module" every loaded module of this
+# package that holds the function under that name (agents import helpers
+# by name, so each importing module has its own reference).
+HOT_HELPERS = (
+    ("grid.get_neighbors", "grid", "get_neighbors"),
+    ("spread_fire", "module", "spread_fire"),
+    ("spread_damage", "module", "spread_damage"),
+    ("_is_connected_to_network", "Robot", "_is_connected_to_network"),
+)
+
+_PACKAGE = __name__.rpartition(".")[0]
+_MISSING = object()
+
+# Profiler of the step being run, which the installed wrappers report to
+_active = None
+
+
+class StepProfiler:
+    """
+    Wall time per model step phase and per agent class, plus call counts of
+    the HOT_HELPERS.
+
+    MarsModel.step() hands each step to run_step() while profiling is enabled
+    and otherwise runs its phases directly. The step method of every agent
+    class of this package and the class and module helpers are wrapped once,
+    when the first profiler is created; the wrappers only time or count while
+    a profiler is running a step, so a model that is not profiled pays one
+    global lookup per call. Agent steps are timed by concrete class, nested
+    super().step() calls included in the outer one. The grid's
+    get_neighbors is counted through an instance attribute set for the
+    duration of a profiled step only.
+
+    totals holds cumulative seconds per phase and per "agent:<class>",
+    calls the cumulative counts, and history one dict of seconds and counts
+    per profiled step.
+    """
+
+    def __init__(self, helpers=HOT_HELPERS):
+        self.helpers = tuple(helpers)
+        self.totals = {}
+        self.agent_steps = {}
+        self.calls = {}
+        self.history = []
+        self.steps = 0
+        self._step_times = None
+        self._step_calls = None
+        self._timing_agent = False
+        install_wrappers(self.helpers)
+
+    def run_step(self, model):
+        global _active
+        self._step_times = {}
+        self._step_calls = {}
+        previous, _active = _active, self
+        restore = self._install_grid_counters(model)
+        try:
+            for label, method in model.STEP_PHASES:
+                start = time.perf_counter()
+                getattr(model, method)()
+                self._add_time(label, time.perf_counter() - start)
+        finally:
+            _active = previous
+            for owner, name, original in reversed(restore):
+                _restore(owner, name, original)
+
+        for label, count in self._step_calls.items():
+            self.calls[label] = self.calls.get(label, 0) + count
+        self.history.append({**self._step_times, **self._step_calls})
+        self.steps += 1
+
+    def report(self):
+        """Formats the cumulative totals as a table, slowest first"""
+        lines = [f"Profile over {self.steps} steps"]
+        width = max((len(label) for label in self.totals), default=0)
+        for label, seconds in sorted(self.totals.items(), key=lambda t: -t[1]):
+            per_step = seconds / self.steps * 1000 if self.steps else 0.0
+            line = f"  {label:<{width}}  {seconds:9.4f} s  {per_step:9.3f} ms/step"
+            if label in self.agent_steps:
+                line += f"  {self.agent_steps[label]} calls"
+            lines.append(line)
+        for label, count in sorted(self.calls.items()):
+            lines.append(f"  {label:<{width}}  {count} calls")
+        return "\n".join(lines)
+
+    def _add_time(self, label, seconds):
+        self.totals[label] = self.totals.get(label, 0.0) + seconds
+        self._step_times[label] = self._step_times.get(label, 0.0) + seconds
+
+    def _add_agent_step(self, agent, seconds):
+        label = f"agent:{type(agent).__name__}"
+        self._add_time(label, seconds)
+        self.agent_steps[label] = self.agent_steps.get(label, 0) + 1
+
+    def _count(self, label):
+        self._step_calls[label] = self._step_calls.get(label, 0) + 1
+
+    def _install_grid_counters(self, model):
+        restore = []
+        for label, owner_kind, name in self.helpers:
+            if owner_kind != "grid":
+                continue
+            original = vars(model.grid).get(name, _MISSING)
+            setattr(model.grid, name, _counted(label, getattr(model.grid, name)))
+            restore.append((model.grid, name, original))
+        return restore
+
+
+def install_wrappers(helpers=HOT_HELPERS):
+    """
+    Wraps the step of every agent class of this package and the class and
+    module helpers in place. Functions already wrapped are left alone, so
+    this only wraps classes and modules loaded since the last call.
+    """
+    for agent_class in _package_agent_classes():
+        step = vars(agent_class).get("step")
+        if callable(step) and not hasattr(step, "_profiled"):
+            agent_class.step = _timed_step(step)
+    for label, owner_kind, name in helpers:
+        if owner_kind == "grid":
+            continue
+        for owner in _owners(owner_kind, name):
+            function = vars(owner)[name]
+            if not hasattr(function, "_profiled"):
+                setattr(owner, name, _counted(label, function))
+
+
+def _timed_step(step):
+    @functools.wraps(step)
+    def timed(agent, *args, **kwargs):
+        profiler = _active
+        if profiler is None or profiler._timing_agent:
+            return step(agent, *args, **kwargs)
+        profiler._timing_agent = True
+        start = time.perf_counter()
+        try:
+            return step(agent, *args, **kwargs)
+        finally:
+            profiler._timing_agent = False
+            profiler._add_agent_step(agent, time.perf_counter() - start)
+
+    timed._profiled = True
+    return timed
+
+
+def _counted(label, function):
+    @functools.wraps(function)
+    def counted(*args, **kwargs):
+        if _active is not None:
+            _active._count(label)
+        return function(*args, **kwargs)
+
+    counted._profiled = True
+    return counted
+
+
+def _package_agent_classes():
+    pending = [mesa.agent.Agent]
+    seen = set()
+    while pending:
+        for subclass in pending.pop().__subclasses__():
+            if subclass not in seen:
+                seen.add(subclass)
+                pending.append(subclass)
+    return [agent_class for agent_class in seen if _in_package(agent_class.__module__)]
+
+
+def _in_package(module_name):
+    return module_name == _PACKAGE or module_name.startswith(_PACKAGE + ".")
+
+
+def _owners(owner_kind, name):
+    if owner_kind == "Robot":
+        from .agents import Robot
+
+        return [Robot] if callable(vars(Robot).get(name)) else []
+    if owner_kind == "module":
+        return [
+            module
+            for module_name, module in list(sys.modules.items())
+            if module is not None
+            and _in_package(module_name)
+            and callable(vars(module).get(name))
+        ]
+    raise ValueError(f"Unknown helper owner: {owner_kind}")
+
+
+def _restore(owner, name, original):
+    if original is _MISSING:
+        delattr(owner, name)
+    else:
+        setattr(owner, name, original)
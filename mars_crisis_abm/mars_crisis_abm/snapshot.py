@@ -0,0 +1,61 @@
+import gc
+import pickle
+
+import numpy as np
+
+
+class ModelSnapshot:
+    """
+    Frozen copy of a model's complete state at one step.
+
+    The model is serialized as a single pickle, which covers grid placement,
+    agent state, the scheduler's agent order, the model's generators,
+    structure stores, datacollector history and zone tables, because they are
+    all reachable from the model. The global random module is left alone.
+    Navigation fields and zone graphs shared between models of a layout are
+    pickled by reference and looked up again on restore. A snapshot is
+    immutable and can be restored any number of times.
+    """
+
+    def __init__(self, payload, steps):
+        self.payload = payload
+        self.steps = steps
+
+    def __len__(self):
+        return len(self.payload)
+
+
+def take_snapshot(model):
+    """Serializes model into a ModelSnapshot"""
+    payload = pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)
+    return ModelSnapshot(payload, model.steps)
+
+
+def restore_snapshot(snapshot, seed=None):
+    """
+    Rebuilds an independent model from snapshot, with its generators in the
+    state they were taken in.
+
+    Args:
+        snapshot (ModelSnapshot): Snapshot to restore.
+        seed (int, optional): Reseeds the restored model's generators, so
+            branches of one snapshot diverge.
+
+    Returns:
+        The restored model.
+    """
+    # Unpickling thousands of agents otherwise triggers several full
+    # collections that cost more than the load itself
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        model = pickle.loads(snapshot.payload)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    if seed is not None:
+        # Reseed in place, agent sets and the scheduler share these generators
+        model.random.seed(seed)
+        model.rng.bit_generator.state = np.random.default_rng(seed).bit_generator.state
+    return model
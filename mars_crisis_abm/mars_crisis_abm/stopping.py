@@ -0,0 +1,91 @@
+"""
+Sequential stopping rules for replicate batches.
+
+A rule looks at the SUCCESS count after each replicate and decides whether the
+outcome is settled. batch.run_sequential stops launching replicates as soon as
+a rule returns a decision.
+"""
+
+import math
+
+from .batch import wilson_interval
+
+PASS = "pass"
+FAIL = "fail"
+PRECISE = "precise"
+
+
+class SequentialProbabilityRatioTest:
+    """
+    Wald's SPRT on the SUCCESS rate.
+
+    Tests H0: rate = target_rate - indifference against
+    H1: rate = target_rate + indifference, with error rates alpha (wrongly
+    passing) and beta (wrongly failing). Fleets whose true rate lies inside the
+    indifference band may be decided either way.
+    """
+
+    def __init__(
+        self, target_rate, indifference=0.025, alpha=0.05, beta=0.05, min_replicates=1
+    ):
+        self.lower_rate = target_rate - indifference
+        self.upper_rate = target_rate + indifference
+        if not 0 < self.lower_rate < self.upper_rate < 1:
+            raise ValueError(
+                "SPRT needs 0 < target_rate - indifference < target_rate + indifference < 1"
+            )
+        self.target_rate = target_rate
+        self.min_replicates = min_replicates
+        self.success_weight = math.log(self.upper_rate / self.lower_rate)
+        self.failure_weight = math.log((1 - self.upper_rate) / (1 - self.lower_rate))
+        self.pass_bound = math.log((1 - beta) / alpha)
+        self.fail_bound = math.log(beta / (1 - alpha))
+
+    def log_likelihood_ratio(self, successes, trials):
+        return (
+            successes * self.success_weight
+            + (trials - successes) * self.failure_weight
+        )
+
+    def decide(self, successes, trials):
+        if trials < self.min_replicates:
+            return None
+        ratio = self.log_likelihood_ratio(successes, trials)
+        if ratio >= self.pass_bound:
+            return PASS
+        if ratio <= self.fail_bound:
+            return FAIL
+        return None
+
+
+class ConfidenceIntervalRule:
+    """
+    Stops once the Wilson interval of the SUCCESS rate settles the outcome.
+
+    With a target_rate, the batch passes when the whole interval is at or above
+    it and fails when the whole interval is below it. With a half_width, the
+    batch also stops once the interval is that narrow, reported as PRECISE.
+    """
+
+    def __init__(
+        self, target_rate=None, half_width=None, confidence=0.95, min_replicates=10
+    ):
+        if target_rate is None and half_width is None:
+            raise ValueError("ConfidenceIntervalRule needs a target_rate or a half_width")
+        self.target_rate = target_rate
+        self.half_width = half_width
+        self.confidence = confidence
+        self.min_replicates = min_replicates
+
+    def decide(self, successes, trials):
+        if trials < self.min_replicates:
+            return None
+        lower, upper = wilson_interval(successes, trials, self.confidence)
+        if self.target_rate is not None:
+            if lower >= self.target_rate:
+                return PASS
+            if upper < self.target_rate:
+                return FAIL
+        if self.half_width is not None and (upper - lower) / 2 <= self.half_width:
+            return PRECISE
+        return None
@@ -0,0 +1,170 @@
+import math
+
+import numpy as np
+
+from .metrics import (
+    DAMAGED_INTEGRITY,
+    STRUCTURE_TOTALS,
+    compute_structure_totals,
+    get_structure_roles,
+)
+
+# Fields kept in contiguous arrays instead of on the agent objects
+STORED_FIELDS = ("integrity", "fire_intensity")
+
+_ROLES = ("power", "habitat_wall", "wall", "power_wall", "equipment", "hazmat")
+
+_INITIAL_CAPACITY = 256
+
+
+class StructureStore:
+    """
+    Structure-of-arrays storage for structure integrity and fire intensity.
+
+    Each registered structure gets a dense id; its tracked fields live in
+    float32 arrays at that index and the agent only keeps the id, so attribute
+    access on the agent becomes a view over the arrays. The store implements
+    the same interface as StructureAggregates (add, remove, update, totals,
+    resync, verify), with totals computed by vectorized reductions. Ids of
+    removed structures are reused by the next ones added, so the arrays stay
+    as large as the most structures registered at once.
+    """
+
+    def __init__(self, capacity=_INITIAL_CAPACITY):
+        self.size = 0
+        self.structures = []
+        # Released ids, reused last released first
+        self._free = []
+        self.values = {
+            name: np.zeros(capacity, dtype=np.float32) for name in STORED_FIELDS
+        }
+        # Whether the structure has the field at all (not every structure burns)
+        self.present = {name: np.zeros(capacity, dtype=bool) for name in STORED_FIELDS}
+        self.active = np.zeros(capacity, dtype=bool)
+        self.roles = {role: np.zeros(capacity, dtype=bool) for role in _ROLES}
+
+    def __contains__(self, structure):
+        return structure.__dict__.get("_store_id") is not None
+
+    def __len__(self):
+        return int(self.active[: self.size].sum())
+
+    def add(self, structure):
+        """Assigns a dense id to structure and moves its stored fields into the arrays"""
+        if structure in self:
+            return
+        if self._free:
+            store_id = self._free.pop()
+            self.structures[store_id] = structure
+        else:
+            if self.size == len(self.active):
+                self._grow()
+            store_id = self.size
+            self.size += 1
+            self.structures.append(structure)
+        self.active[store_id] = True
+
+        roles = get_structure_roles(type(structure))
+        for role in _ROLES:
+            self.roles[role][store_id] = roles[role]
+
+        state = structure.__dict__
+        for name in STORED_FIELDS:
+            if name in state:
+                self.values[name][store_id] = state.pop(name)
+                self.present[name][store_id] = True
+        state["_store_id"] = store_id
+
+    def remove(self, structure):
+        """Releases the structure's id and moves its fields back onto the agent"""
+        state = structure.__dict__
+        store_id = state.pop("_store_id", None)
+        if store_id is None:
+            return
+
+        for name in STORED_FIELDS:
+            if self.present[name][store_id]:
+                state[name] = float(self.values[name][store_id])
+                self.present[name][store_id] = False
+            self.values[name][store_id] = 0
+        self.active[store_id] = False
+        self.structures[store_id] = None
+        self._free.append(store_id)
+
+    def update(self, structure):
+        # Writes already land in the arrays, totals are reduced on demand
+        pass
+
+    def resync(self, model):
+        # Totals are reduced from the arrays on demand, nothing drifts
+        pass
+
+    def has(self, store_id, name):
+        return self.present[name][store_id]
+
+    def get(self, store_id, name):
+        return float(self.values[name][store_id])
+
+    def set(self, store_id, name, value):
+        self.values[name][store_id] = value
+        self.present[name][store_id] = True
+
+    def totals(self):
+        """Computes the STRUCTURE_TOTALS with vectorized reductions over the arrays"""
+        size = self.size
+        active = self.active[:size]
+        present = self.present["integrity"][:size] & active
+        integrity = self.values["integrity"][:size].astype(np.float64)
+        roles = {role: mask[:size] & present for role, mask in self.roles.items()}
+
+        damaged = integrity < DAMAGED_INTEGRITY
+        habitat_wall_damaged = roles["habitat_wall"] & (integrity < 100)
+
+        totals = {
+            "power_integrity_total": float(integrity[roles["power"]].sum()),
+            "power_components": int(roles["power"].sum()),
+            "wall_damage_total": float((100 - integrity[habitat_wall_damaged]).sum()),
+            "damaged_habitat_walls": int(habitat_wall_damaged.sum()),
+            "contamination_total": float((100 - integrity[roles["hazmat"]]).sum()),
+            "damaged_walls": int((damaged & roles["wall"]).sum()),
+            "damaged_power_walls": int((damaged & roles["power_wall"]).sum()),
+            "damaged_equipment": int((damaged & roles["equipment"]).sum()),
+        }
+        return {name: totals[name] for name in STRUCTURE_TOTALS}
+
+    def verify(self, model):
+        """
+        Checks the vectorized totals against a full per-agent recompute.
+
+        Raises:
+            RuntimeError: If any total differs from the recomputed value.
+        """
+        totals = self.totals()
+        recomputed = compute_structure_totals(model)
+        mismatches = [
+            f"{name}: arrays={totals[name]} recomputed={recomputed[name]}"
+            for name in STRUCTURE_TOTALS
+            if not math.isclose(
+                totals[name], recomputed[name], rel_tol=1e-6, abs_tol=1e-3
+            )
+        ]
+        if mismatches:
+            raise RuntimeError(
+                "Structure arrays diverged from full recompute: "
+                + "; ".join(mismatches)
+            )
+
+    def _grow(self):
+        capacity = len(self.active) * 2
+        for name in STORED_FIELDS:
+            self.values[name] = _resize(self.values[name], capacity)
+            self.present[name] = _resize(self.present[name], capacity)
+        self.active = _resize(self.active, capacity)
+        for role in _ROLES:
+            self.roles[role] = _resize(self.roles[role], capacity)
+
+
+def _resize(array, capacity):
+    resized = np.zeros(capacity, dtype=array.dtype)
+    resized[: len(array)] = array
+    return resized
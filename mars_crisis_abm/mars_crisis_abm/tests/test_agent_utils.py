@@ -1,5 +1,16 @@
 import pytest
-from mars_crisis_abm.utils import OperatingEnvironment, ZoneCode, get_zones_by_type
+import mesa
+from mars_crisis_abm.agents import BatteryPack
+from mars_crisis_abm.model import MarsModel
+from mars_crisis_abm.utils import (
+    BASE_DETERIORATION_RATE,
+    OperatingEnvironment,
+    ZoneCode,
+    NeighborhoodIndex,
+    get_zones_by_type,
+    spread_damage,
+    spread_fire,
+)
 
 @pytest.fixture
 def mock_zones():
@@ -27,3 +38,89 @@ def test_get_zones_by_type_external(mock_zones):
     external_zones = get_zones_by_type(mock_zones, OperatingEnvironment.EXTERNAL)
     expected_zones = [ZoneCode.OUTDOORS.value, ZoneCode.AIRLOCK.value]
     assert sorted(external_zones) == sorted(expected_zones)
+
+
+def test_neighborhood_index_matches_grid_query():
+    grid = mesa.space.MultiGrid(7, 7, False)
+    model = mesa.Model()
+    structures = []
+    for pos in [(0, 0), (1, 1), (3, 3), (3, 3), (6, 6), (4, 0)]:
+        structure = mesa.Agent(model)
+        grid.place_agent(structure, pos)
+        structures.append(structure)
+    robot = mesa.Agent(model)
+    grid.place_agent(robot, (2, 2))
+
+    index = NeighborhoodIndex(grid, structures, radii=(1, 3))
+
+    for structure in structures:
+        for radius in (1, 3):
+            expected = [
+                neighbor
+                for neighbor in grid.get_neighbors(structure.pos, moore=True, radius=radius)
+                if neighbor in structures
+            ]
+            assert index.get(structure, radius) == expected
+    assert index.get(robot, 1) is None
+    assert index.get(structures[0], 2) is None
+
+
+def test_neighborhood_index_flammable_filter():
+    grid = mesa.space.MultiGrid(3, 3, False)
+    model = mesa.Model()
+    burning = mesa.Agent(model)
+    burning.fire_intensity = 0
+    inert = mesa.Agent(model)
+    grid.place_agent(burning, (0, 0))
+    grid.place_agent(inert, (1, 1))
+
+    index = NeighborhoodIndex(grid, [burning, inert], radii=(3,))
+
+    assert index.get(inert, 3, flammable=True) == [burning]
+    assert index.get(burning, 3, flammable=True) == []
+
+
+def test_neighborhood_index_includes_mobile_agents_in_range():
+    grid = mesa.space.MultiGrid(7, 7, False)
+    model = mesa.Model()
+    structure = mesa.Agent(model)
+    grid.place_agent(structure, (3, 3))
+    rover = mesa.Agent(model)
+    rover.integrity = 100
+    grid.place_agent(rover, (6, 6))
+
+    index = NeighborhoodIndex(grid, [structure], radii=(1, 3), mobile=[rover])
+
+    assert index.get(structure, 3) == [rover]
+    assert index.get(structure, 3, flammable=True) == []
+    grid.move_agent(rover, (5, 1))
+    assert index.get(structure, 1) == []
+    assert index.get(structure, 3) == [rover]
+
+
+def test_spreads_reach_mobile_agents():
+    class Rover(mesa.Agent):
+        def __init__(self, model):
+            super().__init__(model)
+            self.integrity = 100
+            self.fire_intensity = 0
+
+    grid_data = [["corridor"] * 5 for _ in range(5)]
+    config_params = {"CREW_SIZE": 0, "ROBOT_COUNTS": {}}
+    model = MarsModel(config_params, grid_data, [], seed=1)
+    for agent in list(model.agents):
+        agent.remove()
+    battery = BatteryPack(model, 60)
+    model.grid.place_agent(battery, (2, 2))
+    near, far = Rover(model), Rover(model)
+    model.grid.place_agent(near, (3, 3))
+    model.grid.place_agent(far, (4, 4))
+    model._refresh_indexes()
+    assert model.neighborhoods.mobile == [near, far]
+
+    spread_damage(battery)
+    assert near.integrity == 100 - BASE_DETERIORATION_RATE
+    assert far.integrity == 100
+
+    spread_fire(battery)
+    assert near.fire_intensity > 0 and far.fire_intensity > 0
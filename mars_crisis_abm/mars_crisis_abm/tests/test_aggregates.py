@@ -0,0 +1,143 @@
+import pytest
+from mars_crisis_abm.aggregates import TrackedAttribute
+from mars_crisis_abm.model import AGGREGATE_RESYNC_INTERVAL, MarsModel
+from mars_crisis_abm.metrics import compute_structure_totals
+from mars_crisis_abm.utils import STABILITY_THRESHOLDS, spread_fire
+from mars_crisis_abm.agents import (
+    CentralCommunicationsSystem,
+    ComplexStructure,
+    BatteryPack,
+    HazardousMaterialsStorage,
+    HabitatWall,
+    PowerWall,
+)
+
+
+@pytest.fixture
+def model():
+    grid_data = [
+        ["outdoors", "outdoors", "outdoors"],
+        ["outdoors", "habitat", "outdoors"],
+        ["outdoors", "outdoors", "outdoors"],
+    ]
+
+    model = MarsModel(
+        config_params={
+            "ROBOT_COUNTS": {},
+            "CREW_SIZE": 1,
+        },
+        grid_data=grid_data,
+        equipment_positions=[],
+        debug_aggregates=True,
+    )
+
+    for agent in list(model.agents):
+        agent.remove()
+
+    CentralCommunicationsSystem(model, 100)
+
+    yield model
+
+
+def test_aggregates_track_new_structures(model):
+    BatteryPack(model, 60)
+    PowerWall(model, 90)
+    HazardousMaterialsStorage(model, 70)
+
+    totals = model.aggregates.totals()
+    assert totals["power_integrity_total"] == 150
+    assert totals["power_components"] == 2
+    assert totals["contamination_total"] == 30
+    assert totals == compute_structure_totals(model)
+
+
+def test_aggregates_follow_integrity_writes(model):
+    wall = HabitatWall(model, 100)
+
+    wall.integrity = 75
+    wall.integrity -= 5
+
+    totals = model.aggregates.totals()
+    assert totals["damaged_habitat_walls"] == 1
+    assert totals["wall_damage_total"] == 30
+    assert totals["damaged_walls"] == 1
+    assert totals == compute_structure_totals(model)
+
+
+def test_aggregates_drop_removed_structures(model):
+    battery = BatteryPack(model, 60)
+    battery.remove()
+
+    totals = model.aggregates.totals()
+    assert totals["power_components"] == 0
+    assert totals["power_integrity_total"] == 0
+    assert battery not in model.aggregates
+
+
+def test_debug_mode_detects_divergence(model):
+    HabitatWall(model, 50)
+    model._update_system_status()
+
+    model.aggregates._totals[0] += 10
+
+    with pytest.raises(RuntimeError, match="power_integrity_total"):
+        model._update_system_status()
+
+
+
+def test_periodic_resync_drops_drift(model):
+    model.debug_aggregates = False
+    HabitatWall(model, 50)
+    model.aggregates._totals[0] += 1e-9
+
+    model.steps = AGGREGATE_RESYNC_INTERVAL - 1
+    model._update_system_status()
+    assert model.aggregates.totals() != compute_structure_totals(model)
+
+    model.steps = AGGREGATE_RESYNC_INTERVAL
+    model._update_system_status()
+    assert model.aggregates.totals() == compute_structure_totals(model)
+
+
+def test_model_installs_tracking(model):
+    for name in ("integrity", "fire_intensity"):
+        assert isinstance(vars(ComplexStructure)[name], TrackedAttribute)
+
+
+def test_burning_set_follows_fire_intensity(model):
+    battery = BatteryPack(model, 60)
+    battery.fire_intensity = 0
+    assert battery not in model.burning
+
+    battery.fire_intensity = 40
+    battery.fire_intensity += 5
+    assert list(model.burning) == [battery]
+
+    model._update_system_status()
+    assert model.metrics["fire_strength_total"] == 45
+    assert model.metrics["active_fires"] == 1
+
+    battery.fire_intensity = 0
+    assert battery not in model.burning
+
+
+def test_burning_set_drops_removed_structures(model):
+    battery = BatteryPack(model, 60)
+    battery.fire_intensity = 40
+
+    battery.remove()
+    assert battery not in model.burning
+
+
+def test_spread_fire_ignites_into_burning_set(model):
+    source = BatteryPack(model, 60)
+    target = PowerWall(model, 100)
+    target.fire_intensity = 0
+    model.grid.place_agent(source, (0, 0))
+    model.grid.place_agent(target, (2, 2))
+
+    spread_fire(source)
+
+    assert target in model.burning
+    assert target.integrity == STABILITY_THRESHOLDS["structure"] - 1
+    model._update_system_status()
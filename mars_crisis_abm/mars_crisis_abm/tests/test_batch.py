@@ -0,0 +1,138 @@
+import os
+import random
+import tempfile
+
+import pytest
+from mars_crisis_abm.__main__ import main, parse_args
+from mars_crisis_abm.batch import (
+    map_replicates,
+    replicate_pool,
+    replicate_seeds,
+    run_replicate,
+    run_replicates,
+    summarize_replicates,
+    wilson_interval,
+)
+
+
+@pytest.fixture
+def layout_path():
+    csv_content = """;;;;;T;T;T
+;A;H;H;M;M;T;T
+;A;H;H;M;C;T;T
+;C;C;1;C;C;C;C
+;L;L;C;R;D;D;
+;L;L;2;R;D;C;
+;;;;;3;D;"""
+
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+        f.write(csv_content)
+        temp_path = f.name
+
+    yield temp_path
+
+    os.unlink(temp_path)
+
+
+@pytest.fixture
+def config_params():
+    return {
+        "CREW_SIZE": 3,
+        "ROBOT_COUNTS": {"MaintenanceRobot": 2, "BioLabRobot": 1},
+    }
+
+
+def test_replicate_seeds_are_deterministic():
+    assert replicate_seeds(7, 5) == replicate_seeds(7, 5)
+    assert replicate_seeds(7, 5)[:3] == replicate_seeds(7, 3)
+    assert len(set(replicate_seeds(7, 5))) == 5
+
+
+def test_run_replicate_is_reproducible(config_params, layout_path):
+    first = run_replicate(config_params, layout_path, seed=11, max_steps=15)
+    second = run_replicate(config_params, layout_path, seed=11, max_steps=15)
+
+    assert first == second
+    assert first["steps"] <= 15
+    assert "Power Level" in first["final_metrics"]
+
+
+def test_run_replicates_independent_of_workers(config_params, layout_path):
+    serial = run_replicates(
+        config_params, layout_path, 4, base_seed=3, workers=1, max_steps=15
+    )
+    parallel = run_replicates(
+        config_params, layout_path, 4, base_seed=3, workers=2, max_steps=15
+    )
+
+    assert serial == parallel
+    assert [result["seed"] for result in serial] == replicate_seeds(3, 4)
+
+
+def test_map_replicates_shares_a_pool_across_calls(config_params, layout_path):
+    tasks = [
+        (config_params, layout_path, seed, 10) for seed in replicate_seeds(3, 4)
+    ]
+
+    with replicate_pool(2) as executor:
+        first = list(map_replicates(tasks[:2], executor, workers=2))
+        second = list(map_replicates(tasks[2:], executor, workers=2))
+
+    assert first + second == list(map_replicates(tasks, workers=1))
+
+
+def test_summarize_replicates():
+    results = [
+        {"mission_status": "SUCCESS", "steps": 10, "final_metrics": {"Power Level": 80}},
+        {"mission_status": "SUCCESS", "steps": 30, "final_metrics": {"Power Level": 90}},
+        {"mission_status": "FAILURE", "steps": 5, "final_metrics": {"Power Level": 5}},
+        {"mission_status": "ONGOING", "steps": 50, "final_metrics": {"Power Level": 60}},
+    ]
+
+    summary = summarize_replicates(results)
+
+    assert summary["replicates"] == 4
+    assert summary["status_counts"] == {"SUCCESS": 2, "FAILURE": 1, "ONGOING": 1}
+    assert summary["status_rates"]["SUCCESS"] == 0.5
+    assert summary["time_to_success"]["median"] == 20
+    assert summary["time_to_failure"]["max"] == 5
+    assert summary["final_metrics"]["Power Level"]["mean"] == pytest.approx(58.75)
+
+
+def test_wilson_interval():
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+
+    lower, upper = wilson_interval(19, 20)
+    assert lower < 0.95 < upper
+    assert lower == pytest.approx(0.7639, abs=1e-3)
+
+    lower, upper = wilson_interval(0, 10)
+    assert lower == pytest.approx(0.0)
+    assert upper < 0.31
+
+
+def test_run_replicate_restores_global_random(config_params, layout_path):
+    random.seed(5)
+    expected = random.random()
+    random.seed(5)
+
+    run_replicate(config_params, layout_path, seed=11, max_steps=5)
+
+    assert random.random() == expected
+
+
+def test_cli_defaults_depend_on_mode():
+    single = parse_args([])
+    batch = parse_args(["--replicates", "4"])
+
+    assert single.seed is None and single.max_steps is None
+    assert batch.seed == 0 and batch.max_steps == 1000
+
+
+def test_single_run_honours_seed_and_max_steps(capsys):
+    main(["--seed", "3", "--max-steps", "10"])
+
+    output = capsys.readouterr().out
+    assert "Step 10:" in output
+    assert "Step 20:" not in output
+    assert "Simulation complete!" in output
@@ -0,0 +1,128 @@
+import json
+
+import pytest
+from mars_crisis_abm.benchmarks import (
+    SCENARIOS,
+    compare_to_baseline,
+    load_baseline,
+    parse_args,
+    run_benchmarks,
+    save_baseline,
+    scale_config,
+    tile_layout,
+)
+from mars_crisis_abm.utils import load_config
+
+CONFIG_PATH = "config/params.json"
+LAYOUT_PATH = "config/grid_layout.csv"
+
+
+def _result(scenario, **metrics):
+    return {
+        "scenario": scenario,
+        "construction_seconds": 1.0,
+        "steady_steps_per_second": 100.0,
+        "run_steps_per_second": 100.0,
+        "peak_rss_mb": 50.0,
+        "import_seconds": 0.5,
+        **metrics,
+    }
+
+
+def test_tile_layout_offsets_every_tile():
+    grid_data = [["habitat", "corridor", "wall"], ["lab", "lab", "airlock"]]
+    cells = [{"x": 1, "y": 0, "type": "battery"}]
+
+    tiled, tiled_cells = tile_layout(grid_data, cells, 2)
+
+    assert len(tiled) == 4 and all(len(row) == 6 for row in tiled)
+    assert tiled[2][3] == "habitat" and tiled[3][5] == "airlock"
+    assert [(cell["x"], cell["y"]) for cell in tiled_cells] == [
+        (1, 0),
+        (4, 0),
+        (1, 2),
+        (4, 2),
+    ]
+    assert cells == [{"x": 1, "y": 0, "type": "battery"}]
+
+
+def test_scale_config():
+    config_params = {"CREW_SIZE": 15, "ROBOT_COUNTS": {"BioLabRobot": 10}}
+
+    scaled = scale_config(config_params, 4, 16)
+
+    assert scaled == {"CREW_SIZE": 240, "ROBOT_COUNTS": {"BioLabRobot": 40}}
+    assert config_params["ROBOT_COUNTS"] == {"BioLabRobot": 10}
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    baseline = {"scenarios": {"1x": _result("1x")}}
+    results = [
+        _result(
+            "1x",
+            construction_seconds=1.1,
+            steady_steps_per_second=70.0,
+            run_steps_per_second=130.0,
+            peak_rss_mb=80.0,
+            import_seconds=0.7,
+        ),
+        _result("4x"),
+    ]
+
+    comparisons = compare_to_baseline(results, baseline, tolerance=0.15)
+
+    flags = {c["metric"]: c["regression"] for c in comparisons}
+    assert flags == {
+        "construction_seconds": False,
+        "steady_steps_per_second": True,
+        "run_steps_per_second": False,
+        "peak_rss_mb": True,
+        "import_seconds": True,
+    }
+    assert {c["scenario"] for c in comparisons} == {"1x"}
+    assert compare_to_baseline(results, None) == []
+
+
+def test_save_baseline_keeps_scenarios_not_run(tmp_path):
+    path = tmp_path / "baseline.json"
+    assert load_baseline(path) is None
+
+    save_baseline([_result("1x"), _result("4x")], path)
+    save_baseline([_result("1x", peak_rss_mb=60.0)], path, load_baseline(path))
+
+    stored = json.loads(path.read_text())["scenarios"]
+    assert set(stored) == {"1x", "4x"}
+    assert stored["1x"]["peak_rss_mb"] == 60.0
+    assert "phases" not in stored["1x"]
+
+
+def test_run_smallest_scenario_in_process():
+    (result,) = run_benchmarks(
+        ["1x"],
+        load_config(CONFIG_PATH),
+        LAYOUT_PATH,
+        warmup_steps=1,
+        steady_steps=2,
+        max_steps=3,
+        isolate=False,
+    )
+
+    assert result["robots"] == 37
+    assert (result["width"], result["height"]) == (50, 60)
+    assert result["construction_seconds"] > 0
+    assert 0 < result["run_steps"] <= 3
+    assert "agents" in result["phases"]
+    assert result["import_seconds"] > 0
+
+
+def test_cli_runs_every_scenario_by_default():
+    assert parse_args([]).scenarios == list(SCENARIOS)
+    assert parse_args(["4x", "1x"]).scenarios == ["4x", "1x"]
+
+
+def test_cli_rejects_unknown_scenarios(capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        parse_args(["1x", "64x"])
+
+    assert exit_info.value.code == 2
+    assert "64x" in capsys.readouterr().err
@@ -0,0 +1,115 @@
+import os
+import random
+
+import pytest
+from mars_crisis_abm import blueprint_cache
+from mars_crisis_abm.blueprint_cache import compile_blueprint, load_compiled_blueprint
+from mars_crisis_abm.model import MarsModel
+from mars_crisis_abm.utils import load_grid_layout_csv
+
+LAYOUT = """;;;;;T;T;T
+;W;W;W;W;W;T;T
+;W;H;H;M;W;T;T
+;A;H;1;M;W;X;X
+;W;L;C;R;D;3;X
+;W;W;2;R;D;C;X
+;;;;;4;X;X"""
+
+
+@pytest.fixture
+def layout_path(tmp_path):
+    path = tmp_path / "layout.csv"
+    path.write_text(LAYOUT)
+    return str(path)
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return str(tmp_path / "cache")
+
+
+def test_compiled_blueprint_matches_csv_loader(layout_path):
+    blueprint = compile_blueprint(layout_path)
+    grid_data, equipment_positions = load_grid_layout_csv(
+        layout_path, rng=random.Random(3)
+    )
+
+    assert blueprint.grid_data == grid_data
+    assert blueprint.equipment_positions(rng=random.Random(3)) == equipment_positions
+    assert (1, 1, "habitat_wall") in blueprint.wall_cells
+    assert (6, 3, "power_wall") in blueprint.wall_cells
+    assert blueprint.zones["habitat"]["bounds"] == [2, 2, 4, 4]
+
+
+def test_zone_table_is_a_copy(layout_path):
+    blueprint = compile_blueprint(layout_path)
+
+    zones = blueprint.zone_table()
+    zones["habitat"]["positions"].clear()
+    zones["habitat"]["bounds"][0] = 99
+
+    assert blueprint.zones["habitat"]["positions"]
+    assert blueprint.zones["habitat"]["bounds"][0] == 2
+
+
+def test_load_compiled_blueprint_uses_cache(layout_path, cache_dir, monkeypatch):
+    first = load_compiled_blueprint(layout_path, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+
+    def fail(path):
+        raise AssertionError("blueprint was recompiled")
+
+    monkeypatch.setattr(blueprint_cache, "compile_blueprint", fail)
+    second = load_compiled_blueprint(layout_path, cache_dir=cache_dir)
+
+    assert second.layout_hash == first.layout_hash
+    assert second.zones == first.zones
+
+
+def test_layout_change_compiles_new_artifact(layout_path, cache_dir):
+    first = load_compiled_blueprint(layout_path, cache_dir=cache_dir)
+
+    with open(layout_path, "a") as f:
+        f.write("\n;;;;;;;")
+    second = load_compiled_blueprint(layout_path, cache_dir=cache_dir)
+
+    assert second.layout_hash != first.layout_hash
+    assert second.height == first.height + 1
+    assert len(os.listdir(cache_dir)) == 2
+
+
+def test_corrupt_artifact_is_recompiled(layout_path, cache_dir):
+    load_compiled_blueprint(layout_path, cache_dir=cache_dir)
+    (artifact,) = os.listdir(cache_dir)
+    with open(os.path.join(cache_dir, artifact), "wb") as f:
+        f.write(b"not a pickle")
+
+    blueprint = load_compiled_blueprint(layout_path, cache_dir=cache_dir)
+
+    assert blueprint.zones == compile_blueprint(layout_path).zones
+
+
+def test_model_from_blueprint_matches_model_from_grid(layout_path):
+    config_params = {"CREW_SIZE": 2, "ROBOT_COUNTS": {"MaintenanceRobot": 2}}
+    grid_data, equipment_positions = load_grid_layout_csv(
+        layout_path, rng=random.Random(1)
+    )
+    blueprint = compile_blueprint(layout_path)
+
+    from_grid = MarsModel(config_params, grid_data, equipment_positions, seed=4)
+    from_blueprint = MarsModel(
+        config_params,
+        blueprint.grid_data,
+        blueprint.equipment_positions(rng=random.Random(1)),
+        seed=4,
+        blueprint=blueprint,
+    )
+
+    def placement(model):
+        return [
+            (type(agent).__name__, agent.pos, getattr(agent, "integrity", None))
+            for agent in model.agents
+        ]
+
+    assert from_blueprint.zones == from_grid.zones
+    assert placement(from_blueprint) == placement(from_grid)
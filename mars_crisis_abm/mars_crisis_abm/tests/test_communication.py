@@ -0,0 +1,199 @@
+import itertools
+import math
+import random
+
+import pytest
+from mars_crisis_abm.agents import Robot
+from mars_crisis_abm.communication import BroadcastEngine, CommunicationMesh
+from mars_crisis_abm.model import MarsModel
+from mars_crisis_abm.utils import load_config, load_grid_layout_csv
+
+CONFIG_PATH = "config/params.json"
+LAYOUT_PATH = "config/grid_layout.csv"
+
+
+class Node:
+    _ids = itertools.count()
+
+    def __init__(self, pos):
+        self.pos = pos
+        self.unique_id = next(Node._ids)
+
+
+def brute_force_components(nodes, communication_range, distance):
+    # Flood fill over explicit pairwise distances
+    component = {}
+    for start in nodes:
+        if start in component:
+            continue
+        component[start] = start
+        frontier = [start]
+        while frontier:
+            node = frontier.pop()
+            for other in nodes:
+                if other not in component and (
+                    distance(node.pos, other.pos) <= communication_range
+                ):
+                    component[other] = start
+                    frontier.append(other)
+    return component
+
+
+def chebyshev(a, b):
+    return max(abs(a[0] - b[0]), abs(a[1] - b[1]))
+
+
+def test_connectivity_and_peers():
+    a, b, c = Node((0, 0)), Node((20, 20)), Node((45, 40))
+    lone, unplaced = Node((100, 100)), Node(None)
+    mesh = CommunicationMesh(
+        [a, b, c, lone, unplaced], communication_range=30, metric="euclidean"
+    )
+
+    # a-b is 28.3 apart and b-c 32.0, so c is only within chebyshev range
+    assert mesh.is_connected(a) and mesh.is_connected(b)
+    assert not mesh.is_connected(c)
+    assert not mesh.is_connected(lone)
+    assert not mesh.is_connected(unplaced)
+    assert unplaced not in mesh
+    assert len(mesh) == 4
+    assert mesh.components == 3
+    assert mesh.component_of(a) == mesh.component_of(b) != mesh.component_of(c)
+    assert mesh.peers(a) == [b]
+    assert mesh.peers(lone) == []
+
+    chebyshev_mesh = CommunicationMesh([a, b, c], 30, metric="chebyshev")
+    assert chebyshev_mesh.components == 1
+    assert set(chebyshev_mesh.peers(a)) == {b, c}
+
+
+@pytest.mark.parametrize("metric", ["euclidean", "chebyshev"])
+def test_components_match_brute_force(metric):
+    rng = random.Random(3)
+    nodes = [Node((rng.randrange(200), rng.randrange(150))) for _ in range(120)]
+    distance = math.dist if metric == "euclidean" else chebyshev
+    expected = brute_force_components(nodes, 30, distance)
+
+    mesh = CommunicationMesh(nodes, 30, metric=metric)
+
+    for a, b in itertools.combinations(nodes, 2):
+        same = expected[a] is expected[b]
+        assert (mesh.component_of(a) == mesh.component_of(b)) == same
+    for node in nodes:
+        has_neighbor = any(
+            other is not node and distance(node.pos, other.pos) <= 30
+            for other in nodes
+        )
+        assert mesh.is_connected(node) == has_neighbor
+        assert set(mesh.peers(node)) == {
+            other
+            for other in nodes
+            if other is not node and expected[other] is expected[node]
+        }
+
+
+def test_default_mesh_matches_robot_connectivity():
+    grid_data, equipment_positions = load_grid_layout_csv(
+        LAYOUT_PATH, rng=random.Random(3)
+    )
+    model = MarsModel(load_config(CONFIG_PATH), grid_data, equipment_positions, seed=3)
+    robots = model.agents_of(Robot)
+    rng = random.Random(3)
+
+    # The fleet in a corner, one robot exactly at range, and a pair within
+    # chebyshev but not euclidean range of each other and far from the rest
+    placements = [(0, 0)] * (len(robots) - 3) + [(30, 0), (49, 59), (20, 40)]
+    layouts = [placements] + [
+        [
+            (rng.randrange(model.grid.width), rng.randrange(model.grid.height))
+            for _ in robots
+        ]
+        for _ in range(3)
+    ]
+    for layout in layouts:
+        for robot, pos in zip(robots, layout):
+            model.grid.move_agent(robot, pos)
+        mesh = CommunicationMesh(robots)
+        for robot in robots:
+            assert mesh.is_connected(robot) == robot._is_connected_to_network()
+
+
+def test_empty_mesh():
+    mesh = CommunicationMesh([])
+    assert len(mesh) == 0
+    assert mesh.components == 0
+    assert not mesh.is_connected(Node((0, 0)))
+
+
+def test_unknown_metric():
+    with pytest.raises(ValueError):
+        CommunicationMesh([], metric="manhattan")
+
+
+def test_flooding_reaches_sender_component_once():
+    a, b, c = Node((0, 0)), Node((20, 0)), Node((40, 0))
+    far = Node((100, 100))
+    mesh = CommunicationMesh([a, b, c, far], 30)
+    engine = BroadcastEngine()
+
+    engine.broadcast(a, "threat", key="fire-3")
+    engine.broadcast(far, "help")
+    assert engine.deliver(mesh) == 2
+
+    # c is two hops from a and receives the flood through b
+    assert engine.received(b) == ["threat"]
+    assert engine.received(c) == ["threat"]
+    assert engine.received(a) == []
+    assert engine.received(far) == []
+    assert all(engine.has_seen(robot, "fire-3") for robot in (a, b, c))
+    assert not engine.has_seen(far, "fire-3")
+
+    # Re-detecting the same threat only reaches robots that missed it
+    d = Node((60, 0))
+    engine.broadcast(c, "threat", key="fire-3")
+    assert engine.deliver(CommunicationMesh([a, b, c, d, far], 30)) == 1
+    assert engine.received(d) == ["threat"]
+    assert engine.received(b) == []
+
+
+def test_inboxes_only_hold_latest_pass():
+    a, b = Node((0, 0)), Node((10, 0))
+    mesh = CommunicationMesh([a, b], 30)
+    engine = BroadcastEngine()
+
+    engine.broadcast(a, "status")
+    engine.broadcast(a, "status")
+    engine.deliver(mesh)
+    assert engine.received(b) == ["status", "status"]
+
+    engine.clear()
+    assert engine.received(b) == []
+
+
+def test_message_cache_is_bounded():
+    a, b = Node((0, 0)), Node((10, 0))
+    mesh = CommunicationMesh([a, b], 30)
+    engine = BroadcastEngine(max_messages=2)
+
+    for key in ("k1", "k2", "k3"):
+        engine.broadcast(a, key, key=key)
+    engine.deliver(mesh)
+
+    assert len(engine) == 2
+    assert not engine.has_seen(b, "k1")
+    assert engine.has_seen(b, "k3")
+
+
+def test_forgotten_ids_are_reused_clean():
+    a, b = Node((0, 0)), Node((10, 0))
+    engine = BroadcastEngine()
+    engine.broadcast(a, "threat", key="t")
+    engine.deliver(CommunicationMesh([a, b], 30))
+
+    engine.forget(b)
+    newcomer = Node((10, 0))
+    engine.broadcast(a, "threat", key="t")
+    engine.deliver(CommunicationMesh([a, newcomer], 30))
+
+    assert engine.received(newcomer) == ["threat"]
+    assert engine.has_seen(newcomer, "t")
@@ -0,0 +1,77 @@
+import pytest
+from mars_crisis_abm.agents import BatteryPack, HabitatWall
+from mars_crisis_abm.events import DOWN, UP, EventBus
+from mars_crisis_abm.model import MarsModel
+
+
+@pytest.fixture
+def model():
+    grid_data = [["habitat", "habitat"], ["corridor", "corridor"]]
+    config_params = {"CREW_SIZE": 0, "ROBOT_COUNTS": {}}
+    model = MarsModel(config_params, grid_data, [], seed=1)
+    for agent in list(model.agents):
+        agent.remove()
+    return model
+
+
+def test_crossings_follow_direction_of_travel(model):
+    events = []
+    model.events.subscribe(events.append)
+    wall = HabitatWall(model, 100)
+    assert events == []
+
+    wall.integrity = 60
+    wall.integrity = 55
+    wall.integrity = 18
+    assert [(e.threshold, e.direction) for e in events] == [
+        (80, DOWN),
+        (70, DOWN),
+        (50, DOWN),
+        (30, DOWN),
+        (20, DOWN),
+    ]
+    assert events[-1].old == 55 and events[-1].new == 18
+
+    events.clear()
+    wall.integrity = 70
+    assert [(e.threshold, e.direction) for e in events] == [
+        (20, UP),
+        (30, UP),
+        (50, UP),
+        (70, UP),
+    ]
+
+
+def test_subscription_filters(model):
+    ignitions, walls = [], []
+    model.events.subscribe(ignitions.append, thresholds=[30], direction=DOWN)
+    subscription = model.events.subscribe(walls.append, structure_class=HabitatWall)
+    battery = BatteryPack(model, 40)
+    wall = HabitatWall(model, 40)
+
+    battery.integrity = 25
+    wall.integrity = 25
+    battery.integrity = 35
+    assert [e.structure for e in ignitions] == [battery, wall]
+    assert [(e.structure, e.threshold) for e in walls] == [(wall, 30)]
+
+    model.events.unsubscribe(subscription)
+    wall.integrity = 10
+    assert len(walls) == 1
+    assert [e.threshold for e in ignitions] == [30, 30]
+
+
+def test_bus_is_silent_without_crossings():
+    bus = EventBus(thresholds=(50,))
+    seen = []
+    bus.subscribe(seen.append)
+
+    bus.integrity_changed("wall", None, 10)
+    bus.integrity_changed("wall", 60, 55)
+    bus.integrity_changed("wall", 50, 50)
+    assert seen == []
+    bus.integrity_changed("wall", 50, 49.9)
+    assert len(seen) == 1
+
+    with pytest.raises(ValueError):
+        bus.subscribe(seen.append, direction="sideways")
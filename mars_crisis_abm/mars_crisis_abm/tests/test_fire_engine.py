@@ -0,0 +1,116 @@
+import random
+
+import mesa
+import pytest
+from mars_crisis_abm.fire_engine import FireGrid
+from mars_crisis_abm.model import MarsModel
+from mars_crisis_abm.utils import (
+    STABILITY_THRESHOLDS,
+    FIRE_IGNITION_INTENSITY,
+    FIRE_SPREAD_INTENSITY,
+    spread_fire,
+)
+from mars_crisis_abm.agents import BatteryPack, PowerWall
+
+
+def _build_world(seed):
+    rng = random.Random(seed)
+    model = mesa.Model()
+    model.grid = mesa.space.MultiGrid(15, 12, False)
+    structures = []
+    for _ in range(80):
+        structure = mesa.Agent(model)
+        structure.integrity = 100
+        if rng.random() < 0.9:
+            structure.fire_intensity = rng.choice([0, 0, 0, 0, 20, 75, 90])
+        model.grid.place_agent(
+            structure, (rng.randrange(15), rng.randrange(12))
+        )
+        structures.append(structure)
+    return model, structures
+
+
+def _state(structures):
+    return [
+        (structure.integrity, getattr(structure, "fire_intensity", None))
+        for structure in structures
+    ]
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_fire_grid_matches_spread_fire(seed):
+    agents_model, agents_structures = _build_world(seed)
+    grid_model, grid_structures = _build_world(seed)
+
+    sources = [
+        structure
+        for structure in agents_structures
+        if getattr(structure, "fire_intensity", 0) >= FIRE_SPREAD_INTENSITY
+    ]
+    for source in sources:
+        spread_fire(source)
+
+    burning = [
+        structure
+        for structure in grid_structures
+        if getattr(structure, "fire_intensity", 0) > 0
+    ]
+    ignited = FireGrid(grid_model.grid, grid_structures).step(burning)
+
+    assert _state(agents_structures) == _state(grid_structures)
+    assert all(structure.fire_intensity == FIRE_IGNITION_INTENSITY for structure in ignited)
+
+
+def test_fire_grid_skips_own_cell():
+    model = mesa.Model()
+    model.grid = mesa.space.MultiGrid(10, 10, False)
+    source = mesa.Agent(model)
+    source.integrity = 100
+    source.fire_intensity = 90
+    same_cell = mesa.Agent(model)
+    same_cell.integrity = 100
+    same_cell.fire_intensity = 0
+    far = mesa.Agent(model)
+    far.integrity = 100
+    far.fire_intensity = 0
+    model.grid.place_agent(source, (2, 2))
+    model.grid.place_agent(same_cell, (2, 2))
+    model.grid.place_agent(far, (6, 6))
+
+    fire_grid = FireGrid(model.grid, [source, same_cell, far])
+    assert fire_grid.step([source]) == []
+    assert fire_grid.intensity[2, 2] == 90
+
+
+def test_model_grid_fire_engine():
+    model = MarsModel(
+        config_params={"ROBOT_COUNTS": {}, "CREW_SIZE": 1},
+        grid_data=[["habitat"] + ["outdoors"] * 7 for _ in range(8)],
+        equipment_positions=[],
+        fire_engine="grid",
+    )
+    source = BatteryPack(model, 100)
+    source.fire_intensity = 80
+    target = PowerWall(model, 100)
+    target.fire_intensity = 0
+    model.grid.place_agent(source, (1, 1))
+    model.grid.place_agent(target, (4, 4))
+
+    spread_fire(source)
+    assert target.fire_intensity == 0
+
+    model.step()
+
+    assert target in model.burning
+    assert target.integrity == STABILITY_THRESHOLDS["structure"] - 1
+    assert model.fire_grid.intensity[4, 4] == FIRE_IGNITION_INTENSITY
+
+
+def test_unknown_fire_engine():
+    with pytest.raises(ValueError, match="Unknown fire engine"):
+        MarsModel(
+            config_params={"ROBOT_COUNTS": {}, "CREW_SIZE": 1},
+            grid_data=[["habitat"]],
+            equipment_positions=[],
+            fire_engine="cellular",
+        )
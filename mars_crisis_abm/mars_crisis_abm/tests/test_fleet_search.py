@@ -0,0 +1,153 @@
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from mars_crisis_abm.fleet_search import (
+    FAILING,
+    OVER_PROVISIONED,
+    PASSING,
+    ROBOT_TYPES,
+    UNDECIDED,
+    FleetCandidate,
+    _prune,
+    sample_fleets,
+    search_minimum_fleet,
+)
+
+
+@pytest.fixture
+def layout_path():
+    csv_content = """;;;;;T;T;T
+;A;H;H;M;M;T;T
+;A;H;H;M;C;T;T
+;C;C;1;C;C;C;C
+;L;L;C;R;D;D;
+;L;L;2;R;D;C;
+;;;;;3;D;"""
+
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+        f.write(csv_content)
+        temp_path = f.name
+
+    yield temp_path
+
+    os.unlink(temp_path)
+
+
+def test_sample_fleets_within_bounds():
+    max_counts = {"MaintenanceRobot": 3, "BioLabRobot": 2}
+
+    fleets = sample_fleets(max_counts, 8, seed=1)
+
+    assert fleets == sample_fleets(max_counts, 8, seed=1)
+    assert fleets[0]["MaintenanceRobot"] == 3 and fleets[0]["BioLabRobot"] == 2
+    assert len({tuple(fleet.values()) for fleet in fleets}) == 8
+    for fleet in fleets:
+        assert set(fleet) == set(ROBOT_TYPES)
+        assert 0 <= fleet["MaintenanceRobot"] <= 3
+        assert fleet["ConstructionRobot"] == 0
+
+
+def test_sample_fleets_capped_by_search_space():
+    assert len(sample_fleets({"LogisticsRobot": 2}, 10)) == 3
+
+
+def test_prune_settles_dominated_candidates():
+    small = FleetCandidate({"MaintenanceRobot": 1})
+    large = FleetCandidate({"MaintenanceRobot": 4, "BioLabRobot": 1})
+    mid = FleetCandidate({"MaintenanceRobot": 2})
+    tiny = FleetCandidate({"MaintenanceRobot": 1, "BioLabRobot": 0})
+    mid.status = PASSING
+    small.status = FAILING
+
+    _prune([small, large, mid, tiny], monotone=True)
+
+    assert large.status == OVER_PROVISIONED
+    assert tiny.status == FAILING
+    assert mid.status == PASSING
+
+
+def test_prune_without_monotonicity_keeps_dominated_candidates():
+    failed = FleetCandidate({"MaintenanceRobot": 2})
+    smaller = FleetCandidate({"MaintenanceRobot": 1})
+    failed.status = FAILING
+
+    _prune([failed, smaller], monotone=False)
+
+    assert smaller.status == UNDECIDED
+
+
+def test_search_picks_cheapest_passing_fleet(layout_path):
+    config_params = {"CREW_SIZE": 3, "ROBOT_COUNTS": {}}
+    candidates = [
+        {"MaintenanceRobot": 2, "BioLabRobot": 1},
+        {"MaintenanceRobot": 1},
+        {"MaintenanceRobot": 1},
+    ]
+
+    search = search_minimum_fleet(
+        config_params,
+        layout_path,
+        candidates,
+        target_rate=0.0,
+        min_replicates=2,
+        max_replicates=8,
+        workers=1,
+        max_steps=5,
+    )
+
+    assert search["best"]["robot_counts"]["MaintenanceRobot"] == 1
+    assert search["total_replicates"] == 4
+    statuses = [candidate["status"] for candidate in search["candidates"]]
+    assert statuses == [OVER_PROVISIONED, PASSING]
+
+
+def test_search_reports_no_fleet_when_all_fail(layout_path):
+    config_params = {"CREW_SIZE": 3, "ROBOT_COUNTS": {}}
+    candidates = [{"MaintenanceRobot": 2}, {"MaintenanceRobot": 1}]
+
+    search = search_minimum_fleet(
+        config_params,
+        layout_path,
+        candidates,
+        target_rate=0.9,
+        min_replicates=2,
+        max_replicates=4,
+        workers=1,
+        max_steps=3,
+    )
+
+    # Nothing terminates within 3 steps, so no replicate is a SUCCESS
+    assert search["best"] is None
+    assert all(candidate["status"] == FAILING for candidate in search["candidates"])
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.rounds = 0
+
+    def map(self, *args, **kwargs):
+        self.rounds += 1
+        return super().map(*args, **kwargs)
+
+
+def test_search_reuses_caller_executor_across_rounds(layout_path):
+    config_params = {"CREW_SIZE": 3, "ROBOT_COUNTS": {}}
+    candidates = [{"MaintenanceRobot": 2}, {"MaintenanceRobot": 1}]
+    options = dict(
+        target_rate=0.5, min_replicates=2, max_replicates=4, max_steps=3
+    )
+
+    with CountingExecutor() as executor:
+        search = search_minimum_fleet(
+            config_params, layout_path, candidates, executor=executor, **options
+        )
+        # The search leaves the caller's executor open
+        assert executor.submit(sum, [1, 2]).result() == 3
+
+    assert executor.rounds == 2
+    assert search == search_minimum_fleet(
+        config_params, layout_path, candidates, workers=1, **options
+    )
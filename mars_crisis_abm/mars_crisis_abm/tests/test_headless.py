@@ -0,0 +1,45 @@
+import json
+import os
+import subprocess
+import sys
+
+import mars_crisis_abm
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(mars_crisis_abm.__file__))
+PROJECT_ROOT = os.path.dirname(PACKAGE_DIR)
+
+VISUALIZATION_MODULES = ("mesa.visualization", "mars_crisis_abm.visualization")
+
+PROBE = f"""
+import json, sys
+import mars_crisis_abm.batch
+print(json.dumps([name for name in {VISUALIZATION_MODULES!r} if name in sys.modules]))
+"""
+
+
+def test_headless_import_skips_visualization():
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert json.loads(completed.stdout.strip().splitlines()[-1]) == []
+
+
+def test_only_the_visualization_module_touches_mesa_visualization():
+    # app.py reaches mesa.visualization through mars_crisis_abm.visualization
+    for directory, _, files in os.walk(PACKAGE_DIR):
+        if os.path.basename(directory) == "tests":
+            continue
+        for name in files:
+            if not name.endswith(".py") or name == "visualization.py":
+                continue
+            with open(os.path.join(directory, name)) as f:
+                source = f.read()
+            assert "mesa.visualization" not in source, name
+            assert "mesa.experimental" not in source, name
+            assert "import visualization" not in source, name
+            assert ".visualization import" not in source, name
@@ -0,0 +1,123 @@
+import pytest
+from mars_crisis_abm.model import MarsModel
+from mars_crisis_abm.metrics import compute_step_metrics
+from mars_crisis_abm.agents import (
+    Human,
+    CentralCommunicationsSystem,
+    BatteryPack,
+    HazardousMaterialsStorage,
+    HabitatWall,
+    ExternalWall,
+    PowerWall,
+)
+
+
+@pytest.fixture
+def model():
+    grid_data = [
+        ["outdoors", "outdoors", "outdoors"],
+        ["outdoors", "habitat", "outdoors"],
+        ["outdoors", "outdoors", "outdoors"],
+    ]
+
+    model = MarsModel(
+        config_params={
+            "ROBOT_COUNTS": {},
+            "CREW_SIZE": 1,
+        },
+        grid_data=grid_data,
+        equipment_positions=[],
+    )
+
+    for agent in list(model.agents):
+        agent.remove()
+
+    CentralCommunicationsSystem(model, 90)
+    HazardousMaterialsStorage(model, 70)
+    Human(model, 100)
+    Human(model, 20)
+    Human(model, 0)
+
+    yield model
+
+
+def test_compute_step_metrics_counts(model):
+    BatteryPack(model, 60)
+    PowerWall(model, 100)
+    HabitatWall(model, 75)
+    ExternalWall(model, 90)
+
+    metrics = compute_step_metrics(model)
+
+    assert metrics["communications_integrity"] == 90
+    assert metrics["power_components"] == 2
+    assert metrics["power_integrity_total"] == 160
+    assert metrics["damaged_habitat_walls"] == 1
+    assert metrics["wall_damage_total"] == 25
+    assert metrics["contamination_total"] == 30
+    assert metrics["alive_humans"] == 2
+    assert metrics["critical_humans"] == 1
+    assert metrics["damaged_walls"] == 1
+    assert metrics["damaged_power_walls"] == 0
+    assert metrics["damaged_equipment"] == 2
+
+
+def test_compute_step_metrics_fires(model):
+    battery = BatteryPack(model, 60)
+    battery.fire_intensity = 40
+
+    metrics = compute_step_metrics(model)
+
+    assert metrics["active_fires"] == 1
+    assert metrics["fire_strength_total"] == 40
+
+
+def test_update_system_status_shares_metrics(model):
+    model._update_system_status()
+
+    assert model.metrics == compute_step_metrics(model)
+    assert model.communications_online is True
+    assert model.contamination_level == pytest.approx(30 / 6)
+
+
+def test_datacollector_columns(model):
+    model.step()
+
+    df = model.datacollector.get_model_vars_dataframe()
+    assert list(df.columns) == [
+        "Atmospheric Condition",
+        "Power Level",
+        "Dead Humans",
+        "Critical Humans",
+        "Contamination Level",
+        "Damaged Walls",
+        "Damaged Power Walls",
+        "Damaged Equipment",
+        "Active Fires",
+        "Recharging Robots",
+        "Working Robots",
+        "Idle Robots",
+        "Searching Robots",
+    ]
+    assert df["Critical Humans"].iloc[-1] == model.metrics["critical_humans"]
+    assert model.datacollector.latest("Critical Humans") == df["Critical Humans"].iloc[-1]
+
+
+def test_metrics_history_bounds_collected_rows():
+    grid_data = [
+        ["outdoors", "habitat", "outdoors"],
+        ["outdoors", "habitat", "outdoors"],
+    ]
+    model = MarsModel(
+        config_params={"ROBOT_COUNTS": {}, "CREW_SIZE": 1},
+        grid_data=grid_data,
+        equipment_positions=[],
+        metrics_history=2,
+    )
+
+    for _ in range(5):
+        model.step()
+
+    df = model.datacollector.get_model_vars_dataframe()
+    assert len(df) == 2
+    assert df.index.tolist() == [3, 4]
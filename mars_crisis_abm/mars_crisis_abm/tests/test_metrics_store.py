@@ -0,0 +1,193 @@
+import numpy as np
+import pandas as pd
+import pytest
+from mars_crisis_abm.metrics_store import (
+    ColumnStore,
+    EveryKSteps,
+    FinalOnly,
+    MetricsCollector,
+    OnChange,
+    TieredStore,
+)
+
+
+def test_column_store_appends_and_grows():
+    store = ColumnStore(["a", "b"])
+
+    for i in range(200):
+        store.append({"a": i, "b": i / 2})
+
+    assert len(store) == 200
+    assert store.latest() == {"a": 199, "b": 99.5}
+    assert store.latest("a") == 199
+    assert store.column("a").dtype == np.int64
+    assert store.column("a").tolist() == list(range(200))
+
+
+def test_column_store_promotes_integer_columns():
+    store = ColumnStore(["a"])
+
+    store.append({"a": 1})
+    store.append({"a": 2.5})
+    store.append({"a": None})
+
+    values = store.column("a")
+    assert values.dtype == np.float64
+    assert values[:2].tolist() == [1.0, 2.5]
+    assert np.isnan(values[2])
+
+
+def test_column_store_ring_buffer():
+    store = ColumnStore(["a"], max_rows=4)
+
+    for i in range(10):
+        store.append({"a": i})
+
+    assert len(store) == 4
+    assert store.total_rows == 10
+    assert store.column("a").tolist() == [6, 7, 8, 9]
+
+    df = store.to_dataframe()
+    assert df.index.tolist() == [6, 7, 8, 9]
+    assert df["a"].tolist() == [6, 7, 8, 9]
+
+
+def test_column_store_latest_requires_rows():
+    with pytest.raises(IndexError):
+        ColumnStore(["a"]).latest()
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+        self.metrics = {"double": 0}
+
+
+def test_metrics_collector_matches_mesa_reporters():
+    model = Counter()
+    collector = MetricsCollector(
+        {
+            "Value": "value",
+            "Double": lambda m: m.metrics["double"],
+            "Constant": [lambda x: x, [3]],
+        }
+    )
+
+    for i in range(5):
+        model.value = i
+        model.metrics["double"] = 2 * i
+        collector.collect(model)
+
+    expected = pd.DataFrame(
+        {"Value": range(5), "Double": range(0, 10, 2), "Constant": [3] * 5}
+    )
+    pd.testing.assert_frame_equal(collector.get_model_vars_dataframe(), expected)
+    assert collector.latest() == {"Value": 4, "Double": 8, "Constant": 3}
+    assert collector.model_vars["Double"] == [0, 2, 4, 6, 8]
+
+
+def test_metrics_collector_dataframe_is_cached_until_collect():
+    model = Counter()
+    collector = MetricsCollector({"Value": "value"})
+    collector.collect(model)
+
+    first = collector.get_model_vars_dataframe()
+    first.loc[0, "Value"] = 100
+    assert collector.get_model_vars_dataframe()["Value"].tolist() == [0]
+
+    model.value = 1
+    collector.collect(model)
+    assert collector.get_model_vars_dataframe()["Value"].tolist() == [0, 1]
+
+
+class SteppedModel(Counter):
+    def __init__(self):
+        super().__init__()
+        self.steps = 0
+
+    def advance(self, value):
+        self.steps += 1
+        self.value = value
+
+
+def run(collector, values):
+    model = SteppedModel()
+    for value in values:
+        model.advance(value)
+        collector.step(model)
+    collector.finalize(model)
+    return collector.get_model_vars_dataframe()
+
+
+def test_every_k_steps_policy():
+    collector = MetricsCollector({"Value": "value"}, policy=EveryKSteps(3))
+
+    df = run(collector, range(10))
+
+    # Steps 3, 6, 9 plus the final step 10, indexed by step - 1
+    assert df.index.tolist() == [2, 5, 8, 9]
+    assert df["Value"].tolist() == [2, 5, 8, 9]
+
+
+def test_on_change_policy():
+    collector = MetricsCollector({"Value": "value"}, policy=OnChange())
+
+    df = run(collector, [1, 1, 1, 2, 2, 3, 3])
+
+    assert df.index.tolist() == [0, 3, 5, 6]
+    assert df["Value"].tolist() == [1, 2, 3, 3]
+
+
+def test_on_change_ignores_the_step_counter():
+    collector = MetricsCollector(
+        {"Step": "steps", "Value": "value"}, policy=OnChange()
+    )
+
+    # Flat for five steps, then one change
+    df = run(collector, [4, 4, 4, 4, 4, 7])
+
+    assert df.index.tolist() == [0, 5]
+    assert df["Step"].tolist() == [1, 6]
+    assert df["Value"].tolist() == [4, 7]
+
+
+def test_final_only_policy():
+    collector = MetricsCollector({"Value": "value"}, policy=FinalOnly())
+
+    df = run(collector, range(50))
+
+    assert df.index.tolist() == [49]
+    assert collector.latest("Value") == 49
+
+
+def test_finalize_is_idempotent():
+    collector = MetricsCollector({"Value": "value"})
+    model = SteppedModel()
+    model.advance(1)
+    collector.step(model)
+
+    collector.finalize(model)
+    collector.finalize(model)
+
+    assert len(collector) == 1
+
+
+def test_tiered_store_decimates_older_rows():
+    store = TieredStore(["a"], [(5, 1), (3, 10), (None, 100)])
+
+    for i in range(1000):
+        store.append({"a": i})
+
+    assert store.column("a")[-5:].tolist() == [995, 996, 997, 998, 999]
+    assert store.column("a").tolist() == (
+        list(range(0, 1000, 100)) + [970, 980, 990] + list(range(995, 1000))
+    )
+    assert store.latest("a") == 999
+
+    df = store.to_dataframe()
+    assert df.index.tolist() == df["a"].tolist()
+
+
+def test_tiered_store_rejects_unbounded_inner_tier():
+    with pytest.raises(ValueError):
+        TieredStore(["a"], [(None, 1), (10, 10)])
@@ -1,6 +1,8 @@
 import pytest
 from mars_crisis_abm.model import MarsModel
 from mars_crisis_abm.agents import (
+    Robot,
+    ComplexStructure,
     Human,
     CentralCommunicationsSystem,
     BatteryPack,
@@ -205,3 +207,53 @@ def test_get_zones_by_type_external(model_with_zones):
     )
     expected_zones = [ZoneCode.OUTDOORS.value]
     assert sorted(external_zones) == sorted(expected_zones)
+
+
+def test_agents_of_concrete_and_abstract_classes(model_with_walls):
+    power_walls = model_with_walls.agents_of(PowerWall)
+    structures = model_with_walls.agents_of(ComplexStructure)
+
+    assert all(isinstance(agent, PowerWall) for agent in power_walls)
+    assert len(power_walls) == len(
+        [agent for agent in model_with_walls.agents if isinstance(agent, PowerWall)]
+    )
+    assert len(structures) == len(
+        [
+            agent
+            for agent in model_with_walls.agents
+            if isinstance(agent, ComplexStructure)
+        ]
+    )
+
+
+def test_agents_of_is_live_view(model):
+    batteries = model.agents_of(BatteryPack)
+    assert len(batteries) == 1
+
+    new_battery = BatteryPack(model, 50)
+    assert new_battery in batteries
+    assert new_battery in model.agents_of(ComplexStructure)
+
+    new_battery.remove()
+    assert new_battery not in batteries
+    assert new_battery not in model.agents_of(ComplexStructure)
+
+
+def test_agents_of_unregistered_class_is_empty(model):
+    assert len(model.agents_of(Robot)) == 0
+
+
+def test_neighborhoods_built_after_setup(model_with_zones):
+    assert model_with_zones.neighborhoods is not None
+
+
+def test_neighborhoods_rebuilt_after_structure_changes(model):
+    battery = next(iter(model.agents_of(BatteryPack)))
+    model.grid.place_agent(battery, (1, 1))
+    wall = PowerWall(model, 100)
+    model.grid.place_agent(wall, (0, 0))
+    assert model.neighborhoods is None
+
+    model.step()
+
+    assert model.neighborhoods.get(wall, 1) == [battery]
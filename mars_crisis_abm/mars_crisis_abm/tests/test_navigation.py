@@ -0,0 +1,218 @@
+import os
+import pickle
+from collections import deque
+
+import numpy as np
+import pytest
+from mars_crisis_abm.blueprint import build_zone_table
+from mars_crisis_abm.utils import (
+    UNREACHABLE,
+    NavigationFields,
+    OperatingEnvironment,
+    ZoneIndex,
+    parse_grid_layout_csv,
+)
+from mars_crisis_abm.utils.navigation import MOORE_MOVES
+
+LAYOUT_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "config", "grid_layout.csv"
+)
+
+
+@pytest.fixture
+def grid_data():
+    return [
+        ["outdoors", "outdoors", "outdoors", "outdoors", "outdoors"],
+        ["outdoors", "habitat_wall", "habitat_wall", "habitat_wall", "outdoors"],
+        ["outdoors", "airlock", "habitat", "habitat_wall", "outdoors"],
+        ["outdoors", "habitat_wall", "medical_bay", "habitat_wall", "deposit"],
+    ]
+
+
+@pytest.fixture
+def zone_index(grid_data):
+    return ZoneIndex.from_grid(grid_data, build_zone_table(grid_data))
+
+
+def reference_distances(passable, targets):
+    # Plain BFS over (x, y) cells
+    width, height = passable.shape
+    distance = np.full((width, height), UNREACHABLE)
+    queue = deque()
+    for x, y in zip(*np.nonzero(targets & passable)):
+        distance[x, y] = 0
+        queue.append((x, y))
+    while queue:
+        x, y = queue.popleft()
+        for dx, dy in MOORE_MOVES:
+            nx, ny = x + dx, y + dy
+            if (
+                0 <= nx < width
+                and 0 <= ny < height
+                and passable[nx, ny]
+                and distance[nx, ny] == UNREACHABLE
+            ):
+                distance[nx, ny] = distance[x, y] + 1
+                queue.append((nx, ny))
+    return distance
+
+
+def test_walls_are_never_passable(zone_index):
+    fields = NavigationFields(zone_index)
+
+    walls = zone_index.zone_mask(["habitat_wall"])
+    for environment in OperatingEnvironment:
+        assert not (fields.passable(environment) & walls).any()
+    assert fields.passable(OperatingEnvironment.EXTERNAL)[0, 2]
+    assert not fields.passable(OperatingEnvironment.EXTERNAL)[2, 2]
+
+
+def test_distances_follow_environment(zone_index):
+    fields = NavigationFields(zone_index)
+    mixed = OperatingEnvironment.MIXED
+
+    # Mixed robots reach the medical bay through the airlock
+    assert fields.distance((0, 0), "medical_bay", mixed) == 3
+    assert fields.distance((2, 3), "medical_bay", mixed) == 0
+    # External robots cannot get inside at all
+    external = OperatingEnvironment.EXTERNAL
+    assert fields.distance((0, 0), "medical_bay", external) == UNREACHABLE
+    assert fields.next_step((0, 0), "medical_bay", external) is None
+
+
+def test_next_step_descends_to_destination(zone_index):
+    fields = NavigationFields(zone_index)
+    mixed = OperatingEnvironment.MIXED
+
+    pos = (0, 0)
+    while fields.distance(pos, "medical_bay", mixed) > 0:
+        nxt = fields.next_step(pos, "medical_bay", mixed)
+        assert max(abs(nxt[0] - pos[0]), abs(nxt[1] - pos[1])) == 1
+        assert fields.distance(nxt, "medical_bay", mixed) == (
+            fields.distance(pos, "medical_bay", mixed) - 1
+        )
+        pos = nxt
+    assert zone_index.zone_at(pos) == "medical_bay"
+    assert fields.next_step(pos, "medical_bay", mixed) == pos
+
+
+def test_layout_fields_match_reference_bfs():
+    grid_data, _ = parse_grid_layout_csv(LAYOUT_PATH)
+    zone_index = ZoneIndex.from_grid(grid_data, build_zone_table(grid_data))
+    fields = NavigationFields(zone_index)
+
+    destinations = ["deposit", ("deposit", "power_distribution"), "medical_bay"]
+    for destination in destinations:
+        codes = (destination,) if isinstance(destination, str) else destination
+        for environment in OperatingEnvironment:
+            expected = reference_distances(
+                fields.passable(environment), zone_index.zone_mask(codes)
+            )
+            np.testing.assert_array_equal(
+                fields.distance_field(destination, environment), expected
+            )
+    assert len(fields) == len(destinations) * len(OperatingEnvironment)
+
+
+def test_fields_are_memoized_per_layout(zone_index, grid_data):
+    fields = NavigationFields.for_layout(zone_index)
+    same_layout = ZoneIndex.from_grid(grid_data, build_zone_table(grid_data))
+
+    assert NavigationFields.for_layout(zone_index) is fields
+    assert NavigationFields.for_layout(same_layout) is fields
+
+    field = fields.distance_field("deposit", OperatingEnvironment.MIXED)
+    assert fields.distance_field("deposit", OperatingEnvironment.MIXED) is field
+
+
+def test_overlay_borrows_until_first_change(zone_index):
+    shared = NavigationFields(zone_index)
+    overlay = shared.overlay()
+    mixed = OperatingEnvironment.MIXED
+
+    field = shared.distance_field("medical_bay", mixed)
+    assert overlay.distance_field("medical_bay", mixed) is field
+
+    overlay.set_cell((1, 2), blocked=True)
+    assert overlay.distance_field("medical_bay", mixed) is not field
+    # The shared fields never see an overlay's changes
+    assert shared.distance((0, 0), "medical_bay", mixed) == 3
+    assert shared.passable(mixed)[1, 2]
+    assert overlay.distance((0, 0), "medical_bay", mixed) == UNREACHABLE
+
+
+def test_breached_wall_opens_a_shortcut(zone_index):
+    fields = NavigationFields(zone_index).overlay()
+    mixed = OperatingEnvironment.MIXED
+    assert fields.distance((2, 0), "medical_bay", mixed) == 4
+
+    fields.set_cell((2, 1), opened=True)
+    assert fields.distance((2, 0), "medical_bay", mixed) == 3
+    assert fields.next_step((2, 0), "medical_bay", mixed) == (2, 1)
+
+    fields.set_cell((2, 1), opened=True, blocked=True)
+    assert fields.distance((2, 0), "medical_bay", mixed) == 4
+
+
+def test_incremental_repair_matches_rebuild():
+    grid_data, _ = parse_grid_layout_csv(LAYOUT_PATH)
+    zone_index = ZoneIndex.from_grid(grid_data, build_zone_table(grid_data))
+    fields = NavigationFields(zone_index).overlay()
+    destinations = ["deposit", "medical_bay", ("airlock",)]
+    environments = [OperatingEnvironment.INTERNAL, OperatingEnvironment.MIXED]
+    for destination in destinations:
+        for environment in environments:
+            fields.distance_field(destination, environment)
+
+    rng = np.random.default_rng(7)
+    overrides = {}
+    for _ in range(120):
+        pos = (
+            int(rng.integers(zone_index.width)),
+            int(rng.integers(zone_index.height)),
+        )
+        state = {
+            "opened": bool(rng.random() < 0.4),
+            "blocked": bool(rng.random() < 0.5),
+        }
+        fields.set_cell(pos, **state)
+        overrides[pos] = state
+
+    rebuilt = NavigationFields(zone_index)
+    for pos, state in overrides.items():
+        rebuilt.set_cell(pos, **state)
+    for destination in destinations:
+        for environment in environments:
+            np.testing.assert_array_equal(
+                fields.passable(environment), rebuilt.passable(environment)
+            )
+            for index in (0, 1):
+                np.testing.assert_array_equal(
+                    fields._field(destination, environment)[index],
+                    rebuilt._field(destination, environment)[index],
+                )
+
+
+def test_pickled_overlay_borrows_layout_fields_again(zone_index):
+    shared = NavigationFields.for_layout(zone_index)
+    overlay = shared.overlay()
+    mixed, external = OperatingEnvironment.MIXED, OperatingEnvironment.EXTERNAL
+    overlay.distance_field("medical_bay", mixed)
+    overlay.distance_field("deposit", external)
+    overlay.set_cell((2, 2), blocked=True)
+
+    restored = pickle.loads(pickle.dumps(overlay))
+
+    assert restored._base is shared
+    # Outdoor robots never enter the blocked cell, so that field stays borrowed
+    assert restored.distance_field("deposit", external) is shared.distance_field(
+        "deposit", external
+    )
+    np.testing.assert_array_equal(
+        restored.distance_field("medical_bay", mixed),
+        overlay.distance_field("medical_bay", mixed),
+    )
+    restored.set_cell((2, 2))
+    assert restored.distance((0, 0), "medical_bay", mixed) == shared.distance(
+        (0, 0), "medical_bay", mixed
+    )
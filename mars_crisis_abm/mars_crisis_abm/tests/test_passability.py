@@ -0,0 +1,111 @@
+import pytest
+from mars_crisis_abm.agents import BatteryPack, ExternalWall, HabitatWall
+from mars_crisis_abm.model import MarsModel
+from mars_crisis_abm.utils import UNREACHABLE, OperatingEnvironment
+
+
+@pytest.fixture
+def model():
+    grid_data = [
+        ["outdoors", "outdoors", "outdoors"],
+        ["habitat_wall", "habitat_wall", "habitat_wall"],
+        ["corridor", "corridor", "corridor"],
+        ["deposit", "corridor", "corridor"],
+    ]
+    config_params = {"CREW_SIZE": 0, "ROBOT_COUNTS": {}}
+    model = MarsModel(config_params, grid_data, [], seed=1)
+    for agent in list(model.agents):
+        agent.remove()
+    return model
+
+
+def place(model, structure, pos):
+    model.grid.place_agent(structure, pos)
+    model.passability.sync([structure])
+    return structure
+
+
+def test_fire_blocks_and_reopens_a_cell(model):
+    internal = OperatingEnvironment.INTERNAL
+    assert model.navigation.distance((2, 2), "deposit", internal) == 2
+
+    battery = place(model, BatteryPack(model, 60), (1, 3))
+    battery.fire_intensity = 10
+    assert model.passability.is_blocked((1, 3))
+    assert model.navigation.distance((2, 2), "deposit", internal) == 2
+    assert model.navigation.next_step((2, 2), "deposit", internal) == (1, 2)
+
+    place(model, BatteryPack(model, 60), (1, 2)).fire_intensity = 10
+    assert model.navigation.distance((2, 2), "deposit", internal) == UNREACHABLE
+
+    battery.fire_intensity = 0
+    assert not model.passability.is_blocked((1, 3))
+    assert model.navigation.distance((2, 2), "deposit", internal) == 2
+
+
+def test_breached_wall_opens_until_removed(model):
+    mixed = OperatingEnvironment.MIXED
+    assert model.navigation.distance((1, 0), "corridor", mixed) == UNREACHABLE
+
+    wall = place(model, HabitatWall(model, 100), (1, 1))
+    wall.integrity = 0
+    assert model.passability.is_breached((1, 1))
+    assert model.navigation.distance((1, 0), "corridor", mixed) == 2
+
+    wall.remove()
+    assert not model.passability.is_breached((1, 1))
+    assert model.navigation.distance((1, 0), "corridor", mixed) == UNREACHABLE
+
+
+def test_wall_cell_opens_once_every_wall_is_breached(model):
+    mixed = OperatingEnvironment.MIXED
+    inner = place(model, HabitatWall(model, 100), (1, 1))
+    outer = place(model, ExternalWall(model, 100), (1, 1))
+
+    inner.integrity = 0
+    assert not model.passability.is_breached((1, 1))
+    assert model.navigation.distance((1, 0), "corridor", mixed) == UNREACHABLE
+
+    outer.integrity = 0
+    assert model.passability.is_breached((1, 1))
+    assert model.navigation.distance((1, 0), "corridor", mixed) == 2
+
+    inner.integrity = 50
+    assert model.navigation.distance((1, 0), "corridor", mixed) == UNREACHABLE
+
+    inner.remove()
+    assert model.navigation.distance((1, 0), "corridor", mixed) == 2
+
+
+def test_sync_counts_every_wall_of_a_cell(model):
+    mixed = OperatingEnvironment.MIXED
+    inner, outer = HabitatWall(model, 0), ExternalWall(model, 100)
+    for wall in (inner, outer):
+        model.grid.place_agent(wall, (1, 1))
+    model.passability.sync([inner, outer])
+
+    assert not model.passability.is_breached((1, 1))
+    assert model.navigation.distance((1, 0), "corridor", mixed) == UNREACHABLE
+
+
+def test_structures_created_after_construction_are_tracked(model):
+    mixed = OperatingEnvironment.MIXED
+    internal = OperatingEnvironment.INTERNAL
+
+    # Breached and burning before they are ever placed
+    wall = HabitatWall(model, 0)
+    battery = BatteryPack(model, 60)
+    battery.fire_intensity = 10
+    model.grid.place_agent(wall, (1, 1))
+    model.grid.place_agent(battery, (1, 3))
+    model._refresh_indexes()
+
+    assert model.passability.is_breached((1, 1))
+    assert model.navigation.distance((1, 0), "corridor", mixed) == 2
+    assert model.passability.is_blocked((1, 3))
+    assert model.navigation.next_step((2, 2), "deposit", internal) == (1, 2)
+
+    late = BatteryPack(model, 60)
+    late.remove()
+    model._refresh_indexes()
+    assert not model.passability._pending
@@ -0,0 +1,106 @@
+import random
+
+import mesa
+import pytest
+from mars_crisis_abm.model import MarsModel
+from mars_crisis_abm.utils import load_config, load_grid_layout_csv
+
+CONFIG_PATH = "config/params.json"
+LAYOUT_PATH = "config/grid_layout.csv"
+
+
+class Scout(mesa.Agent):
+    def step(self):
+        self.model.grid.get_neighbors(self.pos, moore=True, radius=1)
+
+
+@pytest.fixture
+def model():
+    grid_data = [["habitat", "habitat"], ["corridor", "corridor"]]
+    config_params = {"CREW_SIZE": 0, "ROBOT_COUNTS": {}}
+    model = MarsModel(config_params, grid_data, [], seed=1)
+    for agent in list(model.agents):
+        agent.remove()
+    for pos in [(0, 0), (1, 1)]:
+        scout = Scout(model)
+        model.grid.place_agent(scout, pos)
+        model.schedule.add(scout)
+    return model
+
+
+def test_disabled_by_default(model):
+    assert model.profiler is None
+    model.step()
+    assert model.disable_profiling() is None
+
+
+def test_phases_agent_classes_and_helper_calls(model):
+    profiler = model.enable_profiling()
+    model.step()
+    model.step()
+
+    for label, _ in MarsModel.STEP_PHASES:
+        assert label in profiler.totals
+    assert profiler.totals["agent:Scout"] <= profiler.totals["agents"]
+    assert profiler.agent_steps["agent:Scout"] == 4
+    assert profiler.calls["grid.get_neighbors"] == 4
+    assert profiler.history[-1]["grid.get_neighbors"] == 2
+    assert profiler.steps == len(profiler.history) == 2
+    assert model.schedule.steps == 2
+    assert "agent:Scout" in profiler.report()
+
+    # Counters only wrap helpers during profiled steps
+    assert "get_neighbors" not in vars(model.grid)
+    assert model.disable_profiling() is profiler
+    model.step()
+    assert profiler.steps == 2
+
+
+def test_profiling_does_not_change_the_run():
+    config_params = load_config(CONFIG_PATH)
+
+    def run(profile):
+        random.seed(3)
+        grid_data, equipment_positions = load_grid_layout_csv(
+            LAYOUT_PATH, rng=random.Random(3)
+        )
+        model = MarsModel(
+            config_params, grid_data, equipment_positions, seed=3, profile=profile
+        )
+        for _ in range(5):
+            model.step()
+        return model.datacollector.get_model_vars_dataframe()
+
+    assert run(True).equals(run(False))
+
+
+class Ranger(Scout):
+    def step(self):
+        super().step()
+
+
+def test_agent_steps_are_wrapped_once(model):
+    ranger = Ranger(model)
+    model.grid.place_agent(ranger, (1, 0))
+    model.schedule.add(ranger)
+    profiler = model.enable_profiling()
+    wrapped = Scout.step
+    model.disable_profiling()
+    other = model.enable_profiling()
+
+    assert Scout.step is wrapped and other is not profiler
+    model.step()
+
+    # The nested super().step() is part of Ranger's time, not a Scout step
+    assert other.agent_steps == {"agent:Scout": 2, "agent:Ranger": 1}
+    assert other.calls["grid.get_neighbors"] == 3
+    assert profiler.steps == 0
+
+
+def test_unprofiled_models_record_nothing(model):
+    profiled = model.fork()
+    profiler = profiled.enable_profiling()
+
+    model.step()
+
+    assert profiler.totals == {} and profiler.calls == {}
@@ -0,0 +1,121 @@
+import os
+import random
+import tempfile
+
+import pytest
+from mars_crisis_abm.model import MarsModel
+from mars_crisis_abm.agents import Human
+from mars_crisis_abm.utils import load_grid_layout_csv
+
+
+@pytest.fixture
+def model():
+    csv_content = """;;;;;T;T;T
+;A;H;H;M;M;T;T
+;A;H;H;M;C;T;T
+;C;C;1;C;C;C;C
+;L;L;C;R;D;D;
+;L;L;2;R;D;C;
+;;;;;3;D;"""
+
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+        f.write(csv_content)
+        temp_path = f.name
+
+    grid_data, equipment_positions = load_grid_layout_csv(temp_path)
+    os.unlink(temp_path)
+
+    model = MarsModel(
+        {"CREW_SIZE": 3, "ROBOT_COUNTS": {"MaintenanceRobot": 2, "BioLabRobot": 1}},
+        grid_data,
+        equipment_positions,
+        seed=5,
+    )
+    yield model
+
+
+def agent_state(model):
+    return [
+        (type(agent).__name__, agent.unique_id, agent.pos)
+        for agent in model.schedule.agents
+    ]
+
+
+def test_restored_snapshot_continues_identically(model):
+    for _ in range(3):
+        model.step()
+
+    snapshot = model.snapshot()
+    assert snapshot.steps == 3
+
+    for _ in range(5):
+        model.step()
+    expected = model.datacollector.get_model_vars_dataframe()
+
+    restored = MarsModel.restore(snapshot)
+    assert len(restored.datacollector.get_model_vars_dataframe()) == 3
+    for _ in range(5):
+        restored.step()
+
+    assert restored.steps == model.steps
+    assert restored.datacollector.get_model_vars_dataframe().equals(expected)
+    assert agent_state(restored) == agent_state(model)
+    assert restored.mission_status == model.mission_status
+
+
+def test_snapshot_restores_many_times(model):
+    model.step()
+    snapshot = model.snapshot()
+
+    first = MarsModel.restore(snapshot)
+    second = MarsModel.restore(snapshot)
+
+    assert first is not second
+    assert agent_state(first) == agent_state(second) == agent_state(model)
+
+
+def test_fork_is_independent(model):
+    model.step()
+    fork = model.fork(seed=11)
+
+    fork.step()
+
+    assert model.steps == 1
+    assert fork.steps == 2
+    assert len(model.datacollector.get_model_vars_dataframe()) == 1
+    assert fork.grid is not model.grid
+    assert fork.zones == model.zones
+
+
+def test_restored_model_keeps_indexes(model):
+    model.step()
+
+    restored = model.fork()
+
+    assert len(restored.agents_of(Human)) == len(model.agents_of(Human))
+    assert restored.aggregates.totals() == model.aggregates.totals()
+    for structure in restored.aggregates._contributions:
+        assert structure.model is restored
+
+
+def test_fork_leaves_global_random_alone(model):
+    model.step()
+    random.seed(3)
+    expected = random.random()
+    random.seed(3)
+
+    fork = model.fork(seed=11)
+    fork.step()
+    model.snapshot()
+
+    assert random.random() == expected
+
+
+def test_restored_model_shares_layout_structures(model):
+    model.step()
+
+    restored = model.fork()
+
+    assert restored.zone_graph is model.zone_graph
+    assert restored.navigation is not model.navigation
+    assert restored.navigation._base is model.navigation._base
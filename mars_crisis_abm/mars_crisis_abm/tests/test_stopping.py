@@ -0,0 +1,137 @@
+import os
+import tempfile
+
+import pytest
+from mars_crisis_abm.__main__ import parse_args
+from mars_crisis_abm.batch import run_sequential
+from mars_crisis_abm.stopping import (
+    FAIL,
+    PASS,
+    PRECISE,
+    ConfidenceIntervalRule,
+    SequentialProbabilityRatioTest,
+)
+
+
+@pytest.fixture
+def layout_path():
+    csv_content = """;;;;;T;T;T
+;A;H;H;M;M;T;T
+;A;H;H;M;C;T;T
+;C;C;1;C;C;C;C
+;L;L;C;R;D;D;
+;L;L;2;R;D;C;
+;;;;;3;D;"""
+
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+        f.write(csv_content)
+        temp_path = f.name
+
+    yield temp_path
+
+    os.unlink(temp_path)
+
+
+class StopAfter:
+    def __init__(self, trials):
+        self.trials = trials
+
+    def decide(self, successes, trials):
+        return FAIL if trials >= self.trials else None
+
+
+def test_sprt_decides_clear_outcomes():
+    rule = SequentialProbabilityRatioTest(0.9, indifference=0.05)
+
+    assert rule.decide(3, 3) is None
+    assert rule.decide(0, 3) == FAIL
+    assert rule.decide(60, 60) == PASS
+
+
+def test_sprt_rejects_degenerate_hypotheses():
+    with pytest.raises(ValueError):
+        SequentialProbabilityRatioTest(0.99, indifference=0.05)
+
+
+def test_confidence_interval_rule():
+    rule = ConfidenceIntervalRule(target_rate=0.5, min_replicates=5)
+
+    assert rule.decide(0, 4) is None
+    assert rule.decide(20, 20) == PASS
+    assert rule.decide(0, 20) == FAIL
+    assert rule.decide(10, 20) is None
+
+
+def test_confidence_interval_rule_half_width():
+    rule = ConfidenceIntervalRule(half_width=0.1, min_replicates=1)
+
+    assert rule.decide(5, 10) is None
+    assert rule.decide(50, 100) == PRECISE
+
+    with pytest.raises(ValueError):
+        ConfidenceIntervalRule()
+
+
+def test_run_sequential_stops_at_decision(layout_path):
+    config_params = {"CREW_SIZE": 3, "ROBOT_COUNTS": {"MaintenanceRobot": 1}}
+
+    serial = run_sequential(
+        config_params,
+        layout_path,
+        StopAfter(3),
+        workers=1,
+        max_replicates=10,
+        max_steps=5,
+    )
+    parallel = run_sequential(
+        config_params,
+        layout_path,
+        StopAfter(3),
+        workers=2,
+        max_replicates=10,
+        max_steps=5,
+    )
+
+    assert serial["decision"] == FAIL
+    assert serial["replicates"] == 3
+    assert serial["launched"] == 3
+    assert parallel["replicates"] == 3
+    assert parallel["launched"] == 4
+    assert parallel["results"] == serial["results"]
+
+
+def test_run_sequential_reports_undecided_at_cap(layout_path):
+    config_params = {"CREW_SIZE": 3, "ROBOT_COUNTS": {}}
+
+    outcome = run_sequential(
+        config_params,
+        layout_path,
+        StopAfter(100),
+        workers=1,
+        max_replicates=2,
+        max_steps=2,
+    )
+
+    assert outcome["decision"] is None
+    assert outcome["replicates"] == 2
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--stop-rule", "sprt", "--target-success", "0.98"],
+        ["--stop-rule", "ci", "--target-success", "1.5"],
+    ],
+)
+def test_cli_rejects_unreachable_target(argv, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        parse_args(argv)
+
+    assert exit_info.value.code == 2
+    assert "--target-success" in capsys.readouterr().err
+
+
+def test_cli_accepts_sprt_target():
+    args = parse_args(["--stop-rule", "sprt", "--target-success", "0.9"])
+
+    assert args.target_success == 0.9
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+from mars_crisis_abm.model import MarsModel
+from mars_crisis_abm.metrics import compute_structure_totals
+from mars_crisis_abm.agents import (
+    CentralCommunicationsSystem,
+    BatteryPack,
+    HabitatWall,
+    PowerWall,
+)
+
+
+@pytest.fixture
+def model():
+    grid_data = [
+        ["habitat_wall", "habitat_wall", "outdoors"],
+        ["habitat_wall", "habitat", "power_wall"],
+        ["outdoors", "outdoors", "outdoors"],
+    ]
+
+    model = MarsModel(
+        config_params={
+            "ROBOT_COUNTS": {},
+            "CREW_SIZE": 1,
+        },
+        grid_data=grid_data,
+        equipment_positions=[],
+        debug_aggregates=True,
+        structure_storage="array",
+    )
+    CentralCommunicationsSystem(model, 100)
+
+    yield model
+
+
+def test_unknown_structure_storage():
+    with pytest.raises(ValueError, match="Unknown structure storage"):
+        MarsModel(
+            config_params={"ROBOT_COUNTS": {}, "CREW_SIZE": 1},
+            grid_data=[["habitat"]],
+            equipment_positions=[],
+            structure_storage="columns",
+        )
+
+
+def test_structures_are_views_over_arrays(model):
+    wall = HabitatWall(model, 90)
+    store = model.structure_store
+
+    assert "integrity" not in vars(wall)
+    store_id = vars(wall)["_store_id"]
+    assert store.values["integrity"][store_id] == np.float32(90)
+
+    wall.integrity -= 10
+    assert wall.integrity == 80
+    assert store.values["integrity"][store_id] == np.float32(80)
+
+
+def test_store_totals_match_full_recompute(model):
+    BatteryPack(model, 60)
+    PowerWall(model, 75)
+    HabitatWall(model, 50)
+
+    totals = model.aggregates.totals()
+    recomputed = compute_structure_totals(model)
+    for name, value in totals.items():
+        assert value == pytest.approx(recomputed[name])
+
+    model.step()
+
+
+def test_removed_structure_keeps_its_values(model):
+    battery = BatteryPack(model, 60)
+    battery.fire_intensity = 20
+
+    battery.remove()
+
+    assert battery not in model.structure_store
+    assert battery.integrity == 60
+    assert battery.fire_intensity == 20
+
+
+def test_removed_ids_are_reused(model):
+    store = model.structure_store
+    size = store.size
+    for _ in range(3):
+        batteries = [BatteryPack(model, 60) for _ in range(5)]
+        for battery in batteries:
+            battery.remove()
+
+    assert store.size == size + 5
+    assert len(store.structures) == store.size
+
+    wall = HabitatWall(model, 40)
+    assert store.size == size + 5
+    assert wall.integrity == 40
+    totals = model.aggregates.totals()
+    recomputed = compute_structure_totals(model)
+    for name, value in totals.items():
+        assert value == pytest.approx(recomputed[name])
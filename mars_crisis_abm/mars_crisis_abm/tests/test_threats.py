@@ -0,0 +1,90 @@
+import math
+import random
+
+import pytest
+from mars_crisis_abm.threats import BucketIndex, ThreatRegistry
+from mars_crisis_abm.utils import Capability
+
+
+@pytest.fixture
+def registry():
+    registry = ThreatRegistry(bucket_size=4)
+    registry.report("fire-a", Capability.FIRE, (2, 2), severity=40)
+    registry.report("fire-b", Capability.FIRE, (20, 5), severity=90)
+    registry.report("breach", [Capability.WALL_EXT, "wall-int"], (6, 6))
+    registry.report("hurt", Capability.FIRST_AID, (3, 30))
+    return registry
+
+
+def test_nearest_by_capability(registry):
+    assert [t.key for t in registry.nearest(Capability.FIRE, (0, 0), k=5)] == [
+        "fire-a",
+        "fire-b",
+    ]
+    assert [t.key for t in registry.nearest("wall-int", (30, 30))] == ["breach"]
+    assert registry.nearest(Capability.WALL_EXT, (0, 0), max_distance=5) == []
+    assert registry.nearest(Capability.POWER_INT, (0, 0)) == []
+
+
+def test_within_radius(registry):
+    keys = [t.key for t in registry.within(Capability.FIRE, (10, 4), radius=12)]
+    assert keys == ["fire-a", "fire-b"]
+    assert registry.within(Capability.FIRE, (10, 4), radius=5) == []
+
+
+def test_claims_hide_threats_until_released(registry):
+    robot, other = object(), object()
+
+    assert registry.claim("fire-a", robot)
+    assert registry.claim("fire-a", robot)
+    assert not registry.claim("fire-a", other)
+    assert [t.key for t in registry.nearest(Capability.FIRE, (0, 0))] == ["fire-b"]
+    assert [t.key for t in registry.claimed_by(robot)] == ["fire-a"]
+    found = registry.nearest(Capability.FIRE, (0, 0), include_claimed=True)
+    assert found[0].claimed_by is robot
+
+    assert not registry.release("fire-a", other)
+    assert registry.release("fire-a", robot)
+    assert registry.claimed_by(robot) == []
+
+    registry.claim("breach", other)
+    registry.release_all(other)
+    assert registry.get("breach").claimed_by is None
+
+
+def test_report_updates_and_resolve(registry):
+    robot = object()
+    registry.claim("breach", robot)
+    registry.report("breach", Capability.WALL_INT, (40, 40), severity=10)
+
+    assert registry.nearest(Capability.WALL_EXT, (0, 0), include_claimed=True) == []
+    threat = registry.nearest("wall-int", (40, 41), include_claimed=True)[0]
+    assert threat.pos == (40, 40) and threat.claimed_by is robot
+
+    assert registry.resolve("breach") is threat
+    assert "breach" not in registry
+    assert registry.claimed_by(robot) == []
+    assert registry.threats(Capability.WALL_INT) == []
+    assert len(registry) == 3
+
+
+def test_bucket_index_matches_brute_force():
+    rng = random.Random(11)
+    index = BucketIndex(bucket_size=5)
+    points = {}
+    for item in range(300):
+        pos = (rng.uniform(0, 120), rng.uniform(0, 90))
+        points[item] = pos
+        index.add(item, pos)
+    for item in range(0, 300, 3):
+        index.remove(item)
+        del points[item]
+
+    for _ in range(50):
+        query = (rng.uniform(-10, 130), rng.uniform(-10, 100))
+        expected = sorted((math.dist(query, pos), item) for item, pos in points.items())
+        found = index.nearest(query, k=7, order=lambda item: item)
+        assert [item for _, item in found] == [item for _, item in expected[:7]]
+
+        within = sorted(index.within(query, 15))
+        assert within == [entry for entry in expected if entry[0] <= 15]
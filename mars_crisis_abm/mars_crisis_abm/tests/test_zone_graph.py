@@ -0,0 +1,103 @@
+import os
+
+import pytest
+from mars_crisis_abm.blueprint import build_zone_table
+from mars_crisis_abm.utils import (
+    OperatingEnvironment,
+    ZoneGraph,
+    ZoneIndex,
+    parse_grid_layout_csv,
+)
+
+LAYOUT_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "config", "grid_layout.csv"
+)
+
+# Two habitat modules joined by a corridor, an airlock to the outside and a
+# deposit out there
+GRID = [
+    "WWWWWWWWWWOO",
+    "WHHWCCCWHHWO",
+    "WHHCCCCCHHWO",
+    "WWWWWAWWWWWO",
+    "OOOOOOOOOTTO",
+]
+CODES = {
+    "W": "habitat_wall",
+    "H": "habitat",
+    "C": "corridor",
+    "A": "airlock",
+    "O": "outdoors",
+    "T": "deposit",
+}
+
+
+@pytest.fixture
+def graph():
+    grid_data = [[CODES[cell] for cell in row] for row in GRID]
+    return ZoneGraph(ZoneIndex.from_grid(grid_data, build_zone_table(grid_data)))
+
+
+def zones_of(graph, route):
+    return [graph.region_zones[region] for region in route]
+
+
+def test_regions_split_disconnected_modules(graph):
+    habitats = [
+        region for region, zone in enumerate(graph.region_zones) if zone == "habitat"
+    ]
+    assert len(habitats) == 2
+    assert graph.region_at((1, 1)) != graph.region_at((9, 2))
+    assert graph.region_at((1, 1)) == graph.region_at((2, 2))
+
+
+def test_routes_are_gated_by_environment(graph):
+    mixed = OperatingEnvironment.MIXED
+    internal = OperatingEnvironment.INTERNAL
+    external = OperatingEnvironment.EXTERNAL
+
+    assert zones_of(graph, graph.route((1, 1), "deposit", mixed)) == [
+        "habitat",
+        "corridor",
+        "airlock",
+        "outdoors",
+        "deposit",
+    ]
+    # Internal robots reach the airlock but never step outside
+    assert zones_of(graph, graph.route((1, 1), "airlock", internal))[-1] == "airlock"
+    assert graph.route((1, 1), "deposit", internal) is None
+    # External robots cannot leave the outdoors through the airlock
+    assert graph.route((0, 4), "corridor", external) is None
+    assert zones_of(graph, graph.route((0, 4), "deposit", external)) == [
+        "outdoors",
+        "deposit",
+    ]
+
+
+def test_next_step_walks_the_route(graph):
+    mixed = OperatingEnvironment.MIXED
+    pos = (1, 1)
+    for _ in range(30):
+        nxt = graph.next_step(pos, "deposit", mixed)
+        if nxt == pos:
+            break
+        assert max(abs(nxt[0] - pos[0]), abs(nxt[1] - pos[1])) == 1
+        assert graph.zone_index.zone_at(nxt) != "habitat_wall"
+        pos = nxt
+    assert graph.zone_index.zone_at(pos) == "deposit"
+    assert graph.next_step((1, 1), "deposit", OperatingEnvironment.INTERNAL) is None
+
+
+def test_bundled_layout_routes_every_environment():
+    grid_data, _ = parse_grid_layout_csv(LAYOUT_PATH)
+    zone_index = ZoneIndex.from_grid(grid_data, build_zone_table(grid_data))
+    graph = ZoneGraph.for_layout(zone_index)
+
+    assert ZoneGraph.for_layout(zone_index) is graph
+    assert len(graph) < zone_index.width * zone_index.height / 50
+    corridor = tuple(zone_index.positions["corridor"][0])
+    route = graph.route(corridor, "medical_bay", OperatingEnvironment.INTERNAL)
+    assert route is not None
+    assert all(
+        graph.accessible(region, OperatingEnvironment.INTERNAL) for region in route
+    )
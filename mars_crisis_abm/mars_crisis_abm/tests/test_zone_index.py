@@ -0,0 +1,97 @@
+import random
+
+import numpy as np
+import pytest
+from mars_crisis_abm.blueprint import build_zone_table
+from mars_crisis_abm.model import MarsModel
+from mars_crisis_abm.utils import OperatingEnvironment, ZoneIndex, get_zones_by_type
+
+
+@pytest.fixture
+def grid_data():
+    return [
+        ["outdoors", "airlock", "habitat", "habitat"],
+        ["outdoors", "habitat_wall", "corridor", "lab"],
+        ["deposit", "deposit", "corridor", "medical_bay"],
+    ]
+
+
+@pytest.fixture
+def zone_index(grid_data):
+    return ZoneIndex.from_grid(grid_data, build_zone_table(grid_data))
+
+
+def test_cell_zone_lookup(zone_index, grid_data):
+    assert zone_index.width == 4
+    assert zone_index.height == 3
+    for y, row in enumerate(grid_data):
+        for x, zone_code in enumerate(row):
+            assert zone_index.zone_at((x, y)) == zone_code
+            assert zone_index.in_zone((x, y), zone_code)
+
+    assert not zone_index.in_zone((0, 0), "habitat")
+    assert not zone_index.in_zone((0, 0), "power_station")
+
+
+def test_position_arrays_follow_zone_table(zone_index, grid_data):
+    zones = build_zone_table(grid_data)
+
+    for zone_code, zone_data in zones.items():
+        assert [tuple(p) for p in zone_index.positions[zone_code]] == zone_data[
+            "positions"
+        ]
+    assert zone_index.positions["habitat_wall"].shape == (0, 2)
+
+
+def test_environment_mask_matches_get_zones_by_type(zone_index, grid_data):
+    zones = build_zone_table(grid_data)
+
+    for environment in OperatingEnvironment:
+        accessible = get_zones_by_type(zones, environment)
+        mask = zone_index.environment_mask(environment)
+        for y, row in enumerate(grid_data):
+            for x, zone_code in enumerate(row):
+                assert mask[x, y] == (zone_code in accessible)
+                assert zone_index.environment_allows(environment, (x, y)) == (
+                    zone_code in accessible
+                )
+
+
+def test_robot_access(zone_index):
+    assert zone_index.robot_allows("BioLabRobot", (3, 1))
+    assert not zone_index.robot_allows("BioLabRobot", (2, 1))
+    assert zone_index.robot_allows("EVASpecialistRobot", (1, 0))
+
+    mask = zone_index.robot_mask("ConstructionRobot")
+    assert mask.sum() == 4
+    assert mask[0, 0] and mask[1, 2]
+
+
+def test_zone_mask(zone_index):
+    mask = zone_index.zone_mask(["corridor", "lab"])
+
+    assert np.argwhere(mask).tolist() == [[2, 1], [2, 2], [3, 1]]
+
+
+def test_random_position_matches_choice(zone_index, grid_data):
+    zones = build_zone_table(grid_data)
+    first, second = random.Random(8), random.Random(8)
+
+    for _ in range(10):
+        assert zone_index.random_position("habitat", first) == second.choice(
+            zones["habitat"]["positions"]
+        )
+
+    with pytest.raises(ValueError):
+        zone_index.random_position("habitat_wall", first)
+
+
+def test_model_builds_zone_index(grid_data):
+    model = MarsModel(
+        config_params={"ROBOT_COUNTS": {}, "CREW_SIZE": 1},
+        grid_data=grid_data,
+        equipment_positions=[],
+    )
+
+    assert model.zone_index.zone_codes == list(model.zones)
+    assert model.zone_index.zone_at((3, 2)) == "medical_bay"
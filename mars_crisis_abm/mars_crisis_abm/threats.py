@@ -0,0 +1,310 @@
+import heapq
+import itertools
+import math
+
+from .utils import Capability
+
+# Side of the spatial hash buckets, in grid cells
+DEFAULT_BUCKET_SIZE = 8
+
+
+class Threat:
+    """An outstanding problem at a position that robots with capabilities can handle"""
+
+    def __init__(self, key, capabilities, pos, severity=None, source=None, order=0):
+        self.key = key
+        self.capabilities = capabilities
+        self.pos = pos
+        self.severity = severity
+        self.source = source
+        self.claimed_by = None
+        # Report order, used to break distance ties deterministically
+        self.order = order
+
+    def __repr__(self):
+        return f"Threat({self.key!r}, {self.pos}, severity={self.severity})"
+
+
+class BucketIndex:
+    """
+    Spatial hash of points in square buckets.
+
+    nearest() searches rings of buckets outward from the query and stops as
+    soon as no unvisited bucket can hold anything closer, so with evenly
+    spread points a query touches a handful of buckets whatever the total.
+    """
+
+    def __init__(self, bucket_size=DEFAULT_BUCKET_SIZE):
+        self.bucket_size = bucket_size
+        self._buckets = {}
+        self._items = {}
+        # Bucket coordinate bounds of everything ever indexed
+        self._bounds = None
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item):
+        return item in self._items
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def add(self, item, pos):
+        self.remove(item)
+        bucket = self._bucket(pos)
+        self._buckets.setdefault(bucket, {})[item] = pos
+        self._items[item] = bucket
+        bx, by = bucket
+        if self._bounds is None:
+            self._bounds = [bx, by, bx, by]
+        else:
+            bounds = self._bounds
+            bounds[0], bounds[1] = min(bounds[0], bx), min(bounds[1], by)
+            bounds[2], bounds[3] = max(bounds[2], bx), max(bounds[3], by)
+
+    def remove(self, item):
+        bucket = self._items.pop(item, None)
+        if bucket is not None:
+            members = self._buckets[bucket]
+            del members[item]
+            if not members:
+                del self._buckets[bucket]
+
+    def nearest(self, pos, k=1, max_distance=None, accept=None, order=None):
+        """
+        Returns up to k (distance, item) pairs closest to pos, nearest first.
+        accept filters items and order(item) breaks distance ties.
+        """
+        if not self._items or k <= 0:
+            return []
+        order = order or (lambda item: 0)
+        bx, by = self._bucket(pos)
+        x0, y0, x1, y1 = self._bounds
+        max_ring = max(bx - x0, x1 - bx, by - y0, y1 - by)
+
+        best = []  # max-heap of (-distance, -order, counter, item)
+        counter = itertools.count()
+        for ring in range(max_ring + 1):
+            # Buckets of this ring and beyond are ring - 1 buckets away at least
+            reach = (ring - 1) * self.bucket_size
+            if len(best) == k and -best[0][0] <= reach:
+                break
+            if max_distance is not None and reach > max_distance:
+                break
+            for bucket in _ring(bx, by, ring):
+                for item, item_pos in self._buckets.get(bucket, {}).items():
+                    if accept is not None and not accept(item):
+                        continue
+                    distance = math.dist(pos, item_pos)
+                    if max_distance is not None and distance > max_distance:
+                        continue
+                    entry = (-distance, -order(item), next(counter), item)
+                    if len(best) < k:
+                        heapq.heappush(best, entry)
+                    elif entry > best[0]:
+                        heapq.heapreplace(best, entry)
+        best.sort(reverse=True)
+        return [(-entry[0], entry[3]) for entry in best]
+
+    def within(self, pos, radius, accept=None):
+        """Returns the (distance, item) pairs within radius of pos, unordered"""
+        x, y = pos
+        low = self._bucket((x - radius, y - radius))
+        high = self._bucket((x + radius, y + radius))
+        found = []
+        for bx in range(low[0], high[0] + 1):
+            for by in range(low[1], high[1] + 1):
+                for item, item_pos in self._buckets.get((bx, by), {}).items():
+                    if accept is not None and not accept(item):
+                        continue
+                    distance = math.dist(pos, item_pos)
+                    if distance <= radius:
+                        found.append((distance, item))
+        return found
+
+    def _bucket(self, pos):
+        return (
+            math.floor(pos[0] / self.bucket_size),
+            math.floor(pos[1] / self.bucket_size),
+        )
+
+
+class ThreatRegistry:
+    """
+    Model-level registry of outstanding threats, indexed by Capability.
+
+    Each threat is reported once under a key (for example the threatened
+    structure and the kind of problem) with the capabilities that can handle
+    it, and lives in the BucketIndex of every one of those capabilities until
+    it is resolved. nearest() and within() answer "which threats can I
+    handle around here" from that index instead of scanning every threat. A
+    robot claims a threat to work on it; claimed threats are skipped by
+    queries unless include_claimed is set, and go back to the pool when
+    released or when the claiming robot leaves the model.
+    """
+
+    def __init__(self, bucket_size=DEFAULT_BUCKET_SIZE):
+        self.bucket_size = bucket_size
+        self._threats = {}
+        self._indexes = {}
+        self._claims = {}
+        self._order = itertools.count()
+
+    def __len__(self):
+        return len(self._threats)
+
+    def __contains__(self, key):
+        return key in self._threats
+
+    def get(self, key):
+        return self._threats.get(key)
+
+    def report(self, key, capabilities, pos, severity=None, source=None):
+        """
+        Records a threat, or updates the position, severity and capabilities
+        of the one already reported under key, keeping its claim.
+
+        Returns:
+            Threat: The registered threat.
+        """
+        capabilities = _capabilities(capabilities)
+        pos = tuple(pos)
+        threat = self._threats.get(key)
+        if threat is None:
+            threat = Threat(
+                key, capabilities, pos, severity, source, next(self._order)
+            )
+            self._threats[key] = threat
+        else:
+            for capability in threat.capabilities:
+                if capability not in capabilities:
+                    self._indexes[capability].remove(key)
+            threat.capabilities = capabilities
+            threat.pos = pos
+            threat.severity = severity
+            if source is not None:
+                threat.source = source
+
+        for capability in capabilities:
+            index = self._indexes.get(capability)
+            if index is None:
+                index = self._indexes[capability] = BucketIndex(self.bucket_size)
+            index.add(key, pos)
+        return threat
+
+    def resolve(self, key):
+        """Removes the threat reported under key. Returns it, or None"""
+        threat = self._threats.pop(key, None)
+        if threat is None:
+            return None
+        for capability in threat.capabilities:
+            self._indexes[capability].remove(key)
+        self._unclaim(threat)
+        return threat
+
+    def threats(self, capability=None):
+        """Returns every outstanding threat, or those capability can handle"""
+        if capability is None:
+            return list(self._threats.values())
+        index = self._indexes.get(Capability(capability))
+        if index is None:
+            return []
+        return sorted((self._threats[key] for key in index), key=lambda t: t.order)
+
+    def nearest(self, capability, pos, k=1, max_distance=None, include_claimed=False):
+        """
+        Returns up to k threats that capability can handle, nearest to pos
+        first and in report order on ties.
+        """
+        index = self._indexes.get(Capability(capability))
+        if index is None:
+            return []
+        found = index.nearest(
+            pos,
+            k,
+            max_distance=max_distance,
+            accept=None if include_claimed else self._unclaimed,
+            order=self._report_order,
+        )
+        return [self._threats[key] for _, key in found]
+
+    def within(self, capability, pos, radius, include_claimed=False):
+        """Returns the threats capability can handle within radius, nearest first"""
+        index = self._indexes.get(Capability(capability))
+        if index is None:
+            return []
+        found = index.within(
+            pos, radius, accept=None if include_claimed else self._unclaimed
+        )
+        threats = [(distance, self._threats[key]) for distance, key in found]
+        threats.sort(key=lambda entry: (entry[0], entry[1].order))
+        return [threat for _, threat in threats]
+
+    def claim(self, key, robot):
+        """
+        Assigns the threat under key to robot. Returns False if it does not
+        exist or another robot already holds it.
+        """
+        threat = self._threats.get(key)
+        if threat is None:
+            return False
+        if threat.claimed_by is not None:
+            return threat.claimed_by is robot
+        threat.claimed_by = robot
+        self._claims.setdefault(robot, set()).add(key)
+        return True
+
+    def release(self, key, robot=None):
+        """Returns the threat under key to the pool. With robot, only if it holds it"""
+        threat = self._threats.get(key)
+        if threat is None or threat.claimed_by is None:
+            return False
+        if robot is not None and threat.claimed_by is not robot:
+            return False
+        self._unclaim(threat)
+        return True
+
+    def claimed_by(self, robot):
+        return [self._threats[key] for key in self._claims.get(robot, ())]
+
+    def release_all(self, robot):
+        """Releases every claim held by robot"""
+        for key in list(self._claims.get(robot, ())):
+            self._unclaim(self._threats[key])
+
+    def _unclaim(self, threat):
+        robot = threat.claimed_by
+        if robot is None:
+            return
+        threat.claimed_by = None
+        keys = self._claims.get(robot)
+        if keys is not None:
+            keys.discard(threat.key)
+            if not keys:
+                del self._claims[robot]
+
+    def _unclaimed(self, key):
+        return self._threats[key].claimed_by is None
+
+    def _report_order(self, key):
+        return self._threats[key].order
+
+
+def _capabilities(capabilities):
+    if isinstance(capabilities, (Capability, str)):
+        capabilities = (capabilities,)
+    return tuple(dict.fromkeys(Capability(capability) for capability in capabilities))
+
+
+def _ring(bx, by, ring):
+    """Bucket coordinates at Chebyshev distance ring from (bx, by)"""
+    if ring == 0:
+        yield bx, by
+        return
+    for dx in range(-ring, ring + 1):
+        yield bx + dx, by - ring
+        yield bx + dx, by + ring
+    for dy in range(-ring + 1, ring):
+        yield bx - ring, by + dy
+        yield bx + ring, by + dy
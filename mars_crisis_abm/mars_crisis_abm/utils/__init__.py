@@ -8,6 +8,11 @@ from .constants import (
     DEFAULT_COMMUNICATION_RANGE,
     FIRE_INTENSITY_INCREASE_RATE,
     FIRE_SUPPRESSION_RATE,
+    FIRE_SPREAD_INTENSITY,
+    FIRE_SPREAD_RADIUS,
+    FIRE_IGNITION_INTENSITY,
+    INTEGRITY_THRESHOLDS,
+    WALL_BREACH_INTEGRITY,
     INITIAL_HEALTH,
     CRITICAL_HEALTH_THRESHOLD,
     BASE_INJURE_RATE,
@@ -28,13 +33,28 @@ from .enums import (
 from .agent_utils import (
     spread_fire,
     spread_damage,
+    ignite,
     get_zones_by_type
 )
 
+# Neighborhood index
+from .neighborhood import NeighborhoodIndex
+
+# Zone index
+from .zone_index import ZoneIndex, compute_cell_zone_ids
+
+# Navigation fields
+from .navigation import NavigationFields, UNREACHABLE
+
+# Zone graph
+from .zone_graph import ZoneGraph
+
 # Model utilities
 from .model_utils import (
     load_config,
-    load_grid_layout_csv
+    load_grid_layout_csv,
+    parse_grid_layout_csv,
+    assign_equipment_integrities
 )
 
 # Grid mapping
@@ -53,6 +73,11 @@ __all__ = [
     'DEFAULT_COMMUNICATION_RANGE',
     'FIRE_INTENSITY_INCREASE_RATE',
     'FIRE_SUPPRESSION_RATE',
+    'FIRE_SPREAD_INTENSITY',
+    'FIRE_SPREAD_RADIUS',
+    'FIRE_IGNITION_INTENSITY',
+    'INTEGRITY_THRESHOLDS',
+    'WALL_BREACH_INTEGRITY',
     'INITIAL_HEALTH',
     'CRITICAL_HEALTH_THRESHOLD',
     'BASE_INJURE_RATE',
@@ -69,11 +94,28 @@ __all__ = [
     # Agent utilities
     'spread_fire',
     'spread_damage',
+    'ignite',
     'get_zones_by_type',
     
+    # Neighborhood index
+    'NeighborhoodIndex',
+    
+    # Zone index
+    'ZoneIndex',
+    'compute_cell_zone_ids',
+    
+    # Navigation fields
+    'NavigationFields',
+    'UNREACHABLE',
+    
+    # Zone graph
+    'ZoneGraph',
+    
     # Model utilities
     'load_config',
     'load_grid_layout_csv',
+    'parse_grid_layout_csv',
+    'assign_equipment_integrities',
     
     # Grid mapping
     'ZONE_MAPPING',
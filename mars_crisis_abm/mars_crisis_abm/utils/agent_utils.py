@@ -1,19 +1,42 @@
-from .constants import STABILITY_THRESHOLDS, BASE_DETERIORATION_RATE
+from .constants import (
+    STABILITY_THRESHOLDS,
+    BASE_DETERIORATION_RATE,
+    FIRE_SPREAD_RADIUS,
+    FIRE_IGNITION_INTENSITY,
+)
 from .enums import OperatingEnvironment
 
 
+def _get_neighbors(agent, radius, flammable=False):
+    # Static structures use the model's precomputed index when it is available
+    index = getattr(agent.model, "neighborhoods", None)
+    if index is not None:
+        neighbors = index.get(agent, radius, flammable)
+        if neighbors is not None:
+            return neighbors
+    return agent.model.grid.get_neighbors(agent.pos, moore=True, radius=radius)
+
+
 def spread_fire(agent):
-    neighbors = agent.model.grid.get_neighbors(agent.pos, moore=True, radius=3)
+    # The grid fire engine spreads every fire front at once at the end of the step
+    if getattr(agent.model, "fire_engine", None) == "grid":
+        return
+
+    neighbors = _get_neighbors(agent, radius=FIRE_SPREAD_RADIUS, flammable=True)
     for neighbor in neighbors:
         if hasattr(neighbor, "fire_intensity") and neighbor.fire_intensity == 0:
-            neighbor.integrity = min(
-                neighbor.integrity, STABILITY_THRESHOLDS["structure"] - 1
-            )
-            neighbor.fire_intensity = 10
+            ignite(neighbor)
+
+
+def ignite(structure):
+    structure.integrity = min(
+        structure.integrity, STABILITY_THRESHOLDS["structure"] - 1
+    )
+    structure.fire_intensity = FIRE_IGNITION_INTENSITY
 
 
 def spread_damage(agent, radius=1):
-    neighbors = agent.model.grid.get_neighbors(agent.pos, moore=True, radius=radius)
+    neighbors = _get_neighbors(agent, radius=radius)
 
     for neighbor in neighbors:
         if hasattr(neighbor, "integrity"):
@@ -21,23 +44,26 @@ def spread_damage(agent, radius=1):
 
 
 def get_zones_by_type(zones, operating_environment):
-    accessible_zones = set()
+    # Zones are returned in table order, so results do not depend on hashing
+    accessible_zones = []
     for zone_data in zones.values():
         zone_type = zone_data["type"]
         zone_code = zone_data["code"]
 
+        accessible = False
         if operating_environment == OperatingEnvironment.MIXED:
-            accessible_zones.add(zone_code)
+            accessible = True
         elif operating_environment == OperatingEnvironment.INTERNAL:
-            if (
+            accessible = (
                 zone_type == OperatingEnvironment.INTERNAL.value
                 or zone_type == OperatingEnvironment.MIXED.value
-            ):
-                accessible_zones.add(zone_code)
+            )
         elif operating_environment == OperatingEnvironment.EXTERNAL:
-            if (
+            accessible = (
                 zone_type == OperatingEnvironment.EXTERNAL.value
                 or zone_type == OperatingEnvironment.MIXED.value
-            ):
-                accessible_zones.add(zone_code)
-    return list(accessible_zones)
+            )
+
+        if accessible and zone_code not in accessible_zones:
+            accessible_zones.append(zone_code)
+    return accessible_zones
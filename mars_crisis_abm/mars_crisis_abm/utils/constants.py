@@ -16,6 +16,17 @@ BASE_FIX_RATE = 5
 
 FIRE_INTENSITY_INCREASE_RATE = 1
 FIRE_SUPPRESSION_RATE = 100
+FIRE_SPREAD_INTENSITY = 70
+FIRE_SPREAD_RADIUS = 3
+FIRE_IGNITION_INTENSITY = 10
+
+# Integrity levels the damage rules key off: damaged counters (80), the
+# structure threshold (70), counterpart wall damage (50), battery ignition
+# (30), adjacent wall deterioration (20) and unrecoverable damage (15)
+INTEGRITY_THRESHOLDS = (80, 70, 50, 30, 20, 15)
+
+# Walls at or below this integrity are breached and can be crossed
+WALL_BREACH_INTEGRITY = 0
 
 INITIAL_HEALTH = 50
 CRITICAL_HEALTH_THRESHOLD = 30
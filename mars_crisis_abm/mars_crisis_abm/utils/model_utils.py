@@ -3,10 +3,12 @@ import csv
 from .grid_mapping import ZONE_MAPPING, EQUIPMENT_MAPPING
 
 
-def _get_default_equipment_integrity(equipment_type):
+def _get_default_equipment_integrity(equipment_type, rng=None):
     """Get default integrity values for equipment types with some variation"""
     import random
 
+    rng = rng or random
+
     if equipment_type == "CentralCommunicationsSystem":
         return 25
 
@@ -18,7 +20,7 @@ def _get_default_equipment_integrity(equipment_type):
 
     if equipment_type in base_values:
         min_val, max_val = base_values[equipment_type]
-        return random.randint(min_val, max_val)
+        return rng.randint(min_val, max_val)
     else:
         raise ValueError("Equipement not supported")
 
@@ -56,19 +58,34 @@ def load_config(file_path):
     return config_params
 
 
-def load_grid_layout_csv(file_path):
+def load_grid_layout_csv(file_path, rng=None):
     """
     Loads grid layout from a CSV file where each cell contains a symbol
     representing either a zone type or equipment.
 
     Args:
         file_path (str): The path to the CSV grid file.
+        rng (random.Random, optional): Source of the randomized equipment
+            integrities. Defaults to the global random module.
 
     Returns:
         tuple: (grid_data, equipment_positions)
     """
+    grid_data, equipment_cells = parse_grid_layout_csv(file_path)
+    return grid_data, assign_equipment_integrities(equipment_cells, rng)
+
+
+def parse_grid_layout_csv(file_path):
+    """
+    Parses a grid layout CSV into zone names and equipment cells, without
+    drawing the randomized equipment integrities.
+
+    Returns:
+        tuple: (grid_data, equipment_cells), equipment cells being dicts with
+        x, y and type in row-major order.
+    """
     grid_data = []
-    equipment_positions = []
+    equipment_cells = []
 
     try:
         with open(file_path, "r") as f:
@@ -82,15 +99,8 @@ def load_grid_layout_csv(file_path):
                         grid_row.append("outdoors")
 
                     elif cell in EQUIPMENT_MAPPING:
-                        equipment_positions.append(
-                            {
-                                "x": x,
-                                "y": y,
-                                "type": EQUIPMENT_MAPPING[cell],
-                                "integrity": _get_default_equipment_integrity(
-                                    EQUIPMENT_MAPPING[cell]
-                                ),
-                            }
+                        equipment_cells.append(
+                            {"x": x, "y": y, "type": EQUIPMENT_MAPPING[cell]}
                         )
                         grid_row.append("corridor")
 
@@ -109,4 +119,12 @@ def load_grid_layout_csv(file_path):
             f"An unexpected error occurred while loading the grid layout: {e}"
         )
 
-    return grid_data, equipment_positions
+    return grid_data, equipment_cells
+
+
+def assign_equipment_integrities(equipment_cells, rng=None):
+    """Returns equipment positions with a default integrity drawn for each cell, in order"""
+    return [
+        dict(cell, integrity=_get_default_equipment_integrity(cell["type"], rng))
+        for cell in equipment_cells
+    ]
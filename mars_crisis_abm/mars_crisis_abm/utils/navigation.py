@@ -0,0 +1,348 @@
+import hashlib
+import heapq
+from collections import deque
+
+import numpy as np
+
+from .enums import ZONE_ENVIRONMENT_MAP, OperatingEnvironment
+
+# Zones nobody can stand in (walls)
+IMPASSABLE_ZONES = tuple(
+    zone_code.value
+    for zone_code, environment in ZONE_ENVIRONMENT_MAP.items()
+    if environment is OperatingEnvironment.NONE
+)
+
+# Moore moves in the order mesa enumerates a radius 1 neighborhood
+MOORE_MOVES = tuple(
+    (dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if (dx, dy) != (0, 0)
+)
+
+UNREACHABLE = -1
+
+# Navigation fields shared by every model built on the same layout
+_layout_fields = {}
+_MAX_CACHED_LAYOUTS = 8
+
+
+class NavigationFields:
+    """
+    Lazily built BFS distance and flow fields over a ZoneIndex.
+
+    A field is computed once per (destination, operating environment): a
+    multi-source BFS from every passable cell of the destination zones, over
+    the cells a robot of that environment may enter (walls never are). The
+    flow field stores, for each cell, the Moore move that brings it one step
+    closer, so next_step() is an O(1) lookup instead of a path search.
+    Distances are in moves; cells that cannot reach the destination are
+    UNREACHABLE.
+
+    Use for_layout() to share the fields of a layout between models, and
+    overlay() for a copy whose cells can be opened or blocked with
+    set_cell(). An overlay borrows the shared fields until its first cell
+    change; from then on changes repair only the affected region of each
+    field with an incremental BFS. Pickling keeps the sharing: shared fields
+    are looked up again with for_layout() and an overlay borrows again what
+    it had not copied.
+    """
+
+    def __init__(self, zone_index, base=None):
+        self.zone_index = zone_index
+        self.width = zone_index.width
+        self.height = zone_index.height
+        self._base = base
+        self._passable = {}
+        self._fields = {}
+        # Masks and fields borrowed from base are copied before being repaired
+        self._owned = set()
+        # Per-cell passability overrides, allocated on the first set_cell
+        self._opened = None
+        self._blocked = None
+        # Set on the memoized fields of a layout
+        self._shared = False
+
+        # Cells are flattened with a one cell impassable border so moves never
+        # need bounds checks
+        self._stride = self.height + 2
+        self._offsets = np.array(
+            [dx * self._stride + dy for dx, dy in MOORE_MOVES], dtype=np.int64
+        )
+
+    @classmethod
+    def for_layout(cls, zone_index):
+        """Returns the memoized fields of zone_index's layout"""
+        key = layout_key(zone_index)
+        fields = _layout_fields.get(key)
+        if fields is None:
+            fields = cls(zone_index)
+            fields._shared = True
+            if len(_layout_fields) >= _MAX_CACHED_LAYOUTS:
+                del _layout_fields[next(iter(_layout_fields))]
+            _layout_fields[key] = fields
+        return fields
+
+    def __reduce_ex__(self, protocol):
+        if self._shared:
+            return type(self).for_layout, (self.zone_index,)
+        return super().__reduce_ex__(protocol)
+
+    def __getstate__(self):
+        # Borrowed masks and fields are placeholders, refilled from the base
+        state = self.__dict__.copy()
+        state["_passable"] = {
+            environment: mask if environment in self._owned else None
+            for environment, mask in self._passable.items()
+        }
+        state["_fields"] = {
+            key: field if key in self._owned else None
+            for key, field in self._fields.items()
+        }
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        for environment, mask in self._passable.items():
+            if mask is None:
+                self._passable[environment] = self._base.passable(environment)
+        for key, field in self._fields.items():
+            if field is None:
+                self._fields[key] = self._base._field(*key)
+
+    def overlay(self):
+        """Returns fields over the same layout that accept cell changes"""
+        return type(self)(self.zone_index, base=self)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def passable(self, operating_environment):
+        """Boolean [x, y] mask of the cells operating_environment can enter"""
+        mask = self._passable.get(operating_environment)
+        if mask is None:
+            if self._borrowing():
+                mask = self._base.passable(operating_environment)
+            else:
+                mask = self.zone_index.environment_mask(
+                    operating_environment
+                ) & ~self.zone_index.zone_mask(IMPASSABLE_ZONES)
+                if self._opened is not None:
+                    mask = (mask | self._opened) & ~self._blocked
+                self._owned.add(operating_environment)
+            self._passable[operating_environment] = mask
+        return mask
+
+    def set_cell(self, pos, opened=False, blocked=False):
+        """
+        Overrides the passability of the cell at pos. opened lets robots cross
+        an otherwise impassable cell (a breached wall) and blocked closes a
+        passable one (a fire); blocked wins when both are set. Every field
+        built so far is repaired around the cell.
+        """
+        if self._opened is None:
+            if not opened and not blocked:
+                return
+            self._opened = np.zeros((self.width, self.height), dtype=bool)
+            self._blocked = np.zeros((self.width, self.height), dtype=bool)
+        x, y = pos
+        if self._opened[x, y] == opened and self._blocked[x, y] == blocked:
+            return
+        self._opened[x, y] = opened
+        self._blocked[x, y] = blocked
+
+        for environment in list(self._passable):
+            passable = not blocked and (
+                opened
+                or (
+                    self.zone_index.environment_allows(environment, pos)
+                    and self.zone_index.zone_at(pos) not in IMPASSABLE_ZONES
+                )
+            )
+            if self._passable[environment][x, y] == passable:
+                continue
+            self._own_mask(environment)[x, y] = passable
+            for key in list(self._fields):
+                if key[1] == environment:
+                    self._repair(key, x, y, passable)
+
+    def distance_field(self, destination, operating_environment):
+        """[x, y] array of moves to the nearest destination cell"""
+        return self._field(destination, operating_environment)[0]
+
+    def distance(self, pos, destination, operating_environment):
+        x, y = pos
+        return int(self.distance_field(destination, operating_environment)[x, y])
+
+    def next_step(self, pos, destination, operating_environment):
+        """
+        Returns the cell to move to from pos toward destination, pos itself
+        once it is reached, or None if destination cannot be reached.
+        """
+        x, y = pos
+        move = self._field(destination, operating_environment)[1][x, y]
+        if move < 0:
+            distance = self.distance(pos, destination, operating_environment)
+            return pos if distance == 0 else None
+        dx, dy = MOORE_MOVES[move]
+        return x + dx, y + dy
+
+    def _field(self, destination, operating_environment):
+        zone_codes = (destination,) if isinstance(destination, str) else destination
+        key = (tuple(zone_codes), operating_environment)
+        field = self._fields.get(key)
+        if field is None:
+            if self._borrowing():
+                # Borrow the mask too, so later cell changes see this field
+                self.passable(operating_environment)
+                field = self._base._field(key[0], operating_environment)
+            else:
+                field = self._build(key[0], operating_environment)
+                self._owned.add(key)
+            self._fields[key] = field
+        return field
+
+    def _borrowing(self):
+        return self._base is not None and self._opened is None
+
+    def _own_mask(self, environment):
+        if environment not in self._owned:
+            self._passable[environment] = self._passable[environment].copy()
+            self._owned.add(environment)
+        return self._passable[environment]
+
+    def _own_field(self, key):
+        if key not in self._owned:
+            distance, flow = self._fields[key]
+            self._fields[key] = (distance.copy(), flow.copy())
+            self._owned.add(key)
+        return self._fields[key]
+
+    def _neighbors(self, x, y):
+        for dx, dy in MOORE_MOVES:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.width and 0 <= ny < self.height:
+                yield nx, ny
+
+    def _repair(self, key, x, y, passable_now):
+        zone_codes, environment = key
+        passable = self._passable[environment]
+        distance, flow = self._own_field(key)
+
+        if passable_now:
+            # Opening a cell only shortens paths: give it a distance and relax
+            # outward while neighbors improve
+            if self.zone_index.zone_at((x, y)) in zone_codes:
+                best = 0
+            else:
+                reachable = [
+                    distance[n] for n in self._neighbors(x, y) if distance[n] >= 0
+                ]
+                best = min(reachable) + 1 if reachable else UNREACHABLE
+            distance[x, y] = best
+            changed = {(x, y)}
+            queue = deque([(x, y)] if best != UNREACHABLE else [])
+            while queue:
+                cell = queue.popleft()
+                for n in self._neighbors(*cell):
+                    if passable[n] and (
+                        distance[n] == UNREACHABLE or distance[n] > distance[cell] + 1
+                    ):
+                        distance[n] = distance[cell] + 1
+                        changed.add(n)
+                        queue.append(n)
+        else:
+            # Closing a cell only lengthens paths: drop every cell that relied
+            # on it, level by level, then recompute them from the intact
+            # border of the dropped region
+            previous = {(x, y): int(distance[x, y])}
+            distance[x, y] = UNREACHABLE
+            queue = deque([(x, y)] if previous[(x, y)] != UNREACHABLE else [])
+            while queue:
+                cell = queue.popleft()
+                for n in self._neighbors(*cell):
+                    if n in previous or distance[n] != previous[cell] + 1:
+                        continue
+                    supported = any(
+                        m not in previous and distance[m] == distance[n] - 1
+                        for m in self._neighbors(*n)
+                    )
+                    if not supported:
+                        previous[n] = int(distance[n])
+                        distance[n] = UNREACHABLE
+                        queue.append(n)
+
+            heap = []
+            for cell in previous:
+                if cell == (x, y):
+                    continue
+                for n in self._neighbors(*cell):
+                    if n not in previous and distance[n] >= 0:
+                        heapq.heappush(heap, (int(distance[n]) + 1, cell))
+            while heap:
+                level, cell = heapq.heappop(heap)
+                if distance[cell] != UNREACHABLE:
+                    continue
+                distance[cell] = level
+                for n in self._neighbors(*cell):
+                    if n in previous and passable[n] and distance[n] == UNREACHABLE:
+                        heapq.heappush(heap, (level + 1, n))
+            changed = set(previous)
+
+        # Flow changes wherever a cell or one of its neighbors changed distance
+        for cell in {n for c in changed for n in self._neighbors(*c)} | changed:
+            flow[cell] = self._best_move(distance, *cell)
+
+    def _best_move(self, distance, x, y):
+        if distance[x, y] <= 0:
+            return -1
+        best_move, best_distance = -1, None
+        for move, (dx, dy) in enumerate(MOORE_MOVES):
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.width and 0 <= ny < self.height:
+                d = distance[nx, ny]
+                if d >= 0 and (best_distance is None or d < best_distance):
+                    best_move, best_distance = move, d
+        return best_move
+
+    def _pad(self, array, fill):
+        padded = np.full((self.width + 2, self.height + 2), fill, dtype=array.dtype)
+        padded[1:-1, 1:-1] = array
+        return padded.ravel()
+
+    def _build(self, zone_codes, operating_environment):
+        passable = self._pad(self.passable(operating_environment), False)
+        targets = self._pad(self.zone_index.zone_mask(zone_codes), False) & passable
+
+        distance = np.full(passable.shape, UNREACHABLE, dtype=np.int32)
+        frontier = np.flatnonzero(targets)
+        distance[frontier] = 0
+        level = 0
+        while len(frontier):
+            level += 1
+            candidates = np.unique((frontier[:, None] + self._offsets).ravel())
+            candidates = candidates[
+                passable[candidates] & (distance[candidates] == UNREACHABLE)
+            ]
+            distance[candidates] = level
+            frontier = candidates
+
+        # Best move per cell: the neighbor with the smallest distance, first
+        # in MOORE_MOVES order on ties
+        cells = np.flatnonzero(distance > 0)
+        neighbor_distance = distance[cells[:, None] + self._offsets].astype(np.int64)
+        neighbor_distance[neighbor_distance == UNREACHABLE] = np.iinfo(np.int64).max
+        flow = np.full(passable.shape, -1, dtype=np.int8)
+        flow[cells] = np.argmin(neighbor_distance, axis=1)
+
+        shape = (self.width + 2, self.height + 2)
+        return (
+            distance.reshape(shape)[1:-1, 1:-1].copy(),
+            flow.reshape(shape)[1:-1, 1:-1].copy(),
+        )
+
+
+def layout_key(zone_index):
+    """Digest identifying the cell zones of a layout"""
+    digest = hashlib.sha256()
+    digest.update(repr((zone_index.zone_codes, zone_index.cell_zone.shape)).encode())
+    digest.update(np.ascontiguousarray(zone_index.cell_zone).tobytes())
+    return digest.hexdigest()
@@ -0,0 +1,76 @@
+class NeighborhoodIndex:
+    """
+    Precomputed Moore neighborhoods of static structures. Walls and equipment
+    never move, so the structures around each of them are looked up once per
+    radius instead of querying the grid on every spread.
+
+    Neighbor lists keep the order of grid.get_neighbors and, like it, exclude
+    agents sharing the structure's own cell.
+
+    Mobile agents that can take spread damage or catch fire (those with an
+    integrity or fire_intensity) are passed as mobile. They are not indexed;
+    get() checks their current position on every lookup and appends the ones
+    in range, so spreads still reach them as they did through the grid.
+    """
+
+    def __init__(self, grid, structures, radii=(1, 3), mobile=()):
+        self.radii = tuple(radii)
+        self.mobile = list(mobile)
+        self._neighbors = {}
+        self._flammable_neighbors = {}
+
+        indexed = set(structures)
+        for structure in indexed:
+            if structure.pos is None:
+                continue
+            by_radius = {}
+            flammable_by_radius = {}
+            for radius in self.radii:
+                neighbors = [
+                    neighbor
+                    for neighbor in grid.get_neighbors(
+                        structure.pos, moore=True, radius=radius
+                    )
+                    if neighbor in indexed
+                ]
+                by_radius[radius] = neighbors
+                flammable_by_radius[radius] = [
+                    neighbor
+                    for neighbor in neighbors
+                    if hasattr(neighbor, "fire_intensity")
+                ]
+            self._neighbors[structure] = by_radius
+            self._flammable_neighbors[structure] = flammable_by_radius
+
+    def __contains__(self, structure):
+        return structure in self._neighbors
+
+    def __len__(self):
+        return len(self._neighbors)
+
+    def get(self, structure, radius, flammable=False):
+        """
+        Returns the neighbor structures and mobile agents of structure within
+        radius, only the ones with a fire_intensity if flammable is set, or
+        None if the structure or radius is not indexed.
+        """
+        index = self._flammable_neighbors if flammable else self._neighbors
+        by_radius = index.get(structure)
+        if by_radius is None:
+            return None
+        neighbors = by_radius.get(radius)
+        if neighbors is None or not self.mobile:
+            return neighbors
+        mobile = self._mobile_neighbors(structure.pos, radius, flammable)
+        return neighbors + mobile if mobile else neighbors
+
+    def _mobile_neighbors(self, pos, radius, flammable):
+        x, y = pos
+        return [
+            agent
+            for agent in self.mobile
+            if agent.pos is not None
+            and agent.pos != pos
+            and max(abs(agent.pos[0] - x), abs(agent.pos[1] - y)) <= radius
+            and (not flammable or hasattr(agent, "fire_intensity"))
+        ]
@@ -0,0 +1,271 @@
+import heapq
+from collections import deque
+
+import numpy as np
+
+from .navigation import IMPASSABLE_ZONES, MOORE_MOVES, UNREACHABLE, layout_key
+
+# Zone graphs shared by every model built on the same layout
+_layout_graphs = {}
+_MAX_CACHED_LAYOUTS = 8
+
+# Moves that visit every pair of Moore-adjacent cells once
+_HALF_MOVES = ((1, 0), (0, 1), (1, 1), (1, -1))
+
+
+class ZoneGraph:
+    """
+    Abstract graph of a layout's modules for long-range routing.
+
+    Each region is a connected group of cells with the same zone code (a
+    module, a corridor, one airlock), and two regions are linked when any of
+    their cells are Moore neighbors. A region can be entered by a robot when
+    its zone is accessible in the robot's OperatingEnvironment and is not a
+    wall, so airlocks and deposits (mixed zones) are the only way between
+    internal and external regions.
+
+    route() plans over regions with Dijkstra, weighting links by the
+    distance between region centroids, so its cost depends on the number of
+    modules and not on the grid area. next_step() refines the route locally:
+    it follows a BFS field confined to the current region that leads into the
+    next region of the route. Routes and local fields are memoized.
+
+    The graph describes the static layout; NavigationFields tracks cells
+    opened or blocked during a run. The memoized graph of a layout is pickled
+    by reference and looked up again with for_layout() when unpickled.
+    """
+
+    def __init__(self, zone_index):
+        self.zone_index = zone_index
+        self.width = zone_index.width
+        self.height = zone_index.height
+
+        self.region_of = _label_regions(zone_index.cell_zone)
+        regions = int(self.region_of.max()) + 1 if self.region_of.size else 0
+        xs, ys = np.nonzero(np.ones_like(self.region_of, dtype=bool))
+        labels = self.region_of[xs, ys]
+        order = np.argsort(labels, kind="stable")
+        bounds = np.cumsum(np.bincount(labels, minlength=regions))[:-1]
+        self.region_cells = np.split(np.stack((xs, ys), axis=1)[order], bounds)
+        self.region_zones = [
+            zone_index.zone_at(tuple(cells[0])) for cells in self.region_cells
+        ]
+        self.centroids = np.array(
+            [cells.mean(axis=0) for cells in self.region_cells]
+        ).reshape(-1, 2)
+
+        self.links = [set() for _ in range(regions)]
+        for dx, dy in _HALF_MOVES:
+            here, there = _shifted_pairs(self.region_of, dx, dy)
+            different = here != there
+            pairs = zip(here[different].tolist(), there[different].tolist())
+            for a, b in set(pairs):
+                self.links[a].add(b)
+                self.links[b].add(a)
+
+        self._access = {}
+        self._routes = {}
+        self._local_fields = {}
+        # Set on the memoized graph of a layout
+        self._shared = False
+
+    @classmethod
+    def for_layout(cls, zone_index):
+        """Returns the memoized graph of zone_index's layout"""
+        key = layout_key(zone_index)
+        graph = _layout_graphs.get(key)
+        if graph is None:
+            graph = cls(zone_index)
+            graph._shared = True
+            if len(_layout_graphs) >= _MAX_CACHED_LAYOUTS:
+                del _layout_graphs[next(iter(_layout_graphs))]
+            _layout_graphs[key] = graph
+        return graph
+
+    def __reduce_ex__(self, protocol):
+        if self._shared:
+            return type(self).for_layout, (self.zone_index,)
+        return super().__reduce_ex__(protocol)
+
+    def __len__(self):
+        return len(self.region_cells)
+
+    def region_at(self, pos):
+        x, y = pos
+        return int(self.region_of[x, y])
+
+    def accessible(self, region, operating_environment):
+        """Whether a robot of operating_environment may enter region"""
+        access = self._access.get(operating_environment)
+        if access is None:
+            access = [
+                zone_code not in IMPASSABLE_ZONES
+                and self.zone_index.environment_allows(
+                    operating_environment, tuple(cells[0])
+                )
+                for zone_code, cells in zip(self.region_zones, self.region_cells)
+            ]
+            self._access[operating_environment] = access
+        return access[region]
+
+    def route(self, start, destination, operating_environment):
+        """
+        Plans a route from the region at start to the nearest region of the
+        destination zone(s).
+
+        Returns:
+            list: Region ids from the start region to the destination region,
+            or None if no accessible route exists.
+        """
+        zone_codes = _zone_codes(destination)
+        start_region = self.region_at(start)
+        key = (start_region, zone_codes, operating_environment)
+        if key not in self._routes:
+            self._routes[key] = self._plan(
+                start_region, zone_codes, operating_environment
+            )
+        route = self._routes[key]
+        return None if route is None else list(route)
+
+    def next_step(self, pos, destination, operating_environment):
+        """
+        Returns the cell to move to from pos along the zone route, pos itself
+        once inside a destination region, or None if there is no route.
+        """
+        route = self.route(pos, destination, operating_environment)
+        if route is None:
+            return None
+        if len(route) == 1:
+            return pos
+        origin, distance, flow = self._local_field(route[0], route[1])
+        x, y = pos[0] - origin[0], pos[1] - origin[1]
+        move = flow[x, y]
+        if move < 0:
+            return None
+        dx, dy = MOORE_MOVES[move]
+        return pos[0] + dx, pos[1] + dy
+
+    def _plan(self, start_region, zone_codes, operating_environment):
+        goals = {
+            region
+            for region, zone_code in enumerate(self.region_zones)
+            if zone_code in zone_codes
+            and self.accessible(region, operating_environment)
+        }
+        if not goals:
+            return None
+
+        costs = {start_region: 0.0}
+        parents = {start_region: None}
+        heap = [(0.0, start_region)]
+        while heap:
+            cost, region = heapq.heappop(heap)
+            if cost > costs[region]:
+                continue
+            if region in goals:
+                route = []
+                while region is not None:
+                    route.append(region)
+                    region = parents[region]
+                return tuple(reversed(route))
+            for neighbor in self.links[region]:
+                if not self.accessible(neighbor, operating_environment):
+                    continue
+                step = float(
+                    np.abs(self.centroids[neighbor] - self.centroids[region]).max()
+                )
+                if cost + step < costs.get(neighbor, np.inf):
+                    costs[neighbor] = cost + step
+                    parents[neighbor] = region
+                    heapq.heappush(heap, (cost + step, neighbor))
+        return None
+
+    def _local_field(self, region, next_region):
+        """
+        BFS field over the cells of region leading into next_region, within
+        the bounding box of region grown by one cell.
+        """
+        key = (region, next_region)
+        field = self._local_fields.get(key)
+        if field is not None:
+            return field
+
+        cells = self.region_cells[region]
+        x0, y0 = np.maximum(cells.min(axis=0) - 1, 0)
+        x1, y1 = cells.max(axis=0) + 2
+        window = self.region_of[x0:x1, y0:y1]
+        width, height = window.shape
+
+        distance = np.full(window.shape, UNREACHABLE, dtype=np.int32)
+        queue = deque()
+        for x, y in zip(*np.nonzero(window == next_region)):
+            distance[x, y] = 0
+            queue.append((x, y))
+        while queue:
+            x, y = queue.popleft()
+            for dx, dy in MOORE_MOVES:
+                nx, ny = x + dx, y + dy
+                if (
+                    0 <= nx < width
+                    and 0 <= ny < height
+                    and window[nx, ny] == region
+                    and distance[nx, ny] == UNREACHABLE
+                ):
+                    distance[nx, ny] = distance[x, y] + 1
+                    queue.append((nx, ny))
+
+        flow = np.full(window.shape, -1, dtype=np.int8)
+        for x, y in zip(*np.nonzero(distance > 0)):
+            best = None
+            for move, (dx, dy) in enumerate(MOORE_MOVES):
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < width and 0 <= ny < height and distance[nx, ny] >= 0:
+                    if best is None or distance[nx, ny] < best:
+                        best = distance[nx, ny]
+                        flow[x, y] = move
+
+        field = ((int(x0), int(y0)), distance, flow)
+        self._local_fields[key] = field
+        return field
+
+
+def _zone_codes(destination):
+    return (destination,) if isinstance(destination, str) else tuple(destination)
+
+
+def _shifted_pairs(array, dx, dy):
+    """Values of every cell paired with its neighbor at (dx, dy)"""
+    width, height = array.shape
+    xs = slice(0, width - dx)
+    ys = slice(max(0, -dy), height - max(0, dy))
+    shifted_xs = slice(dx, width)
+    shifted_ys = slice(max(0, dy), height - max(0, -dy))
+    return array[xs, ys].ravel(), array[shifted_xs, shifted_ys].ravel()
+
+
+def _label_regions(cell_zone):
+    """Labels Moore-connected groups of cells sharing a zone id, row-major"""
+    width, height = cell_zone.shape
+    region_of = np.full(cell_zone.shape, -1, dtype=np.int32)
+    regions = 0
+    for y in range(height):
+        for x in range(width):
+            if region_of[x, y] >= 0:
+                continue
+            zone_id = cell_zone[x, y]
+            region_of[x, y] = regions
+            queue = deque([(x, y)])
+            while queue:
+                cx, cy = queue.popleft()
+                for dx, dy in MOORE_MOVES:
+                    nx, ny = cx + dx, cy + dy
+                    if (
+                        0 <= nx < width
+                        and 0 <= ny < height
+                        and region_of[nx, ny] < 0
+                        and cell_zone[nx, ny] == zone_id
+                    ):
+                        region_of[nx, ny] = regions
+                        queue.append((nx, ny))
+            regions += 1
+    return region_of
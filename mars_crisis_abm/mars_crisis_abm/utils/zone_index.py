@@ -0,0 +1,111 @@
+import numpy as np
+
+from .agent_utils import get_zones_by_type
+from .enums import ROBOT_OPERATIONAL_ZONES, OperatingEnvironment
+
+
+class ZoneIndex:
+    """
+    Dense per-cell zone lookup for a model's zone table.
+
+    Zones get integer ids in table order and cell_zone holds the id of every
+    cell, indexed [x, y] like the grid, so zone membership and robot access
+    checks are array lookups instead of string comparisons against grid_data.
+    Each zone's placement positions are also kept as a contiguous (n, 2)
+    array in the same order as zones[code]["positions"].
+    """
+
+    def __init__(self, zones, cell_zone):
+        self.zone_codes = list(zones)
+        self.zone_ids = {code: zone_id for zone_id, code in enumerate(self.zone_codes)}
+        self.cell_zone = cell_zone
+        self.positions = {
+            code: np.array(zone_data["positions"], dtype=np.int32).reshape(-1, 2)
+            for code, zone_data in zones.items()
+        }
+
+        # Zone id -> accessible, per operating environment and robot type
+        self._environment_access = {
+            environment: self._id_lookup(get_zones_by_type(zones, environment))
+            for environment in OperatingEnvironment
+        }
+        self._robot_access = {
+            robot_type: self._id_lookup(zone_codes)
+            for robot_type, zone_codes in ROBOT_OPERATIONAL_ZONES.items()
+        }
+
+    @classmethod
+    def from_grid(cls, grid_data, zones):
+        """Builds the index from grid_data rows of zone names and their zone table"""
+        zone_ids = {code: zone_id for zone_id, code in enumerate(zones)}
+        return cls(zones, compute_cell_zone_ids(grid_data, zone_ids))
+
+    @property
+    def width(self):
+        return self.cell_zone.shape[0]
+
+    @property
+    def height(self):
+        return self.cell_zone.shape[1]
+
+    def zone_at(self, pos):
+        """Returns the zone code of the cell at pos"""
+        x, y = pos
+        return self.zone_codes[self.cell_zone[x, y]]
+
+    def in_zone(self, pos, zone_code):
+        x, y = pos
+        zone_id = self.zone_ids.get(zone_code)
+        return zone_id is not None and bool(self.cell_zone[x, y] == zone_id)
+
+    def environment_allows(self, operating_environment, pos):
+        """Whether a robot working in operating_environment may enter pos"""
+        x, y = pos
+        access = self._environment_access[operating_environment]
+        return bool(access[self.cell_zone[x, y]])
+
+    def robot_allows(self, robot_type, pos):
+        """Whether pos lies in one of robot_type's ROBOT_OPERATIONAL_ZONES"""
+        x, y = pos
+        return bool(self._robot_access[robot_type][self.cell_zone[x, y]])
+
+    def zone_mask(self, zone_codes):
+        """Boolean [x, y] mask of every cell in any of zone_codes"""
+        return self._id_lookup(zone_codes)[self.cell_zone]
+
+    def environment_mask(self, operating_environment):
+        """Boolean [x, y] mask of the cells accessible in operating_environment"""
+        return self._environment_access[operating_environment][self.cell_zone]
+
+    def robot_mask(self, robot_type):
+        """Boolean [x, y] mask of robot_type's operational zones"""
+        return self._robot_access[robot_type][self.cell_zone]
+
+    def random_position(self, zone_code, rng):
+        """
+        Draws a placement position of zone_code. Consumes rng exactly like
+        rng.choice(zones[zone_code]["positions"]) and returns the same cell.
+        """
+        positions = self.positions[zone_code]
+        if len(positions) == 0:
+            raise ValueError(f"No valid positions available in zone '{zone_code}'")
+        x, y = positions[rng.randrange(len(positions))]
+        return int(x), int(y)
+
+    def _id_lookup(self, zone_codes):
+        lookup = np.zeros(len(self.zone_codes), dtype=bool)
+        for code in zone_codes:
+            zone_id = self.zone_ids.get(code)
+            if zone_id is not None:
+                lookup[zone_id] = True
+        return lookup
+
+
+def compute_cell_zone_ids(grid_data, zone_ids):
+    """Returns the [x, y] array of zone ids for grid_data rows of zone names"""
+    height = len(grid_data)
+    width = len(grid_data[0])
+    cell_zone = np.empty((width, height), dtype=np.int16)
+    for y, row in enumerate(grid_data):
+        cell_zone[:, y] = [zone_ids[zone_code] for zone_code in row]
+    return cell_zone